@@ -131,6 +131,14 @@ export interface FromControlPanelWebShell extends FromControlPanelBase {
   };
 }
 
+export interface FromControlPanelTime extends FromControlPanelBase {
+  topic: "time";
+  payload: {
+    // Control panel clock when sent, in ms
+    t0: number;
+  };
+}
+
 export type FromControlPanel =
   | FromControlPanelBoardInfo
   | FromControlPanelSync
@@ -149,7 +157,8 @@ export type FromControlPanel =
   | FromControlPanelCyan
   | FromControlPanelDarkAll
   | FromControlPanelCloseGPIO
-  | FromControlPanelWebShell;
+  | FromControlPanelWebShell
+  | FromControlPanelTime;
 
 export interface ToControlPanelBase {
   from: "server";
@@ -171,6 +180,17 @@ export interface ToControlPanelCommandResponse extends ToControlPanelBase {
   };
 }
 
+export interface ToControlPanelTime extends ToControlPanelBase {
+  topic: "time";
+  payload: {
+    t0: number;
+    // Server clock when received and when replied, in ms
+    t1: number;
+    t2: number;
+  };
+}
+
 export type ToControlPanel =
   | ToControlPanelBoardInfo
-  | ToControlPanelCommandResponse;
+  | ToControlPanelCommandResponse
+  | ToControlPanelTime;
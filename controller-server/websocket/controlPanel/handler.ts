@@ -20,6 +20,8 @@ import {
   FromControlPanelCyan,
   FromControlPanelWebShell,
   FromControlPanelSync,
+  FromControlPanelTime,
+  ToControlPanelTime,
 } from "@/types/controlPanelMessage";
 
 import {
@@ -76,6 +78,24 @@ export function handleBoardInfo(ws: WebSocket) {
   sendBoardInfoToControlPanel();
 }
 
+export function handleTime(ws: WebSocket, msg: FromControlPanelTime) {
+  const received = Date.now();
+
+  // Only the asking control panel needs the reply
+  const toControlPanelMsg: ToControlPanelTime = {
+    from: "server",
+    topic: "time",
+    statusCode: 0,
+    payload: {
+      t0: msg.payload.t0,
+      t1: received,
+      t2: Date.now(),
+    },
+  };
+
+  ws.send(JSON.stringify(toControlPanelMsg));
+}
+
 export function handleSync(msg: FromControlPanelSync) {
   const { dancers } = msg.payload;
 
@@ -23,6 +23,7 @@ import {
   handleYellow,
   handleMagenta,
   handleWebShell,
+  handleTime,
 } from "./handler";
 
 let music_subprocess: ChildProcess | null = null;
@@ -113,6 +114,9 @@ export async function handleOnControlPanelMessage(
     case "webShell":
       handleWebShell(msg);
       break;
+    case "time":
+      handleTime(ws, msg);
+      break;
     default:
       msg satisfies never;
       console.log(`[Error]: Unknown topic ${msg}`);
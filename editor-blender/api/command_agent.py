@@ -1,8 +1,11 @@
 import json
+import time
 from dataclasses import dataclass
 
 from ..client import client
-from ..schemas.command import ToControllerServerPartial
+from ..core.actions.state.command import start_command_request
+from ..core.states import state
+from ..schemas.command import ToControllerServerPartial, ToControllerServerTimePartial
 
 
 @dataclass
@@ -16,7 +19,39 @@ class CommandAgent:
                 "statusCode": 0,
             }
         )
-        await client.send_command(msg_full)
+
+        # Track the answer of every targeted dancer, controller server fans
+        # the message out to them
+        payload = getattr(msg_partial, "payload", None)
+        if isinstance(msg_partial, ToControllerServerTimePartial):
+            dancers = []
+        elif payload is not None:
+            dancers = list(payload.dancers)
+        elif msg_partial.topic == "darkAll":
+            dancers = list(state.rpi_status.keys())
+        else:
+            dancers = []
+
+        # webShell runs the command of its payload as is
+        command = getattr(payload, "command", None)
+        request = (
+            start_command_request(msg_partial.topic, dancers, command)
+            if dancers
+            else None
+        )
+        try:
+            await client.send_command(msg_full)
+        except Exception:
+            if request is not None:
+                state.command_requests.pop(request.id, None)
+            raise
+
+    async def send_time_request(self):
+        """Ask controller server for its clock, see core/utils/clock.py"""
+        time_payload = ToControllerServerTimePartial.from_dict(
+            {"topic": "time", "payload": {"t0": time.time() * 1000}}
+        )
+        await self.send_to_controller_server(time_payload)
 
 
 command_agent = CommandAgent()
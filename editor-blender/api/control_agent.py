@@ -5,7 +5,15 @@ from typing import Any
 
 from ..client import client
 from ..core.log import logger
-from ..core.models import ColorID, ControlMap, ControlRecord, LEDEffectID, MapID
+from ..core.models import (
+    ColorID,
+    ControlMap,
+    ControlRecord,
+    FrameRevisions,
+    LEDEffectID,
+    MapID,
+    Revision,
+)
 from ..core.utils.convert import control_map_query_to_state
 from ..schemas.mutations import (
     ADD_CONTROL_FRAME,
@@ -23,8 +31,11 @@ from ..schemas.mutations import (
     MutRequestEditControlResponse,
 )
 from ..schemas.queries import (
+    GET_CONTROL_FRAME_REVISIONS,
     GET_CONTROL_MAP,
+    GET_CONTROL_MAP_SELECT,
     GET_CONTROL_RECORD,
+    QueryControlFrameRevisionsData,
     QueryControlMapData,
     QueryControlMapPayload,
     QueryControlRecordData,
@@ -84,6 +95,48 @@ class ControlAgent:
 
         return None
 
+    async def get_control_frame_revisions(self) -> FrameRevisions | None:
+        """Get the start and revision of every control frame, without data"""
+        try:
+            response = await client.execute(
+                QueryControlFrameRevisionsData, GET_CONTROL_FRAME_REVISIONS
+            )
+            return dict(
+                (
+                    frame.id,
+                    (frame.start, Revision(meta=frame.rev.meta, data=frame.rev.data)),
+                )
+                for frame in response["controlFrameRevisions"]
+            )
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception:
+            logger.exception("Failed to get control frame revisions")
+
+        return None
+
+    async def get_control_frames(self, ids: list[MapID]) -> ControlMap | None:
+        """Get only the control frames of `ids` from the server"""
+        try:
+            response = await client.execute(
+                QueryControlMapData,
+                GET_CONTROL_MAP_SELECT,
+                {"select": {"frameIds": ids}},
+            )
+            controlMap = response["ControlMap"]
+
+            return control_map_query_to_state(controlMap.frameIds)
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception:
+            logger.exception("Failed to get control frames")
+
+        return None
+
     async def add_frame(
         self,
         start: int,
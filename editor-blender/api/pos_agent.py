@@ -5,7 +5,7 @@ from typing import Any
 
 from ..client import client
 from ..core.log import logger
-from ..core.models import MapID, PosMap, PosRecord
+from ..core.models import FrameRevisions, MapID, PosMap, PosRecord, Revision
 from ..core.utils.convert import pos_map_query_to_state
 from ..schemas.mutations import (
     ADD_POS_FRAME,
@@ -25,8 +25,11 @@ from ..schemas.mutations import (
     MutRequestEditPositionResponse,
 )
 from ..schemas.queries import (
+    GET_POS_FRAME_REVISIONS,
     GET_POS_MAP,
+    GET_POS_MAP_SELECT,
     GET_POS_RECORD,
+    QueryPosFrameRevisionsData,
     QueryPosMapData,
     QueryPosMapPayload,
     QueryPosRecordData,
@@ -80,6 +83,48 @@ class PosAgent:
         except Exception:
             logger.exception("Failed to get position map")
 
+    async def get_pos_frame_revisions(self) -> FrameRevisions | None:
+        """Get the start and revision of every position frame, without data"""
+        try:
+            response = await client.execute(
+                QueryPosFrameRevisionsData, GET_POS_FRAME_REVISIONS
+            )
+            return dict(
+                (
+                    frame.id,
+                    (frame.start, Revision(meta=frame.metaRev, data=frame.dataRev)),
+                )
+                for frame in response["positionFrameRevisions"]
+            )
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception:
+            logger.exception("Failed to get position frame revisions")
+
+        return None
+
+    async def get_pos_frames(self, ids: list[MapID]) -> PosMap | None:
+        """Get only the position frames of `ids` from the server"""
+        try:
+            response = await client.execute(
+                QueryPosMapData,
+                GET_POS_MAP_SELECT,
+                {"select": {"frameIds": [{"id": id} for id in ids]}},
+            )
+            posMap = response["PosMap"]
+
+            return pos_map_query_to_state(posMap.frameIds)
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception:
+            logger.exception("Failed to get position frames")
+
+        return None
+
     async def add_frame(
         self, start: int, positionData: list[list[float]]
     ) -> MapID | None:
@@ -0,0 +1,7 @@
+"""
+Benchmarks of the add-on's hot paths.
+
+Each module documents how to run it. Benchmarks that need bpy run inside a
+headless Blender, the others with plain Python. They are excluded from the
+bundled add-on.
+"""
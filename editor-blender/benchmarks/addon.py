@@ -0,0 +1,31 @@
+"""
+Load the add-on package from this source tree under a fixed module name, so
+benchmarks running in Blender can import its modules without installing it.
+"""
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+PACKAGE_NAME = "editor_blender"
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def load_addon() -> ModuleType:
+    package = sys.modules.get(PACKAGE_NAME)
+    if package is not None:
+        return package
+
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME,
+        os.path.join(PACKAGE_DIR, "__init__.py"),
+        submodule_search_locations=[PACKAGE_DIR],
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load add-on from {PACKAGE_DIR}")
+
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = package
+    spec.loader.exec_module(package)
+    return package
@@ -0,0 +1,207 @@
+"""
+Throughput of decoding controller-server messages, before and after the fast
+path of `Clients.subscribe_command`:
+
+- decode: `json.loads` + `JSONWizard.from_dict` per message versus
+  `decode_command_message`, on `boardInfo` and `command` messages of the mock
+  controller-server.
+- live: a mock controller-server in the same process pushes `boardInfo`
+  storms and command response bursts. Every state update costs `--update-ms`,
+  as writing the RPi list does in Blender. Before, each message is one update;
+  after, each batch is.
+
+Usage (from editor-blender/, with the add-on's dependencies installed in
+Blender's Python):
+
+    blender -b --factory-startup --python benchmarks/controller_decode.py -- \\
+        --dancers 30 --rate 200 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from benchmarks.addon import load_addon  # noqa: E402
+from mock.controller_server import MockControllerServer, generate_boards  # noqa: E402
+from mock.faults import Scenario, run_scenario  # noqa: E402
+
+
+def measure(calls: int, run: Callable[[], object]) -> float:
+    """Microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        run()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def make_server(args: argparse.Namespace) -> MockControllerServer:
+    return MockControllerServer(
+        generate_boards(args.dancers, random.Random(0)),
+        Scenario.constant(rate=args.rate),
+        rpi_latency_ms=5.0,
+        rpi_jitter_ms=5.0,
+        fail_rate=0.0,
+        drop_rate=0.0,
+        seed=0,
+    )
+
+
+def bench_decode(args: argparse.Namespace):
+    from editor_blender.client import deserialize  # type: ignore
+    from editor_blender.client.command import (  # type: ignore
+        decode_command_message,
+        loads,
+    )
+    from editor_blender.schemas.command import (  # type: ignore
+        FromControllerServerBoardInfo,
+        FromControllerServerCommandResponse,
+    )
+
+    server = make_server(args)
+    messages = {
+        "boardInfo": (server.board_info(), FromControllerServerBoardInfo),
+        "command": (
+            json.dumps(
+                {
+                    "from": "server",
+                    "topic": "command",
+                    "statusCode": 0,
+                    "payload": {
+                        "command": "play",
+                        "message": "success",
+                        "dancer": "0_dancer",
+                    },
+                }
+            ),
+            FromControllerServerCommandResponse,
+        ),
+    }
+
+    print(f"Parser: {loads.__module__}, microseconds per message")
+    print(f"{'topic':>12} {'bytes':>8} {'before':>10} {'after':>10}")
+    for topic, (data, schema) in messages.items():
+        before_us = measure(
+            args.calls,
+            lambda data=data, schema=schema: deserialize(schema, json.loads(data)),
+        )
+        after_us = measure(
+            args.calls, lambda data=data: decode_command_message(data, 0.0)
+        )
+        print(f"{topic:>12} {len(data):>8} {before_us:10.2f} {after_us:10.2f}")
+
+
+async def run_live(args: argparse.Namespace, batched: bool) -> tuple[int, int, float]:
+    """Messages handled, state updates and backlog in ms when stopped"""
+    from editor_blender.client import Clients, deserialize  # type: ignore
+    from editor_blender.schemas.command import (  # type: ignore
+        FromControllerServerBoardInfo,
+        FromControllerServerCommandResponse,
+    )
+    from websockets.client import connect
+    from websockets.server import serve
+
+    server = make_server(args)
+    emitter = asyncio.ensure_future(
+        run_scenario(server.scenario, server.emit_board_info, server.disconnect_all)
+    )
+    messages = 0
+    updates = 0
+
+    def update():
+        # Applying to the state and the RPi list
+        time.sleep(args.update_ms / 1000)
+
+    async with serve(server.handle, "localhost", args.port):
+        ws = await connect(f"ws://localhost:{args.port}")
+
+        async def send_commands():
+            dancers = [board.dancer for board in server.boards.values()]
+            while True:
+                await ws.send(
+                    json.dumps(
+                        {
+                            "from": "controlPanel",
+                            "topic": "play",
+                            "statusCode": 0,
+                            "payload": {"dancers": dancers},
+                        }
+                    )
+                )
+                await asyncio.sleep(args.command_interval)
+
+        sender = asyncio.ensure_future(send_commands())
+        deadline = time.perf_counter() + args.seconds
+
+        if batched:
+            clients = Clients()
+            clients.command_client = ws
+            async for batch in clients.subscribe_command():
+                messages += len(batch)
+                updates += 1
+                update()
+                if time.perf_counter() > deadline:
+                    break
+        else:
+            async for data in ws:
+                data_dict = json.loads(data)
+                match data_dict["topic"]:
+                    case "boardInfo":
+                        deserialize(FromControllerServerBoardInfo, data_dict)
+                    case _:
+                        deserialize(FromControllerServerCommandResponse, data_dict)
+                messages += 1
+                updates += 1
+                update()
+                if time.perf_counter() > deadline:
+                    break
+
+        # Messages received but not handled yet, beyond the socket buffers
+        backlog = len(ws.messages) * args.update_ms
+
+        sender.cancel()
+        emitter.cancel()
+        await ws.close()
+
+    return messages, updates, backlog
+
+
+def bench_live(args: argparse.Namespace):
+    print(
+        f"\n{args.dancers} boards, {args.rate} boardInfo/s, command to every board "
+        f"every {args.command_interval} s, {args.update_ms} ms per state update"
+    )
+    print(f"{'':>8} {'messages/s':>12} {'updates/s':>10} {'backlog ms':>11}")
+    for name, batched in (("before", False), ("after", True)):
+        messages, updates, backlog = asyncio.run(run_live(args, batched))
+        print(
+            f"{name:>8} {messages / args.seconds:12.1f} "
+            f"{updates / args.seconds:10.1f} {backlog:11.0f}"
+        )
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dancers", type=int, default=30)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=200.0, help="boardInfo/s")
+    parser.add_argument("--command-interval", type=float, default=0.1)
+    parser.add_argument("--update-ms", type=float, default=2.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=18082)
+    args = parser.parse_args(argv)
+
+    load_addon()
+    bench_decode(args)
+    bench_live(args)
+
+
+if __name__ == "__main__":
+    main()
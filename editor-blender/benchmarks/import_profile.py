@@ -0,0 +1,160 @@
+"""
+Import-time profile of the add-on: the modules imported by `register()`, with
+the time spent in each module itself and cumulatively (including the modules
+it imports), like `python -X importtime`.
+
+Usage (from editor-blender/, with the add-on's dependencies installed in
+Blender's Python):
+
+    blender -b --factory-startup --python benchmarks/import_profile.py -- \\
+        --top 30 --json import_profile.json
+
+Pass `--baseline import_profile.json` to compare with a previous run; the
+script exits with status 1 if the total import time grew beyond the
+tolerance.
+"""
+
+import argparse
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from benchmarks.addon import PACKAGE_NAME, load_addon  # noqa: E402
+
+
+@dataclass
+class ModuleTime:
+    name: str
+    self_ms: float
+    cumulative_ms: float
+
+
+class TimedLoader(importlib.abc.Loader):
+    def __init__(self, profiler: "ImportProfiler", loader: Any):
+        self.profiler = profiler
+        self.loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType):
+        profiler = self.profiler
+        profiler.children.append(0.0)
+
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = profiler.children.pop()
+            if profiler.children:
+                profiler.children[-1] += cumulative
+
+            profiler.modules.append(
+                ModuleTime(
+                    name=module.__name__,
+                    self_ms=(cumulative - children) * 1000,
+                    cumulative_ms=cumulative * 1000,
+                )
+            )
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        self.modules: list[ModuleTime] = []
+        # Time spent importing children, per module being executed
+        self.children: list[float] = []
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = TimedLoader(self, spec.loader)
+            return spec
+
+        return None
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *_: Any):
+        sys.meta_path.remove(self)
+
+
+def profile_imports() -> list[ModuleTime]:
+    with ImportProfiler() as profiler:
+        load_addon()
+        # The modules imported by register()
+        for name in ["properties", "operators", "panels", "storage"]:
+            __import__(f"{PACKAGE_NAME}.{name}")
+
+    return profiler.modules
+
+
+def report(modules: list[ModuleTime], top: int):
+    print(f"{'self [ms]':>10} {'cumulative [ms]':>16}  module")
+    for item in sorted(modules, key=lambda item: -item.cumulative_ms)[:top]:
+        print(f"{item.self_ms:10.1f} {item.cumulative_ms:16.1f}  {item.name}")
+
+
+def total_ms(modules: list[ModuleTime]) -> float:
+    return sum(item.self_ms for item in modules)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--json", help="write the profile to this file")
+    parser.add_argument("--baseline", help="profile of a previous run to compare")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed growth of the total over the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    modules = profile_imports()
+    total = total_ms(modules)
+
+    report(modules, args.top)
+    print(f"Total: {total:.1f} ms, {len(modules)} modules")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump([asdict(item) for item in modules], file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = [ModuleTime(**item) for item in json.load(file)]
+        baseline_total = total_ms(baseline)
+
+        print(
+            f"Baseline: {baseline_total:.1f} ms, {len(baseline)} modules "
+            f"({(total / baseline_total - 1) * 100:+.1f}%)"
+        )
+        if total > baseline_total * (1 + args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
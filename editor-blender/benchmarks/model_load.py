@@ -0,0 +1,96 @@
+"""
+Headless benchmark of dancer model loading: glTF import and processing
+(`import_model_to_asset`) versus appending the processed collection from the
+.blend asset library.
+
+Usage (from editor-blender/, with the add-on's dependencies installed in
+Blender's Python):
+
+    blender -b --factory-startup --python benchmarks/model_load.py -- \\
+        ../files/asset/models/1_yck.glb --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from benchmarks.addon import load_addon  # noqa: E402
+
+
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def measure(repeat: int, setup: Callable[[], None], run: Callable[[], None]):
+    durations: list[float] = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def report(label: str, durations: list[float]):
+    print(
+        f"{label:>10}: median {statistics.median(durations) * 1000:8.1f} ms,"
+        f" min {min(durations) * 1000:8.1f} ms, max {max(durations) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("model", help="path of a dancer model (.glb)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    load_addon()
+    from editor_blender.core.actions.state.load import objects  # type: ignore
+    from editor_blender.core.config import config  # type: ignore
+
+    model_filepath = os.path.realpath(args.model)
+    model_name = os.path.splitext(os.path.basename(model_filepath))[0]
+    model_hash = str(os.path.getmtime(model_filepath))
+
+    with tempfile.TemporaryDirectory() as asset_path:
+        config.ASSET_PATH = asset_path
+
+        def import_model():
+            asyncio.run(objects.import_model_to_asset(model_name, model_filepath, []))
+
+        def append_model():
+            if not objects.load_model_from_library(model_name, model_hash):
+                raise RuntimeError("Model not found in library")
+
+        import_durations = measure(args.repeat, reset_scene, import_model)
+
+        reset_scene()
+        import_model()
+        objects.save_model_to_library(model_name, model_hash)
+        library_size = os.path.getsize(
+            objects.model_library_path(model_name, model_hash)
+        )
+
+        append_durations = measure(args.repeat, reset_scene, append_model)
+
+    print(f"Model {model_name}, {args.repeat} runs, library file {library_size} B")
+    report("glTF", import_durations)
+    report("library", append_durations)
+    print(
+        "Speedup: "
+        f"{statistics.median(import_durations) / statistics.median(append_durations):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-call overhead of preparing a GraphQL operation in `Clients.execute` and
+`Clients.subscribe`: walking the document (`to_dict()`, field table) and
+printing it for the transport on every call, versus looking up the operation
+compiled once.
+
+Usage (from editor-blender/, with the add-on's dependencies installed in
+Blender's Python):
+
+    blender -b --factory-startup --python benchmarks/operation_overhead.py -- \\
+        --calls 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from benchmarks.addon import load_addon  # noqa: E402
+
+
+def measure(calls: int, run: Callable[[], object]) -> float:
+    """Microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        run()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    load_addon()
+    from editor_blender.client.cache import query_defs_to_field_table  # type: ignore
+    from editor_blender.client.operation import (  # type: ignore
+        compile_operation,
+        print_document,
+    )
+    from editor_blender.schemas import mutations, queries, subscriptions  # type: ignore
+    from graphql import print_ast
+
+    documents = {
+        "GET_CONTROL_MAP": queries.GET_CONTROL_MAP,
+        "REQUEST_EDIT_CONTROL_BY_ID": mutations.REQUEST_EDIT_CONTROL_BY_ID,
+        "EDIT_POS_FRAME": mutations.EDIT_POS_FRAME,
+        "SUB_CONTROL_MAP": subscriptions.SUB_CONTROL_MAP,
+    }
+
+    print(f"{args.calls} calls per document, microseconds per call")
+    print(f"{'document':>28} {'before':>10} {'after':>10}")
+    for name, document in documents.items():
+        node = document.node
+
+        def before():
+            query_dict = node.to_dict()
+            query_defs_to_field_table(query_dict)
+            query_dict["definitions"][0]["operation"]
+            print_ast(node)
+
+        def after():
+            operation = compile_operation(document)
+            operation.field_table
+            print_document(operation.node)
+
+        before_us = measure(args.calls, before)
+        after_us = measure(args.calls, after)
+        print(f"{name:>28} {before_us:10.2f} {after_us:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Time of compiling a synthetic show into per-dancer binary tables with
+`compute.export_show`, the function the "Export Show" operator runs in a worker
+process. Only needs the standard library.
+
+Usage (from editor-blender/):
+
+    python benchmarks/show_export.py --dancers 10 --frames 3000 --out /tmp/show
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import tempfile
+import time
+
+COMPUTE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    "core",
+    "utils",
+    "compute.py",
+)
+
+
+def load_compute():
+    spec = importlib.util.spec_from_file_location("lightdance_compute", COMPUTE_PATH)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {COMPUTE_PATH}")
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_show(args: argparse.Namespace):
+    rng = random.Random(0)
+    colors = 32
+    rgb_table = dict(
+        (color_id, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        for color_id in range(1, colors + 1)
+    )
+    effect_table = dict(
+        (effect_id, [rng.randint(1, colors) for _ in range(args.leds)])
+        for effect_id in range(1, 17)
+    )
+
+    parts = [(f"fiber_{i}", False, 0) for i in range(args.fibers)]
+    parts += [(f"led_{i}", True, args.leds) for i in range(args.led_parts)]
+    layout = [(f"{i}_dancer", parts) for i in range(args.dancers)]
+
+    frames = []
+    for index in range(args.frames):
+        status = []
+        led_status = []
+        for _ in range(args.dancers):
+            status.append(
+                [(rng.randint(1, colors), 255) for _ in range(args.fibers)]
+                + [
+                    (rng.choice([-1, 0, rng.randint(1, 16)]), 200)
+                    for _ in range(args.led_parts)
+                ]
+            )
+            led_status.append(
+                [[] for _ in range(args.fibers)]
+                + [
+                    [(rng.choice([-1, rng.randint(1, colors)]), 255)] * args.leds
+                    for _ in range(args.led_parts)
+                ]
+            )
+        frames.append((index * 100, index % 2 == 0, status, led_status))
+
+    pos_frames = [
+        (index * 100, [(0.0, 1.0, 2.0, 0.0, 0.0, 0.0)] * args.dancers)
+        for index in range(args.frames)
+    ]
+    return layout, rgb_table, effect_table, frames, pos_frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dancers", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--fibers", type=int, default=16)
+    parser.add_argument("--led-parts", type=int, default=4)
+    parser.add_argument("--leds", type=int, default=60)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    compute = load_compute()
+    show = synthetic_show(args)
+
+    directory = args.out or tempfile.mkdtemp(prefix="show_export_")
+    start = time.perf_counter()
+    sizes = compute.export_show(directory, *show)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{args.dancers} dancers, {args.frames} frames: "
+        f"{sum(sizes.values()) / 1e6:.1f} MB in {elapsed:.2f}s ({directory})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,28 @@
 import asyncio
-import json
+import time
 from asyncio import Task
 from collections.abc import AsyncGenerator
 from inspect import isclass
-from typing import Any, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from aiohttp import ClientSession
 from dataclass_wizard import JSONWizard
-from gql import Client
-from gql.client import AsyncClientSession, ReconnectingAsyncClientSession
-from gql.transport.aiohttp import AIOHTTPTransport
-from gql.transport.websockets import WebsocketsTransport
-from graphql import DocumentNode
-from websockets.client import WebSocketClientProtocol, connect
 
 from ..core.config import config
 from ..core.log import logger
 from ..core.states import state
-from ..schemas.command import (
-    FromControllerServer,
-    FromControllerServerBoardInfo,
-    FromControllerServerCommandResponse,
-)
-from .cache import InMemoryCache, query_defs_to_field_table
+from ..schemas.command import FromControllerServer
+from ..schemas.document import Document
+from .cache import InMemoryCache
+from .command import decode_command_message
+from .operation import CompiledOperation, compile_operation, use_printed_queries
 
-GQLSession = AsyncClientSession | ReconnectingAsyncClientSession
+# aiohttp, gql and websockets are imported when the clients are opened
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+    from gql.client import AsyncClientSession, ReconnectingAsyncClientSession
+    from websockets.client import WebSocketClientProtocol
+
+    GQLSession = AsyncClientSession | ReconnectingAsyncClientSession
 
 T = TypeVar("T")
 
@@ -59,11 +57,11 @@ def remove_wrapped_slash(path: str) -> str:
 
 class Clients:
     def __init__(self):
-        self.http_client: ClientSession | None = None
-        self.client: GQLSession | None = None
-        self.sub_client: GQLSession | None = None
-        self.file_client: ClientSession | None = None
-        self.command_client: WebSocketClientProtocol | None = None
+        self.http_client: "ClientSession | None" = None
+        self.client: "GQLSession | None" = None
+        self.sub_client: "GQLSession | None" = None
+        self.file_client: "ClientSession | None" = None
+        self.command_client: "WebSocketClientProtocol | None" = None
 
         self.cache = InMemoryCache()
 
@@ -95,7 +93,7 @@ class Clients:
 
     async def __execute__(
         self,
-        document: DocumentNode,
+        operation: CompiledOperation,
         timeout: int,
         variable_values: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
@@ -103,7 +101,7 @@ class Clients:
             raise Exception("GraphQL client is not initialized")
 
         task = asyncio.ensure_future(
-            self.client.execute(document, variable_values=variable_values)
+            self.client.execute(operation.node, variable_values=variable_values)
         )
         asyncio.ensure_future(self.__timeout__(task, timeout))
 
@@ -147,42 +145,39 @@ class Clients:
             return await response.content.read()
 
     async def subscribe(
-        self, data_type: type[T], query: DocumentNode
+        self, data_type: type[T], query: Document
     ) -> AsyncGenerator[dict[str, T], None]:
         if self.sub_client is None:
             raise Exception("GraphQL client is not initialized")
 
-        query_dict = query.to_dict()  # type: ignore
-        selections = query_dict["definitions"][0]["selection_set"]["selections"]  # type: ignore
-        query_name = selections[0]["name"]["value"]  # type: ignore
+        operation = compile_operation(query)
+        query_name = operation.root_field
 
-        async for data in self.sub_client.subscribe(query):
+        async for data in self.sub_client.subscribe(operation.node):
             data[query_name] = deserialize(data_type, data[query_name])  # type: ignore
             yield data
 
     async def execute(
         self,
         response_type: type[T],
-        query: DocumentNode,
+        query: Document,
         variables: dict[str, Any] | None = None,
         timeout: int = 5000,
     ) -> dict[str, T]:
         if self.client is None:
             raise Exception("GraphQL client is not initialized")
 
-        query_dict = query.to_dict()  # type: ignore
-        query_def = query_defs_to_field_table(query_dict)  # type: ignore
-
-        definition = query_dict["definitions"][0]  # type: ignore
-        query_type = definition["operation"]  # type: ignore
+        operation = compile_operation(query)
 
-        is_query = query_type == "query"  # type: ignore
+        is_query = operation.operation_type == "query"
 
         # TODO: Check if variables is identical in cache
         if variables is None and is_query:
             # NOTE: Cache is disabled for now
             response = None
-            # response = await self.cache.read_query(response_type, query_def)
+            # response = await self.cache.read_query(
+            #     response_type, operation.field_table
+            # )
         else:
             response = None
 
@@ -190,12 +185,12 @@ class Clients:
             if variables is not None:
                 params: dict[str, Any] = serialize(variables)
                 response = await self.__execute__(
-                    query, variable_values=params, timeout=timeout
+                    operation, variable_values=params, timeout=timeout
                 )
             else:
-                response = await self.__execute__(query, timeout=timeout)
+                response = await self.__execute__(operation, timeout=timeout)
 
-            query_name = query_def[0]
+            query_name = operation.root_field
             response[query_name] = deserialize(response_type, response[query_name])
             # NOTE: Cache is disabled for now
             # if is_query:
@@ -203,26 +198,43 @@ class Clients:
 
         return response
 
-    async def subscribe_command(self) -> AsyncGenerator[FromControllerServer, None]:
-        if self.command_client is None:
+    async def subscribe_command(
+        self,
+    ) -> AsyncGenerator[list[FromControllerServer], None]:
+        """
+        Yield messages in batches: once one arrives, those the connection has
+        already buffered are taken along without waiting, so bursts are
+        applied to the state at once. Buffered time answers are dropped.
+        """
+        from websockets.exceptions import ConnectionClosedOK
+
+        command_client = self.command_client
+        if command_client is None:
             raise Exception("Command client is not initialized")
-        async for data in self.command_client:
-            if isinstance(data, str):
-                data_dict = json.loads(data)
-                match data_dict["topic"]:
-                    case "boardInfo":
-                        sub_data: FromControllerServer = deserialize(
-                            FromControllerServerBoardInfo, data_dict
-                        )
-                    case "command":
-                        sub_data: FromControllerServer = deserialize(
-                            FromControllerServerCommandResponse, data_dict
-                        )
-                    case _:
-                        raise Exception("Invalid command data recieved")
-                yield sub_data
-            else:
-                raise Exception("Invalid command data recieved")
+
+        while True:
+            try:
+                data = await command_client.recv()
+            except ConnectionClosedOK:
+                return
+
+            received = time.time() * 1000
+            batch: list[FromControllerServer] = []
+            while True:
+                if not isinstance(data, str):
+                    raise Exception("Invalid command data recieved")
+                message = decode_command_message(data, received)
+                # Only the first message is stamped when it arrived, a buffered
+                # time answer would make a biased clock sample
+                if not batch or message.topic != "time":
+                    batch.append(message)
+
+                # recv() returns buffered messages right away
+                if not command_client.messages:
+                    break
+                data = await command_client.recv()
+
+            yield batch
 
     async def send_command(self, data: str):
         if self.command_client is None:
@@ -230,6 +242,8 @@ class Clients:
         await self.command_client.send(data)
 
     async def open_http(self) -> None:
+        from aiohttp import ClientSession
+
         await self.close_http()
 
         token_payload = {"token": state.token}
@@ -247,6 +261,8 @@ class Clients:
         await self.open_http()
 
     async def open_file(self) -> None:
+        from aiohttp import ClientSession
+
         # File client
         self.file_client = ClientSession(config.FILE_SERVER_URL)
         logger.info("File client opened")
@@ -260,7 +276,12 @@ class Clients:
         await self.open_file()
 
     async def open_graphql(self) -> None:
+        from gql import Client
+        from gql.transport.aiohttp import AIOHTTPTransport
+        from gql.transport.websockets import WebsocketsTransport
+
         await self.close_graphql()
+        use_printed_queries()
 
         token_payload = {"token": state.token}
 
@@ -300,6 +321,8 @@ class Clients:
         await self.open_graphql()
 
     async def open_command(self):
+        from websockets.client import connect
+
         self.command_client = await connect(
             uri=config.CONTROLLER_WS_URL,
             extra_headers=[("token", state.token)],
@@ -6,7 +6,6 @@ from inspect import iscoroutine
 from typing import Any, Generic, TypeVar
 
 from dataclass_wizard import JSONWizard
-from typeguard import check_type
 
 Cache = dict[str, Any | None]
 
@@ -100,6 +99,8 @@ class InMemoryCache:
     ) -> dict[str, T] | None:
         query_name, query_field_names = query_def
 
+        from typeguard import check_type
+
         cache_data = self.cache.get(query_name)
         try:
             check_type(cache_data, response_type)
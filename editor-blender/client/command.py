@@ -0,0 +1,88 @@
+"""
+Decoding of controller-server websocket messages.
+
+Messages are parsed with orjson when it is installed, and the schema objects
+are built directly from the parsed dict instead of going through
+`JSONWizard.from_dict`, which dominates the cost of large `boardInfo` bursts.
+"""
+
+from typing import Any
+
+from ..schemas.command import (
+    DancerDataItem,
+    FromControllerServer,
+    FromControllerServerBoardInfo,
+    FromControllerServerCommandResponse,
+    FromControllerServerCommandResponsePayload,
+    FromControllerServerTime,
+    FromControllerServerTimePayload,
+)
+
+try:
+    from orjson import loads  # type: ignore
+except ImportError:
+    from json import loads
+
+
+def decode_board_info(message: dict[str, Any]) -> FromControllerServerBoardInfo:
+    return FromControllerServerBoardInfo(
+        from_=message["from"],
+        statusCode=message["statusCode"],
+        topic="boardInfo",
+        payload={
+            MAC: DancerDataItem(
+                IP=item["IP"],
+                MAC=item["MAC"],
+                dancer=item["dancer"],
+                hostname=item["hostname"],
+                connected=item["connected"],
+                interface=item["interface"],
+            )
+            for MAC, item in message["payload"].items()
+        },
+    )
+
+
+def decode_command_response(
+    message: dict[str, Any],
+) -> FromControllerServerCommandResponse:
+    payload = message["payload"]
+    return FromControllerServerCommandResponse(
+        from_=message["from"],
+        statusCode=message["statusCode"],
+        topic="command",
+        payload=FromControllerServerCommandResponsePayload(
+            command=payload["command"],
+            message=payload["message"],
+            dancer=payload["dancer"],
+        ),
+    )
+
+
+def decode_time(message: dict[str, Any], received: float) -> FromControllerServerTime:
+    payload = message["payload"]
+    return FromControllerServerTime(
+        from_=message["from"],
+        statusCode=message["statusCode"],
+        topic="time",
+        payload=FromControllerServerTimePayload(
+            t0=payload["t0"], t1=payload["t1"], t2=payload["t2"], t3=received
+        ),
+    )
+
+
+def decode_command_message(data: str | bytes, received: float) -> FromControllerServer:
+    """
+    :param data: one websocket message
+    :param received: local time in ms when it was received
+    """
+    message = loads(data)
+    match message["topic"]:
+        case "boardInfo":
+            return decode_board_info(message)
+        case "command":
+            return decode_command_response(message)
+        case "time":
+            return decode_time(message, received)
+        case _:
+            raise Exception("Invalid command data recieved")
@@ -0,0 +1,71 @@
+"""
+Metadata of GraphQL operations, compiled once per document: the operation
+type, the root field name, the field table and the printed query. gql's
+transports print the document on every request, they are given the printed
+query from here instead.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ..schemas.document import Document
+from .cache import FieldTable, query_defs_to_field_table
+
+if TYPE_CHECKING:
+    from graphql import DocumentNode
+
+
+@dataclass(frozen=True)
+class CompiledOperation:
+    node: "DocumentNode"
+    operation_type: str
+    root_field: str
+    field_table: FieldTable
+    query: str
+
+
+compiled_operations: dict[Document, CompiledOperation] = {}
+# id of the document node -> printed query, for the transports
+printed_queries: dict[int, str] = {}
+
+
+def compile_operation(document: Document) -> CompiledOperation:
+    operation = compiled_operations.get(document)
+    if operation is not None:
+        return operation
+
+    from graphql import print_ast
+
+    node = document.node
+    field_table = query_defs_to_field_table(document.definition)
+    operation = CompiledOperation(
+        node=node,
+        operation_type=node.definitions[0].operation.value,  # type: ignore
+        root_field=field_table[0],
+        field_table=field_table,
+        query=print_ast(node),
+    )
+
+    compiled_operations[document] = operation
+    printed_queries[id(node)] = operation.query
+
+    return operation
+
+
+def print_document(document: "DocumentNode") -> str:
+    query = printed_queries.get(id(document))
+    if query is not None:
+        return query
+
+    from graphql import print_ast
+
+    return print_ast(document)
+
+
+def use_printed_queries():
+    """Make gql's transports send the printed query of compiled operations"""
+    import gql.transport.aiohttp
+    import gql.transport.websockets
+
+    setattr(gql.transport.aiohttp, "print_ast", print_document)
+    setattr(gql.transport.websockets, "print_ast", print_document)
@@ -1,10 +1,14 @@
 import asyncio
+import time
 
+from ..api.command_agent import command_agent
 from ..client import Clients, client
 from ..client.cache import Modifiers
 from ..core.actions.property.command import set_command_status
+from ..core.actions.state.catch_up import catch_up_frames
+from ..core.actions.state.clock import read_time_response
 from ..core.actions.state.color_map import add_color, delete_color, update_color
-from ..core.actions.state.command import read_board_info_payload, read_command_response
+from ..core.actions.state.command import read_board_info_payload, read_command_responses
 from ..core.actions.state.control_map import (
     add_control,
     delete_control,
@@ -19,6 +23,7 @@ from ..core.actions.state.led_map import (
 from ..core.actions.state.pos_map import add_pos, delete_pos, set_pos_record, update_pos
 from ..core.log import logger
 from ..core.models import ID, LEDMap
+from ..core.utils.algorithms import backoff_delay
 from ..core.utils.convert import (
     color_query_to_state,
     control_frame_query_to_state,
@@ -29,7 +34,11 @@ from ..core.utils.convert import (
     pos_frame_sub_to_query,
 )
 from ..core.utils.notification import notify
-from ..core.utils.ui import redraw_area
+from ..core.utils.ui import request_redraw
+from ..schemas.command import (
+    FromControllerServerCommandResponse,
+    ToControllerServerBoardInfoPartial,
+)
 from ..schemas.queries import (
     QueryColorMapData,
     QueryColorMapPayloadItem,
@@ -58,6 +67,14 @@ from ..schemas.subscriptions import (
     SubPositionRecordData,
 )
 
+# Seconds before resubscribing, doubled on each failure up to the maximum
+SUBSCRIBE_INITIAL_DELAY = 1.0
+SUBSCRIBE_MAX_DELAY = 60.0
+# Connections that lasted longer start over from the initial delay
+SUBSCRIBE_STABLE_TIME = 30.0
+# Seconds the subscriptions must stay up before catching up on missed frames
+SUBSCRIBE_SETTLE_TIME = 2.0
+
 
 async def sub_pos_record(client: Clients):
     async for data in client.subscribe(SubPositionRecordData, SUB_POS_RECORD):
@@ -350,9 +367,26 @@ async def sub_color_map(client: Clients):
 subscription_task: asyncio.Task[None] | None = None
 
 
+async def catch_up_when_live():
+    """
+    editor-server does not confirm subscriptions, and changes made before it
+    registers them are only seen by a catch up started afterwards. Wait for the
+    subscriptions to stay up, which also skips attempts failing while it is
+    down, catch up, and once more in case they were registered late.
+    """
+    for _ in range(2):
+        await asyncio.sleep(SUBSCRIBE_SETTLE_TIME)
+        if not await catch_up_frames():
+            return
+
+
 async def subscribe():
+    attempt = 0
+    reconnecting = False
+
     while True:
         logger.info("Subscribing...")
+        started = time.monotonic()
 
         tasks = [
             # asyncio.create_task(sub_pos_record(client)),
@@ -363,6 +397,9 @@ async def subscribe():
             asyncio.create_task(sub_led_record(client)),
             asyncio.create_task(sub_color_map(client)),
         ]
+        if reconnecting:
+            # Cancelled along with the subscriptions if they fail
+            tasks.append(asyncio.create_task(catch_up_when_live()))
 
         fut = asyncio.gather(*tasks)
 
@@ -375,31 +412,76 @@ async def subscribe():
 
         except Exception:
             logger.exception("Subscription closed with error.")
-            fut.cancel()
+            # The gather is already done, so it no longer cancels the others
+            for task in tasks:
+                task.cancel()
+
+        if time.monotonic() - started > SUBSCRIBE_STABLE_TIME:
+            attempt = 0
+        delay = backoff_delay(attempt, SUBSCRIBE_INITIAL_DELAY, SUBSCRIBE_MAX_DELAY)
+        attempt += 1
+        reconnecting = True
 
-        print("Reconnecting subscription...")
-        await asyncio.sleep(3)
+        logger.info(f"Reconnecting subscription in {delay:.1f} s...")
+        await asyncio.sleep(delay)
 
 
 async def sub_controller_server(client: Clients):
-    async for controller_data in client.subscribe_command():
-        match controller_data.topic:
-            case "boardInfo":
-                notify("INFO", "Board info updated")
-                logger.info("Board info from controller server")
-                read_board_info_payload(controller_data.payload)
-            case "command":
-                notify("INFO", "Command response received")
-                logger.info(
-                    f"Command response from controller server: {controller_data}"
-                )
-                read_command_response(controller_data)
-        redraw_area({"VIEW_3D"})
+    async for batch in client.subscribe_command():
+        # Each board info carries the whole board table, only the last one of
+        # the batch is applied, in its place among the command responses
+        last_board_info = max(
+            (
+                index
+                for index, controller_data in enumerate(batch)
+                if controller_data.topic == "boardInfo"
+            ),
+            default=-1,
+        )
+        responses: list[FromControllerServerCommandResponse] = []
+
+        for index, controller_data in enumerate(batch):
+            match controller_data.topic:
+                case "boardInfo":
+                    if index != last_board_info:
+                        continue
+                    if responses:
+                        read_command_responses(responses)
+                        responses = []
+                    notify("INFO", "Board info updated")
+                    logger.info("Board info from controller server")
+                    read_board_info_payload(controller_data.payload)
+                case "command":
+                    logger.info(
+                        f"Command response from controller server: {controller_data}"
+                    )
+                    responses.append(controller_data)
+                case "time":
+                    read_time_response(controller_data.payload)
+
+        if responses:
+            read_command_responses(responses)
+        if any(controller_data.topic == "command" for controller_data in batch):
+            notify("INFO", "Command response received")
+        request_redraw({"VIEW_3D"})
 
 
 async def subscribe_command():
+    attempt = 0
+    reconnecting = False
+
     while True:
+        started = time.monotonic()
         try:
+            if reconnecting:
+                await client.restart_command()
+                # Controller server sends to the control panels that asked
+                # for board info
+                await command_agent.send_to_controller_server(
+                    ToControllerServerBoardInfoPartial.from_dict({"topic": "boardInfo"})
+                )
+                set_command_status(True)
+
             logger.info("Subscribing controller server...")
 
             tasks = [
@@ -412,9 +494,16 @@ async def subscribe_command():
             logger.exception("Subscription cancelled.")
             break
 
-        except Exception as e:
-            logger.exception("Subscription closed with error:", e)
+        except Exception:
+            logger.exception("Subscription closed with error.")
 
         set_command_status(False)
-        logger.info("Reconnecting subscription...")
-        await asyncio.sleep(3)
+
+        if time.monotonic() - started > SUBSCRIBE_STABLE_TIME:
+            attempt = 0
+        delay = backoff_delay(attempt, SUBSCRIBE_INITIAL_DELAY, SUBSCRIBE_MAX_DELAY)
+        attempt += 1
+        reconnecting = True
+
+        logger.info(f"Reconnecting controller server in {delay:.1f} s...")
+        await asyncio.sleep(delay)
@@ -3,6 +3,7 @@ from .control import (
     delete_partial_ctrl_keyframes,
     edit_partial_ctrl_keyframes,
     init_ctrl_keyframes_from_state,
+    init_ctrl_keyframes_from_state_in_pool,
     modify_partial_ctrl_keyframes,
     reset_control_frames_and_fade_sequence,
     reset_ctrl_rev,
@@ -10,6 +11,7 @@ from .control import (
 )
 from .position import (
     init_pos_keyframes_from_state,
+    init_pos_keyframes_from_state_progressively,
     modify_partial_pos_keyframes,
     reset_pos_frames,
     reset_pos_rev,
@@ -21,11 +23,13 @@ __all__ = [
     "delete_partial_ctrl_keyframes",
     "edit_partial_ctrl_keyframes",
     "init_ctrl_keyframes_from_state",
+    "init_ctrl_keyframes_from_state_in_pool",
     "modify_partial_ctrl_keyframes",
     "reset_control_frames_and_fade_sequence",
     "reset_ctrl_rev",
     "update_control_frames_and_fade_sequence",
     "init_pos_keyframes_from_state",
+    "init_pos_keyframes_from_state_progressively",
     "modify_partial_pos_keyframes",
     "reset_pos_frames",
     "reset_pos_rev",
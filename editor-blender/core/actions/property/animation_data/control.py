@@ -4,26 +4,38 @@ control.py
 - This file contains functions to update control keyframes in Blender.
 """
 
+from collections.abc import Callable
+from functools import partial
 from typing import cast
 
 import bpy
 
 from .....properties.types import RevisionPropertyItemType
+from ....asyncio.job import ProgressCallback, ProgressiveJob
+from ....asyncio.pool import process_pool
 from ....log import logger
 from ....models import ControlMapElement, MapID, PartType
 from ....states import state
 from ....utils.algorithms import smallest_range_including_lr
+from ....utils.compute import compute_control_animation_data
 from ....utils.convert import (
     ControlAddAnimationData,
     ControlAddCurveData,
+    ControlAnimationData,
     ControlDeleteAnimationData,
     ControlDeleteCurveData,
     ControlModifyAnimationData,
     ControlUpdateAnimationData,
     ControlUpdateCurveData,
     control_map_to_animation_data,
+    pack_control_map_input,
+)
+from .utils import (
+    ensure_action,
+    ensure_curve,
+    get_keyframe_points,
+    prioritized_dancer_indices,
 )
-from .utils import ensure_action, ensure_curve, get_keyframe_points
 
 
 def reset_control_frames_and_fade_sequence(fade_seq: list[tuple[int, bool]]):
@@ -171,11 +183,10 @@ def init_ctrl_single_object_action(
             point.select_control_point = False
 
 
-def init_ctrl_keyframes_from_state(dancers_reset: list[bool] | None = None):
-    if not bpy.context:
-        return
-    data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
-
+def filter_ctrl_map_by_load_frames() -> (
+    tuple[list[tuple[MapID, ControlMapElement]], list[tuple[MapID, ControlMapElement]]]
+):
+    """Returns the sorted control map and the part of it that gets loaded."""
     ctrl_map = state.control_map
 
     sorted_ctrl_map = sorted(ctrl_map.items(), key=lambda item: item[1].start)
@@ -202,85 +213,122 @@ def init_ctrl_keyframes_from_state(dancers_reset: list[bool] | None = None):
             filtered_index += 1
     state.not_loaded_control_frames = not_loaded_ctrl_frames
 
+    return sorted_ctrl_map, filtered_ctrl_map
+
+
+def init_ctrl_keyframes_from_state(dancers_reset: list[bool] | None = None):
+    sorted_ctrl_map, filtered_ctrl_map = filter_ctrl_map_by_load_frames()
     animation_data = control_map_to_animation_data(filtered_ctrl_map)
+    apply_ctrl_keyframes(
+        sorted_ctrl_map, filtered_ctrl_map, animation_data, dancers_reset
+    )
 
-    ctrl_frame_number = len(filtered_ctrl_map)
 
-    show_dancer = state.show_dancers
+async def init_ctrl_keyframes_from_state_in_pool(
+    dancers_reset: list[bool] | None = None,
+    on_progress: ProgressCallback | None = None,
+):
+    """
+    Same as init_ctrl_keyframes_from_state, but the animation data is computed
+    in a worker process and the keyframes are written progressively.
+    """
+    sorted_ctrl_map, filtered_ctrl_map = filter_ctrl_map_by_load_frames()
+    animation_data = await process_pool.run(
+        compute_control_animation_data, *pack_control_map_input(filtered_ctrl_map)
+    )
+    await apply_ctrl_keyframes_progressively(
+        sorted_ctrl_map, filtered_ctrl_map, animation_data, dancers_reset, on_progress
+    )
 
-    for dancer_index, dancer_item in enumerate(state.dancers_array):
-        if not show_dancer[dancer_index]:
-            continue
 
-        parts = dancer_item.parts
+def init_ctrl_part_keyframes(
+    dancer_index: int,
+    dancer_name: str,
+    part_name: str,
+    part_type: PartType,
+    animation_data: ControlAnimationData,
+    ctrl_frame_number: int,
+):
+    data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
 
-        for part in parts:
-            part_name = part.name
-            part_type = part.type
+    part_obj_name = f"{dancer_index}_{part_name}"
+    part_obj = data_objects[part_obj_name]
 
-            part_obj_name = f"{dancer_index}_{part_name}"
-            part_obj = data_objects[part_obj_name]
+    if part_type == PartType.LED:
+        for led_obj in part_obj.children:
+            if led_obj.animation_data is not None:
+                action = cast(bpy.types.Action | None, led_obj.animation_data.action)
+                if action != None:
+                    bpy.data.actions.remove(action, do_unlink=True)
 
-            if part_type == PartType.LED:
-                for led_obj in part_obj.children:
-                    if led_obj.animation_data is not None:
-                        action = cast(
-                            bpy.types.Action | None, led_obj.animation_data.action
-                        )
-                        if action != None:
-                            bpy.data.actions.remove(action, do_unlink=True)
+            if ctrl_frame_number == 0:
+                continue
 
-            else:
-                if part_obj.animation_data is not None:
-                    action = cast(
-                        bpy.types.Action | None, part_obj.animation_data.action
-                    )
-                    if action != None:
-                        bpy.data.actions.remove(action, do_unlink=True)
+            position: int = getattr(led_obj, "ld_led_pos")
+            action = ensure_action(led_obj, f"{part_obj_name}Action.{position:03}")
+
+            frames = cast(
+                list[tuple[int, bool, tuple[float, float, float]]],
+                animation_data[dancer_name][part_name][position],
+            )
+            init_ctrl_single_object_action(action, frames, ctrl_frame_number)
+
+    else:
+        if part_obj.animation_data is not None:
+            action = cast(bpy.types.Action | None, part_obj.animation_data.action)
+            if action != None:
+                bpy.data.actions.remove(action, do_unlink=True)
 
-    for dancer_index, dancer_item in enumerate(state.dancers_array):
-        # if ((dancers_reset is not None and not dancers_reset[dancer_index])
-        #     or not show_dancer[dancer_index]
-        # ):
-        #     continue
         if ctrl_frame_number == 0:
-            break
-        if not show_dancer[dancer_index]:
-            continue
-        dancer_name = dancer_item.name
-        parts = dancer_item.parts
+            return
 
-        logger.info(f"[CTRL INIT] {dancer_name}")
+        action = ensure_action(part_obj, f"{part_obj_name}Action")
 
-        for part in parts:
-            part_name = part.name
-            part_type = part.type
+        frames = cast(
+            list[tuple[int, bool, tuple[float, float, float]]],
+            animation_data[dancer_name][part_name],
+        )
+        init_ctrl_single_object_action(action, frames, ctrl_frame_number)
 
-            part_obj_name = f"{dancer_index}_{part_name}"
-            part_obj = data_objects[part_obj_name]
 
-            if part_type == PartType.LED:
-                for led_obj in part_obj.children:
-                    position: int = getattr(led_obj, "ld_led_pos")
+def ctrl_keyframes_steps(
+    filtered_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    animation_data: ControlAnimationData,
+) -> list[Callable[[], None]]:
+    """One step per part of each shown dancer, prioritized dancers first."""
+    ctrl_frame_number = len(filtered_ctrl_map)
+    steps: list[Callable[[], None]] = []
+
+    for dancer_index in prioritized_dancer_indices():
+        dancer_item = state.dancers_array[dancer_index]
+        if ctrl_frame_number > 0:
+            steps.append(partial(logger.info, f"[CTRL INIT] {dancer_item.name}"))
+
+        for part in dancer_item.parts:
+            steps.append(
+                partial(
+                    init_ctrl_part_keyframes,
+                    dancer_index,
+                    dancer_item.name,
+                    part.name,
+                    part.type,
+                    animation_data,
+                    ctrl_frame_number,
+                )
+            )
 
-                    action = ensure_action(
-                        led_obj, f"{part_obj_name}Action.{position:03}"
-                    )
+    return steps
 
-                    frames = cast(
-                        list[tuple[int, bool, tuple[float, float, float]]],
-                        animation_data[dancer_name][part_name][position],
-                    )
-                    init_ctrl_single_object_action(action, frames, ctrl_frame_number)
 
-            else:
-                action = ensure_action(part_obj, f"{part_obj_name}Action")
+def finish_ctrl_keyframes(
+    sorted_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    filtered_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    dancers_reset: list[bool] | None = None,
+):
+    if not bpy.context:
+        return
 
-                frames = cast(
-                    list[tuple[int, bool, tuple[float, float, float]]],
-                    animation_data[dancer_name][part_name],
-                )
-                init_ctrl_single_object_action(action, frames, ctrl_frame_number)
+    ctrl_frame_number = len(filtered_ctrl_map)
 
     reset_ctrl_rev(sorted_ctrl_map)
 
@@ -295,13 +343,47 @@ def init_ctrl_keyframes_from_state(dancers_reset: list[bool] | None = None):
     if ctrl_frame_number == 0:
         return
 
-    action = ensure_action(scene, "SceneAction")
+    ensure_action(scene, "SceneAction")
 
     if dancers_reset is None or all(dancers_reset):
         fade_seq = [(frame.start, frame.fade) for _, frame in filtered_ctrl_map]
         reset_control_frames_and_fade_sequence(fade_seq)
 
 
+def apply_ctrl_keyframes(
+    sorted_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    filtered_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    animation_data: ControlAnimationData,
+    dancers_reset: list[bool] | None = None,
+):
+    if not bpy.context:
+        return
+
+    for step in ctrl_keyframes_steps(filtered_ctrl_map, animation_data):
+        step()
+
+    finish_ctrl_keyframes(sorted_ctrl_map, filtered_ctrl_map, dancers_reset)
+
+
+async def apply_ctrl_keyframes_progressively(
+    sorted_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    filtered_ctrl_map: list[tuple[MapID, ControlMapElement]],
+    animation_data: ControlAnimationData,
+    dancers_reset: list[bool] | None = None,
+    on_progress: ProgressCallback | None = None,
+):
+    """Same as apply_ctrl_keyframes, yielding to the event loop between parts."""
+    if not bpy.context:
+        return
+
+    job = ProgressiveJob(
+        ctrl_keyframes_steps(filtered_ctrl_map, animation_data), on_progress
+    )
+    await job.run()
+
+    finish_ctrl_keyframes(sorted_ctrl_map, filtered_ctrl_map, dancers_reset)
+
+
 """
 modify control keyframes (adding, updating, and deleting all in one function)
 """
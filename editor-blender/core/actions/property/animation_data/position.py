@@ -4,16 +4,24 @@ position.py
 - This file contains functions to update position keyframes in Blender.
 """
 
+from collections.abc import Callable
+from functools import partial
 from typing import cast
 
 import bpy
 
 from .....properties.types import RevisionPropertyItemType
+from ....asyncio.job import ProgressCallback, ProgressiveJob
 from ....models import MapID, PosMapElement
 from ....states import state
 from ....utils.algorithms import smallest_range_including_lr
 from ....utils.convert import PosModifyAnimationData
-from .utils import ensure_action, ensure_curve, get_keyframe_points
+from .utils import (
+    ensure_action,
+    ensure_curve,
+    get_keyframe_points,
+    prioritized_dancer_indices,
+)
 
 
 def reset_pos_frames():
@@ -127,11 +135,8 @@ setups & update colormap(===setups)
 """
 
 
-def init_pos_keyframes_from_state(dancers_reset: list[bool] | None = None):
-    if not bpy.context:
-        return
-    data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
-
+def filter_pos_map_by_load_frames() -> list[tuple[MapID, PosMapElement]]:
+    """Returns the sorted part of the position map that gets loaded."""
     pos_map = state.pos_map
 
     sorted_pos_map = sorted(pos_map.items(), key=lambda item: item[1].start)
@@ -156,82 +161,84 @@ def init_pos_keyframes_from_state(dancers_reset: list[bool] | None = None):
             filtered_index += 1
     state.not_loaded_pos_frames = not_loaded_pos_frames
 
-    pos_frame_number = len(filtered_pos_map)
-    show_dancer = state.show_dancers
+    return filtered_pos_map
 
-    for dancer_name in state.dancer_names:
-        dancer_index = state.dancer_part_index_map[dancer_name].index
-        if not show_dancer[dancer_index]:
-            continue
 
-        dancer_obj = data_objects[dancer_name]
-
-        if dancer_obj.animation_data is not None:
-            action = cast(bpy.types.Action | None, dancer_obj.animation_data.action)
-            if action != None:
-                bpy.data.actions.remove(action, do_unlink=True)
-
-    for i, (id, pos_map_element) in enumerate(filtered_pos_map):
-        if pos_frame_number == 0:
-            break
-
-        frame_start = pos_map_element.start
-        pos_status = pos_map_element.pos
+def init_pos_dancer_keyframes(
+    dancer_name: str, filtered_pos_map: list[tuple[MapID, PosMapElement]]
+):
+    data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
+    dancer_obj = data_objects[dancer_name]
 
-        for dancer_name, pos in pos_status.items():
-            dancer_index = state.dancer_part_index_map[dancer_name].index
-            # if ((dancers_reset and not dancers_reset[dancer_index])
-            #     or not show_dancer[dancer_index]
-            # ):
-            #     continue
-            if not show_dancer[dancer_index]:
-                continue
+    if dancer_obj.animation_data is not None:
+        action = cast(bpy.types.Action | None, dancer_obj.animation_data.action)
+        if action != None:
+            bpy.data.actions.remove(action, do_unlink=True)
 
-            dancer_location = (pos.location.x, pos.location.y, pos.location.z)
-            dancer_rotation = (pos.rotation.rx, pos.rotation.ry, pos.rotation.rz)
+    pos_frame_number = len(filtered_pos_map)
+    kpoints_lists: list[tuple[list[bpy.types.Keyframe], list[bpy.types.Keyframe]]] = []
 
-            dancer_obj = data_objects[dancer_name]
+    for i, (_, pos_map_element) in enumerate(filtered_pos_map):
+        pos = pos_map_element.pos.get(dancer_name)
+        if pos is None:
+            continue
 
+        if len(kpoints_lists) == 0:
             action = ensure_action(dancer_obj, dancer_name + "Action")
-
             for d in range(3):
                 loc_curve = ensure_curve(
-                    action,
-                    "location",
-                    index=d,
-                    keyframe_points=pos_frame_number,
-                    clear=i == 0,
+                    action, "location", index=d, keyframe_points=pos_frame_number
                 )
                 rot_curve = ensure_curve(
                     action,
                     "rotation_euler",
                     index=d,
                     keyframe_points=pos_frame_number,
-                    clear=i == 0,
+                )
+                kpoints_lists.append(
+                    (
+                        get_keyframe_points(loc_curve)[1],
+                        get_keyframe_points(rot_curve)[1],
+                    )
                 )
 
-                _, loc_kpoints_list = get_keyframe_points(loc_curve)
-                _, rot_kpoints_list = get_keyframe_points(rot_curve)
+        frame_start = pos_map_element.start
+        dancer_location = (pos.location.x, pos.location.y, pos.location.z)
+        dancer_rotation = (pos.rotation.rx, pos.rotation.ry, pos.rotation.rz)
 
-                loc_point = loc_kpoints_list[i]
-                rot_point = rot_kpoints_list[i]
-                loc_point.co = frame_start, dancer_location[d]
-                rot_point.co = frame_start, dancer_rotation[d]
+        for d, (loc_kpoints_list, rot_kpoints_list) in enumerate(kpoints_lists):
+            loc_point = loc_kpoints_list[i]
+            rot_point = rot_kpoints_list[i]
+            loc_point.co = frame_start, dancer_location[d]
+            rot_point.co = frame_start, dancer_rotation[d]
 
-                loc_point.interpolation = "LINEAR"
-                rot_point.interpolation = "LINEAR"
+            loc_point.interpolation = "LINEAR"
+            rot_point.interpolation = "LINEAR"
 
-                loc_point.select_control_point = False
-                rot_point.select_control_point = False
+            loc_point.select_control_point = False
+            rot_point.select_control_point = False
 
-        # insert fake frame
-        scene = bpy.context.scene
 
-        action = ensure_action(scene, "SceneAction")
-        curve = ensure_curve(
-            action, "ld_pos_frame", keyframe_points=pos_frame_number, clear=i == 0
-        )
-        _, kpoints_list = get_keyframe_points(curve)
+def finish_pos_keyframes(filtered_pos_map: list[tuple[MapID, PosMapElement]]):
+    if not bpy.context:
+        return
+    pos_frame_number = len(filtered_pos_map)
+    if pos_frame_number == 0:
+        return
+
+    # insert fake frame
+    scene = bpy.context.scene
+
+    action = ensure_action(scene, "SceneAction")
+    curve = ensure_curve(
+        action, "ld_pos_frame", keyframe_points=pos_frame_number, clear=True
+    )
+    _, kpoints_list = get_keyframe_points(curve)
+
+    ld_pos_rev = getattr(bpy.context.scene, "ld_pos_rev")
+
+    for i, (id, pos_map_element) in enumerate(filtered_pos_map):
+        frame_start = pos_map_element.start
 
         point = kpoints_list[i]
         point.co = frame_start, frame_start
@@ -242,9 +249,7 @@ def init_pos_keyframes_from_state(dancers_reset: list[bool] | None = None):
         # set revision
         rev = pos_map_element.rev
 
-        pos_rev_item: RevisionPropertyItemType = getattr(
-            bpy.context.scene, "ld_pos_rev"
-        ).add()
+        pos_rev_item: RevisionPropertyItemType = ld_pos_rev.add()
 
         pos_rev_item.data = rev.data if rev else -1
         pos_rev_item.meta = rev.meta if rev else -1
@@ -253,6 +258,44 @@ def init_pos_keyframes_from_state(dancers_reset: list[bool] | None = None):
         pos_rev_item.frame_start = frame_start
 
 
+def pos_keyframes_steps(
+    filtered_pos_map: list[tuple[MapID, PosMapElement]],
+) -> list[Callable[[], None]]:
+    """One step per shown dancer, prioritized dancers first."""
+    return [
+        partial(
+            init_pos_dancer_keyframes,
+            state.dancers_array[dancer_index].name,
+            filtered_pos_map,
+        )
+        for dancer_index in prioritized_dancer_indices()
+    ]
+
+
+def init_pos_keyframes_from_state(dancers_reset: list[bool] | None = None):
+    if not bpy.context:
+        return
+
+    filtered_pos_map = filter_pos_map_by_load_frames()
+    for step in pos_keyframes_steps(filtered_pos_map):
+        step()
+    finish_pos_keyframes(filtered_pos_map)
+
+
+async def init_pos_keyframes_from_state_progressively(
+    dancers_reset: list[bool] | None = None,
+    on_progress: ProgressCallback | None = None,
+):
+    """Same as init_pos_keyframes_from_state, yielding between dancers."""
+    if not bpy.context:
+        return
+
+    filtered_pos_map = filter_pos_map_by_load_frames()
+    job = ProgressiveJob(pos_keyframes_steps(filtered_pos_map), on_progress)
+    await job.run()
+    finish_pos_keyframes(filtered_pos_map)
+
+
 """
 update position keyframes
 """
@@ -2,6 +2,8 @@ from typing import cast
 
 import bpy
 
+from ....states import state
+
 
 def ensure_action(
     obj: bpy.types.Object | bpy.types.Scene, action_name: str
@@ -47,3 +49,26 @@ def get_keyframe_points(
     curve: bpy.types.FCurve,
 ) -> tuple[bpy.types.FCurveKeyframePoints, list[bpy.types.Keyframe]]:
     return curve.keyframe_points, cast(list[bpy.types.Keyframe], curve.keyframe_points)
+
+
+def prioritized_dancer_indices() -> list[int]:
+    """
+    Indices of the shown dancers, the selected and most recently selected
+    dancers first so they become interactive first during initialization.
+    """
+    show_dancers = state.show_dancers
+    indices: list[int] = []
+    seen: set[int] = set()
+
+    for dancer_name in reversed(state.recent_dancers):
+        item = state.dancer_part_index_map.get(dancer_name)
+        if item is None or item.index in seen or not show_dancers[item.index]:
+            continue
+        indices.append(item.index)
+        seen.add(item.index)
+
+    for dancer_index, shown in enumerate(show_dancers):
+        if shown and dancer_index not in seen:
+            indices.append(dancer_index)
+
+    return indices
@@ -1,4 +1,5 @@
 import asyncio
+from collections.abc import Iterable
 from typing import Any
 
 import bpy
@@ -7,7 +8,7 @@ from ....properties.ui.types import CommandCenterRPiStatusType, CommandCenterSta
 from ...asyncio import AsyncTask
 from ...log import logger
 from ...states import state
-from ...utils.ui import redraw_area
+from ...utils.ui import redraw_area, request_redraw
 
 
 class Countdown_task_class:
@@ -26,7 +27,42 @@ def set_command_status(connected: bool):
     command_status.connected = connected
 
 
-def set_RPi_props_from_state():
+# name -> index in ld_ui_rpi_status
+rpi_prop_indices: dict[str, int] = {}
+
+
+def get_rpi_prop(
+    rpi_props: list[CommandCenterRPiStatusType], dancer_name: str
+) -> CommandCenterRPiStatusType | None:
+    index = rpi_prop_indices.get(dancer_name)
+    if index is not None and index < len(rpi_props):
+        rpi_item = rpi_props[index]
+        if rpi_item.name == dancer_name:
+            return rpi_item
+    elif index is None and len(rpi_prop_indices) == len(rpi_props):
+        return None
+
+    # The collection was changed elsewhere, index it again
+    rpi_prop_indices.clear()
+    for index, rpi_item in enumerate(rpi_props):
+        rpi_prop_indices[rpi_item.name] = index
+
+    index = rpi_prop_indices.get(dancer_name)
+    return None if index is None else rpi_props[index]
+
+
+def set_prop_if_changed(item: Any, name: str, value: Any) -> bool:
+    if getattr(item, name) == value:
+        return False
+    setattr(item, name, value)
+    return True
+
+
+def set_RPi_props_from_state(dancer_names: Iterable[str] | None = None):
+    """
+    Update the RPi list from state, only for `dancer_names` if given. Fields
+    are written only when they changed, and the redraw is batched.
+    """
     if not bpy.context:
         return
     rpi_props: list[CommandCenterRPiStatusType] = getattr(
@@ -34,42 +70,44 @@ def set_RPi_props_from_state():
     )
 
     rpi_status = state.rpi_status
-    if not rpi_props:
-        for dancer_name, dancer_item in rpi_status.items():
-            rpi_item: CommandCenterRPiStatusType = getattr(
-                bpy.context.window_manager, "ld_ui_rpi_status"
-            ).add()
+    changed = False
+
+    for dancer_name in rpi_status if dancer_names is None else dancer_names:
+        dancer_item = rpi_status.get(dancer_name)
+        if dancer_item is None:
+            continue
+
+        if dancer_item.ethernet.connected == dancer_item.wifi.connected:
+            interface_type = "ethernet"
+            interface_status = dancer_item.ethernet
+        elif dancer_item.ethernet.connected:
+            interface_type = "ethernet"
+            interface_status = dancer_item.ethernet
+        else:
+            interface_type = "wifi"
+            interface_status = dancer_item.wifi
+
+        rpi_item = get_rpi_prop(rpi_props, dancer_name)
+        if rpi_item is None:
+            rpi_item = rpi_props.add()  # type: ignore
+            rpi_prop_indices[dancer_name] = len(rpi_props) - 1
             rpi_item.name = dancer_name
-            if dancer_item.ethernet.connected == dancer_item.wifi.connected:
-                rpi_item.interface_type = "ethernet"
-                interface_status = dancer_item.ethernet
-            elif dancer_item.ethernet.connected:
-                rpi_item.interface_type = "ethernet"
-                interface_status = dancer_item.ethernet
-            else:
-                rpi_item.interface_type = "wifi"
-                interface_status = dancer_item.wifi
-
+            rpi_item.interface_type = interface_type
             rpi_item.IP = interface_status.IP
             rpi_item.MAC = interface_status.MAC
-            rpi_item.connected = interface_status.connected
-            rpi_item.message = interface_status.message
-            rpi_item.statusCode = interface_status.statusCode
             rpi_item.selected = False
-    else:
-        for dancer_name, dancer_item in rpi_status.items():
-            rpi_item: CommandCenterRPiStatusType = next(
-                item for item in rpi_props if item.name == dancer_name
-            )
-            if dancer_item.ethernet.connected == dancer_item.wifi.connected:
-                interface_status = dancer_item.ethernet
-            elif dancer_item.ethernet.connected:
-                interface_status = dancer_item.ethernet
-            else:
-                interface_status = dancer_item.wifi
-            rpi_item.connected = interface_status.connected
-            rpi_item.message = interface_status.message
-            rpi_item.statusCode = interface_status.statusCode
+            changed = True
+
+        changed |= set_prop_if_changed(
+            rpi_item, "connected", interface_status.connected
+        )
+        changed |= set_prop_if_changed(rpi_item, "message", interface_status.message)
+        changed |= set_prop_if_changed(
+            rpi_item, "statusCode", interface_status.statusCode
+        )
+
+    if changed:
+        request_redraw({"VIEW_3D"})
 
 
 def get_selected_dancer() -> list[str]:
@@ -81,6 +119,21 @@ def get_selected_dancer() -> list[str]:
     return [item.name for item in rpi_status_list if item.selected]
 
 
+def get_active_dancer() -> str | None:
+    """RPi highlighted in the list"""
+    if not bpy.context:
+        return None
+    rpi_status_list: list[CommandCenterRPiStatusType] = getattr(
+        bpy.context.window_manager, "ld_ui_rpi_status"
+    )
+    index: int = getattr(
+        bpy.context.window_manager, "ld_ui_command_center_dancer_index"
+    )
+    if 0 <= index < len(rpi_status_list):
+        return rpi_status_list[index].name
+    return None
+
+
 def set_countdown(delay: int):
     async def countdown(delay: int):
         if not bpy.context:
@@ -22,10 +22,24 @@ LED:
     - Colors are determined by `ld_color_float`.
     - If both ends are -1, fill with black.
     - `ld_alpha` is set to 255 to remove effect of `update_current_alpha`.
+
+`update_current_status_by_index` writes these props with the callbacks below
+suppressed (`state.applying_status`) and runs `refresh_light_object` once per
+changed part afterwards. Any other write invalidates its diff for the part.
 """
 
 
+def forget_applied_status(obj: bpy.types.Object):
+    if getattr(obj, "ld_light_type") == LightType.LED_BULB.value and obj.parent:
+        obj = obj.parent
+    state.applied_status.pop(obj.name, None)
+
+
 def update_current_color(self: bpy.types.Object, context: bpy.types.Context):
+    if state.applying_status:
+        return
+    forget_applied_status(self)
+
     if state.edit_state != EditMode.EDITING or state.current_editing_detached:
         return
 
@@ -47,6 +61,10 @@ def update_current_color(self: bpy.types.Object, context: bpy.types.Context):
 
 
 def update_current_effect(self: bpy.types.Object, context: bpy.types.Context):
+    if state.applying_status:
+        return
+    forget_applied_status(self)
+
     if state.edit_state != EditMode.EDITING or state.current_editing_detached:
         return
 
@@ -98,6 +116,10 @@ def update_current_effect(self: bpy.types.Object, context: bpy.types.Context):
 
 
 def update_current_alpha(self: bpy.types.Object, context: bpy.types.Context):
+    if state.applying_status:
+        return
+    forget_applied_status(self)
+
     if state.edit_state != EditMode.EDITING or state.current_editing_detached:
         return
 
@@ -118,6 +140,26 @@ def update_current_alpha(self: bpy.types.Object, context: bpy.types.Context):
         self.color[2] = ld_color_float[2] * (ld_alpha / 255)
 
 
+def refresh_light_object(obj: bpy.types.Object, context: bpy.types.Context):
+    """Same effect as the update callbacks fired by writing all props of a part"""
+    match getattr(obj, "ld_light_type"):
+        case LightType.FIBER.value:
+            update_current_color(obj, context)
+            update_current_alpha(obj, context)
+        case LightType.LED.value:
+            if obj["ld_effect"] == 0:
+                if (
+                    state.edit_state == EditMode.EDITING
+                    and not state.current_editing_detached
+                ):
+                    update_gradient_color(obj)
+            else:
+                update_current_effect(obj, context)
+                update_current_alpha(obj, context)
+        case _:
+            pass
+
+
 def update_gradient_color(led_obj: bpy.types.Object):
     for led_bulb_obj in led_obj.children:
         if "ld_color" not in led_bulb_obj:
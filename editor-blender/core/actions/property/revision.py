@@ -2,12 +2,11 @@ import bpy
 
 from ....core.states import state
 from ....properties.types import RevisionPropertyType
+from ...asyncio.pool import process_pool
 from ...log import logger
 from ...models import ControlMap, ControlMapElement, MapID, PosMap, PosMapElement
-from ...utils.convert import (
-    control_modify_to_animation_data,
-    pos_modify_to_animation_data,
-)
+from ...utils.compute import compute_control_modify_animation_data
+from ...utils.convert import pack_control_modify_input, pos_modify_to_animation_data
 from .animation_data import (
     modify_partial_ctrl_keyframes,
     modify_partial_pos_keyframes,
@@ -18,7 +17,7 @@ from .animation_data import (
 )
 
 
-def update_rev_changes(
+async def update_rev_changes(
     incoming_pos_map: PosMap,
     incoming_control_map: ControlMap,
     dancers_reset: list[bool] | None = None,
@@ -135,9 +134,13 @@ def update_rev_changes(
     control_add.sort(key=lambda x: x[1].start)
     control_delete.sort(key=lambda x: x[0])
 
-    modify_animation_data = control_modify_to_animation_data(
-        control_delete, control_update, control_add
+    # Heavy part, computed in a worker process
+    modify_animation_data = await process_pool.run(
+        compute_control_modify_animation_data,
+        *pack_control_modify_input(control_delete, control_update, control_add),
     )
+    if not bpy.context:
+        return
     modify_partial_ctrl_keyframes(modify_animation_data, dancers_reset)
 
     sorted_ctrl_map = sorted(
@@ -64,6 +64,10 @@ async def logout() -> None:
             state.command_task.cancel()
             state.command_task = None
 
+        if state.clock_task is not None:
+            state.clock_task.cancel()
+            state.clock_task = None
+
         await client.close_graphql()
         await client.restart_http()
         await client.close_command()
@@ -0,0 +1,155 @@
+import time
+
+from ....api.control_agent import control_agent
+from ....api.pos_agent import pos_agent
+from ...log import logger
+from ...models import (
+    ControlMap,
+    ControlMapUpdates,
+    FrameRevisions,
+    MapID,
+    PosMap,
+    PosMapUpdates,
+    Revision,
+)
+from ...states import state
+from ...utils.notification import notify
+from .control_map import (
+    add_control,
+    delete_control,
+    flush_control_map_updates,
+    update_control,
+)
+from .pos_map import add_pos, delete_pos, flush_pos_map_updates, update_pos
+
+
+def queued_revision(
+    frames: ControlMap | PosMap,
+    updates: ControlMapUpdates | PosMapUpdates,
+    id: MapID,
+) -> tuple[int, Revision] | None:
+    """Start and revision of a frame once the queued updates are applied"""
+    if id in updates.deleted:
+        return None
+
+    frame = updates.added.get(id)
+    if frame is None:
+        updated = updates.updated.get(id)
+        frame = frames.get(id) if updated is None else updated[1]
+
+    return None if frame is None else (frame.start, frame.rev)
+
+
+def changed_revisions(
+    frames: ControlMap | PosMap,
+    updates: ControlMapUpdates | PosMapUpdates,
+    remote: FrameRevisions,
+) -> dict[MapID, tuple[int, Revision] | None]:
+    """Local start and revision of the frames that differ from editor-server"""
+    changed: dict[MapID, tuple[int, Revision] | None] = {}
+    for id, revision in remote.items():
+        local = queued_revision(frames, updates, id)
+        if local != revision:
+            changed[id] = local
+    return changed
+
+
+async def catch_up_control() -> int | None:
+    known = set(state.control_map.keys())
+    remote = await control_agent.get_control_frame_revisions()
+    if remote is None:
+        return None
+
+    changed = changed_revisions(state.control_map, state.control_map_updates, remote)
+    # Frames added by the subscription after `known` are not on `remote` yet
+    deleted = [id for id in known if id not in remote]
+
+    fetched = await control_agent.get_control_frames(list(changed)) if changed else {}
+    if fetched is None:
+        return None
+
+    changes = 0
+    for id, frame in fetched.items():
+        local = queued_revision(state.control_map, state.control_map_updates, id)
+        # Delivered by the subscription in the meantime
+        if local != changed.get(id):
+            continue
+
+        if local is None:
+            add_control(id, frame, apply=False)
+        else:
+            update_control(id, frame, apply=False)
+        changes += 1
+
+    for id in deleted:
+        if id in state.control_map:
+            delete_control(id, apply=False)
+            changes += 1
+
+    if changes > 0:
+        flush_control_map_updates(f"Caught up on {changes} control frames")
+    return changes
+
+
+async def catch_up_pos() -> int | None:
+    known = set(state.pos_map.keys())
+    remote = await pos_agent.get_pos_frame_revisions()
+    if remote is None:
+        return None
+
+    changed = changed_revisions(state.pos_map, state.pos_map_updates, remote)
+    # Frames added by the subscription after `known` are not on `remote` yet
+    deleted = [id for id in known if id not in remote]
+
+    fetched = await pos_agent.get_pos_frames(list(changed)) if changed else {}
+    if fetched is None:
+        return None
+
+    changes = 0
+    for id, frame in fetched.items():
+        local = queued_revision(state.pos_map, state.pos_map_updates, id)
+        # Delivered by the subscription in the meantime
+        if local != changed.get(id):
+            continue
+
+        if local is None:
+            add_pos(id, frame, apply=False)
+        else:
+            update_pos(id, frame, apply=False)
+        changes += 1
+
+    for id in deleted:
+        if id in state.pos_map:
+            delete_pos(id, apply=False)
+            changes += 1
+
+    if changes > 0:
+        flush_pos_map_updates(f"Caught up on {changes} position frames")
+    return changes
+
+
+async def catch_up_frames() -> bool:
+    """
+    After the subscription reconnects, fetch only the frames whose revision
+    changed on editor-server while it was down, and apply them in one batch.
+    Returns whether it succeeded.
+    """
+    # Before the editor is loaded the whole map would be fetched, and the show
+    # bundle is reconciled on its own
+    if not state.ready or state.offline:
+        return True
+
+    start = time.perf_counter()
+    control_changes = await catch_up_control()
+    pos_changes = await catch_up_pos()
+
+    if control_changes is None or pos_changes is None:
+        notify("WARNING", "Failed to catch up after reconnecting, reload to be sure")
+        return False
+
+    logger.info(
+        f"Caught up after reconnecting: {control_changes} control and "
+        f"{pos_changes} position frames changed, "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    return True
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from ....api.command_agent import command_agent
+from ....schemas.command import FromControllerServerTimePayload
+from ...states import state
+from ...utils.clock import CLOCK_BEST, ClockEstimator
+
+# Seconds between clock requests, shorter until the estimate has enough samples
+CLOCK_INTERVAL = 5.0
+CLOCK_WARMUP_INTERVAL = 0.5
+# Scheduled commands must reach every RPi before they start. On top of the
+# round trip and the offset uncertainty, leave time for controller server to
+# fan the command out.
+CLOCK_MIN_MARGIN_MS = 50.0
+CLOCK_JITTER_MARGIN = 4.0
+
+clock_estimator = ClockEstimator()
+
+
+def reset_clock():
+    clock_estimator.clear()
+    state.clock_estimate = None
+
+
+def read_time_response(payload: FromControllerServerTimePayload):
+    state.clock_estimate = clock_estimator.add(
+        payload.t0, payload.t1, payload.t2, payload.t3
+    )
+
+
+def controller_time_ms(local_ms: float) -> float:
+    """Local time to controller server time, unchanged until estimated"""
+    estimate = state.clock_estimate
+    return local_ms if estimate is None else local_ms + estimate.offset
+
+
+def schedule_margin_ms() -> float:
+    estimate = state.clock_estimate
+    if estimate is None:
+        return CLOCK_MIN_MARGIN_MS
+    return CLOCK_MIN_MARGIN_MS + estimate.delay + CLOCK_JITTER_MARGIN * estimate.jitter
+
+
+def schedule_start_ms(delay_ms: float) -> float:
+    """Local time to start a command `delay_ms` from now, at least the margin"""
+    return time.time() * 1000 + max(delay_ms, schedule_margin_ms())
+
+
+async def sync_clock():
+    while True:
+        try:
+            await command_agent.send_time_request()
+        except Exception:
+            # Disconnected, subscribe_command reconnects
+            pass
+
+        warming_up = len(clock_estimator.samples) < CLOCK_BEST
+        await asyncio.sleep(CLOCK_WARMUP_INTERVAL if warming_up else CLOCK_INTERVAL)
@@ -1,13 +1,87 @@
+import asyncio
+import itertools
+import os
+import shutil
+import time
+from collections import deque
 from datetime import datetime
 
 from ....schemas.command import (
     FromControllerServerBoardInfoPayload,
     FromControllerServerCommandResponse,
 )
-from ...models import InterfaceStatus, RPiStatusItem, ShellTransaction
+from ...config import config
+from ...log import logger
+from ...models import (
+    CommandAck,
+    CommandAckStatus,
+    CommandLatency,
+    CommandRequest,
+    DancerName,
+    InterfaceStatus,
+    RPiStatusItem,
+    ShellTransaction,
+)
 from ...states import state
+from ...utils.algorithms import percentile
+from ...utils.shell_log import ShellLog
+from ...utils.ui import request_redraw
 from ..property.command import set_RPi_props_from_state
 
+# Seconds to wait for every dancer to answer
+COMMAND_TIMEOUT = 5.0
+COMMAND_TIMEOUTS = {"upload": 60.0, "load": 30.0, "reboot": 30.0}
+# Seconds after an ack is finished during which its remaining replies (from a
+# second interface or after the timeout) are still expected and dropped
+COMMAND_LATE_WINDOW = 5.0
+# Command controller server runs on the RPis for each topic, others run the
+# topic itself
+RPI_COMMANDS = {
+    "play": "playerctl play",
+    "pause": "playerctl pause",
+    "stop": "playerctl stop",
+    "load": "load",
+    "reboot": "restart",
+    "close": "close",
+    "test": "parttest",
+    "red": "parttest",
+    "green": "parttest",
+    "blue": "parttest",
+    "yellow": "parttest",
+    "magenta": "parttest",
+    "cyan": "parttest",
+    "darkAll": "parttest",
+}
+# Finished requests kept for the UI
+COMMAND_REQUESTS_KEPT = 32
+# Round trips kept per dancer and per topic
+LATENCY_WINDOW = 256
+
+command_request_ids = itertools.count()
+
+# Shell history spilled from memory, one folder per session
+SHELL_HISTORY_ROOT = os.path.join(config.ASSET_PATH, "shell_history")
+SHELL_HISTORY_PATH = os.path.join(
+    SHELL_HISTORY_ROOT, datetime.now().strftime("%Y%m%d-%H%M%S")
+)
+# Previous sessions kept, older ones are removed on startup
+SHELL_SESSIONS_KEPT = 3
+
+
+def prune_shell_history():
+    """Remove the shell history of old sessions, folder names sort by time"""
+    try:
+        sessions = sorted(
+            name
+            for name in os.listdir(SHELL_HISTORY_ROOT)
+            if os.path.join(SHELL_HISTORY_ROOT, name) != SHELL_HISTORY_PATH
+        )
+    except FileNotFoundError:
+        return
+
+    for name in sessions[: max(len(sessions) - SHELL_SESSIONS_KEPT, 0)]:
+        shutil.rmtree(os.path.join(SHELL_HISTORY_ROOT, name), ignore_errors=True)
+
 
 def read_board_info_payload(payload: FromControllerServerBoardInfoPayload):
     for item in payload.values():
@@ -50,10 +124,10 @@ def read_board_info_payload(payload: FromControllerServerBoardInfoPayload):
                     statusCode=0,
                     message=state.rpi_status[item.dancer].wifi.message,
                 )
-    set_RPi_props_from_state()
+    set_RPi_props_from_state(item.dancer for item in payload.values())
 
 
-def read_command_response(data: FromControllerServerCommandResponse):
+def apply_command_response(data: FromControllerServerCommandResponse):
     payload = data.payload
     dancer = payload.dancer
     command = payload.command
@@ -78,6 +152,220 @@ def read_command_response(data: FromControllerServerCommandResponse):
         rpi_status_item.wifi.statusCode = data.statusCode
     shell_history = state.shell_history
     if dancer not in shell_history:
-        shell_history[dancer] = []
-    shell_history[dancer].append(ShellTransaction(command=command, output=message))
-    set_RPi_props_from_state()
+        shell_history[dancer] = ShellLog(
+            os.path.join(SHELL_HISTORY_PATH, f"{dancer}.jsonl"),
+            state.preferences.shell_history_limit,
+        )
+    try:
+        shell_history[dancer].append(
+            ShellTransaction(command=command, output=message, time=time.time())
+        )
+    except OSError:
+        logger.exception(f"Failed to spill shell history of {dancer}")
+    ack_command_request(dancer, command, data.statusCode)
+
+
+def read_command_responses(responses: list[FromControllerServerCommandResponse]):
+    """Apply the responses in order, the RPi list is updated once"""
+    for data in responses:
+        apply_command_response(data)
+    set_RPi_props_from_state({data.payload.dancer for data in responses})
+
+
+def start_command_request(
+    topic: str, dancers: list[DancerName], command: str | None = None
+) -> CommandRequest:
+    """
+    Track a command sent to `dancers` until each of them answers or times out.
+
+    :param command: what the RPis run, defaults to the one of the topic
+    """
+    request = CommandRequest(
+        id=next(command_request_ids),
+        topic=topic,
+        command=RPI_COMMANDS.get(topic, topic) if command is None else command,
+        sent=time.perf_counter(),
+        acks=dict(
+            (
+                dancer,
+                CommandAck(
+                    status=CommandAckStatus.PENDING, replies=expected_replies(dancer)
+                ),
+            )
+            for dancer in dancers
+        ),
+    )
+    state.command_requests[request.id] = request
+
+    asyncio.get_running_loop().call_later(
+        COMMAND_TIMEOUTS.get(topic, COMMAND_TIMEOUT), expire_command_request, request.id
+    )
+    update_command_summary(request)
+
+    return request
+
+
+def expected_replies(dancer: DancerName) -> int:
+    """Controller server sends the command to every connected interface"""
+    rpi_status_item = state.rpi_status.get(dancer)
+    if rpi_status_item is None:
+        return 1
+    return rpi_status_item.ethernet.connected + rpi_status_item.wifi.connected
+
+
+def is_reply_of(request: CommandRequest, command: str) -> bool:
+    """The RPis echo the command they ran, followed by its arguments"""
+    return command == request.command or command.startswith(f"{request.command} ")
+
+
+def expects_reply(ack: CommandAck, now: float) -> bool:
+    if ack.replies <= 0:
+        return False
+    # Remaining replies of a finished ack may have been lost
+    return ack.finished is None or now - ack.finished < COMMAND_LATE_WINDOW
+
+
+def ack_command_request(dancer: DancerName, command: str, status_code: int):
+    """
+    Responses of a dancer arrive in order, so they answer its oldest request of
+    the same command still expecting a reply. Only the first one acks it,
+    replies from a second interface or after the timeout are dropped.
+    """
+    now = time.perf_counter()
+    request = next(
+        (
+            request
+            for request in state.command_requests.values()
+            if dancer in request.acks
+            and expects_reply(request.acks[dancer], now)
+            and is_reply_of(request, command)
+        ),
+        None,
+    )
+    if request is None:
+        return
+
+    ack = request.acks[dancer]
+    ack.replies -= 1
+    if ack.status != CommandAckStatus.PENDING:
+        return
+
+    latency = (now - request.sent) * 1000
+    ack.status = CommandAckStatus.ACKED if status_code == 0 else CommandAckStatus.FAILED
+    ack.latency = latency
+    ack.finished = now
+    record_latency(state.dancer_latency, dancer, latency)
+    record_latency(state.command_latency, request.topic, latency)
+
+    update_command_summary(request)
+    if is_command_request_done(request):
+        finish_command_request(request)
+
+
+def expire_command_request(id: int):
+    request = state.command_requests.get(id)
+    if request is None or is_command_request_done(request):
+        return
+
+    now = time.perf_counter()
+    for ack in request.acks.values():
+        if ack.status == CommandAckStatus.PENDING:
+            ack.status = CommandAckStatus.TIMEOUT
+            ack.finished = now
+
+    update_command_summary(request)
+    finish_command_request(request)
+
+
+def is_command_request_done(request: CommandRequest) -> bool:
+    return all(ack.status != CommandAckStatus.PENDING for ack in request.acks.values())
+
+
+def finish_command_request(request: CommandRequest):
+    logger.info(f"Command {request.topic}: {command_request_summary(request)}")
+
+    timed_out = [
+        dancer
+        for dancer, ack in request.acks.items()
+        if ack.status == CommandAckStatus.TIMEOUT
+    ]
+    if timed_out:
+        logger.warning(f"Command {request.topic} timed out on {', '.join(timed_out)}")
+
+    # Drop the oldest finished requests
+    finished = [
+        id
+        for id, request in state.command_requests.items()
+        if is_command_request_done(request)
+    ]
+    for id in finished[: max(len(finished) - COMMAND_REQUESTS_KEPT, 0)]:
+        del state.command_requests[id]
+
+
+def record_latency(latency_map: CommandLatency, key: str, latency: float):
+    if key not in latency_map:
+        latency_map[key] = deque(maxlen=LATENCY_WINDOW)
+    latency_map[key].append(latency)
+
+
+def latency_percentiles(samples: deque[float]) -> tuple[float, float, float]:
+    """p50, p90 and p99 in ms"""
+    sorted_samples = sorted(samples)
+    return (
+        percentile(sorted_samples, 50),
+        percentile(sorted_samples, 90),
+        percentile(sorted_samples, 99),
+    )
+
+
+def command_request_summary(request: CommandRequest) -> str:
+    counts: dict[CommandAckStatus, int] = {status: 0 for status in CommandAckStatus}
+    for ack in request.acks.values():
+        counts[ack.status] += 1
+
+    summary = f"{counts[CommandAckStatus.ACKED]}/{len(request.acks)} acked"
+    if counts[CommandAckStatus.FAILED]:
+        summary += f", {counts[CommandAckStatus.FAILED]} failed"
+    if counts[CommandAckStatus.TIMEOUT]:
+        summary += f", {counts[CommandAckStatus.TIMEOUT]} timed out"
+    if counts[CommandAckStatus.PENDING]:
+        summary += f", {counts[CommandAckStatus.PENDING]} pending"
+
+    latencies = sorted(
+        ack.latency for ack in request.acks.values() if ack.latency is not None
+    )
+    if latencies:
+        summary += (
+            f" (p50 {percentile(latencies, 50):.0f} ms, max {latencies[-1]:.0f} ms)"
+        )
+
+    return summary
+
+
+def update_command_summary(request: CommandRequest):
+    state.command_summary = f"{request.topic}: {command_request_summary(request)}"
+    request_redraw({"VIEW_3D"})
+
+
+def command_latency_report() -> str:
+    """Latency percentiles per dancer, slowest first, then per topic"""
+    lines: list[str] = []
+    for title, latency_map in (
+        ("Dancer", state.dancer_latency),
+        ("Command", state.command_latency),
+    ):
+        rows = sorted(
+            (
+                (key, len(samples), *latency_percentiles(samples))
+                for key, samples in latency_map.items()
+            ),
+            key=lambda row: row[3],
+            reverse=True,
+        )
+        lines.append(f"{title:<16} {'n':>5} {'p50':>8} {'p90':>8} {'p99':>8}")
+        lines.extend(
+            f"{key:<16} {n:>5} {p50:>6.0f}ms {p90:>6.0f}ms {p99:>6.0f}ms"
+            for key, n, p50, p90, p99 in rows
+        )
+
+    return "\n".join(lines)
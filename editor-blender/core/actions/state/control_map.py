@@ -20,25 +20,23 @@ def set_control_record(control_record: ControlRecord):
     state.control_record = control_record
 
 
-def add_control(id: MapID, frame: ControlMapElement):
+def set_control_data(control_map: ControlMap, control_record: ControlRecord):
+    state.control_map = control_map
+    state.control_record = control_record
+    state.control_start_record = [control_map[id].start for id in control_record]
+
+
+def add_control(id: MapID, frame: ControlMapElement, apply: bool = True):
     logger.info(f"Add control {id} at {frame.start}")
 
     control_map_updates = state.control_map_updates
     control_map_updates.added[id] = frame
 
-    if (
-        state.edit_state == EditMode.EDITING
-        or not state.preferences.auto_sync
-        or not state.ready
-    ):
-        state.control_map_pending = True
-        redraw_area({"VIEW_3D", "DOPESHEET_EDITOR"})
-    else:
-        apply_control_map_updates()
-        notify("INFO", f"Added control frame {id}")
+    if apply:
+        flush_control_map_updates(f"Added control frame {id}")
 
 
-def delete_control(id: MapID):
+def delete_control(id: MapID, apply: bool = True):
     logger.info(f"Delete control {id}")
 
     old_frame = state.control_map.get(id)
@@ -66,19 +64,11 @@ def delete_control(id: MapID):
 
     control_map_updates.deleted[id] = old_frame.start
 
-    if (
-        state.edit_state == EditMode.EDITING
-        or not state.preferences.auto_sync
-        or not state.ready
-    ):
-        state.control_map_pending = True
-        redraw_area({"VIEW_3D", "DOPESHEET_EDITOR"})
-    else:
-        apply_control_map_updates()
-        notify("INFO", f"Deleted control frame {id}")
+    if apply:
+        flush_control_map_updates(f"Deleted control frame {id}")
 
 
-def update_control(id: MapID, frame: ControlMapElement):
+def update_control(id: MapID, frame: ControlMapElement, apply: bool = True):
     logger.info(f"Update control {id} at {frame.start}")
 
     control_map_updates = state.control_map_updates
@@ -101,6 +91,15 @@ def update_control(id: MapID, frame: ControlMapElement):
     # for id, (start, _) in control_map_updates.updated.items():
     #     print(f"Updated control {id} at {start}")
 
+    if apply:
+        flush_control_map_updates(f"Updated control frame {id}")
+
+
+def flush_control_map_updates(message: str):
+    """
+    Apply the queued updates, they stay pending while editing, without auto
+    sync or before the editor is ready
+    """
     if (
         state.edit_state == EditMode.EDITING
         or not state.preferences.auto_sync
@@ -110,7 +109,7 @@ def update_control(id: MapID, frame: ControlMapElement):
         redraw_area({"VIEW_3D", "DOPESHEET_EDITOR"})
     else:
         apply_control_map_updates()
-        notify("INFO", f"Updated control frame {id}")
+        notify("INFO", message)
 
 
 def apply_control_map_updates():
@@ -2,13 +2,17 @@ import bpy
 
 from ....properties.types import PositionPropertyType
 from ...states import state
-from ...utils.algorithms import binary_search
+from ...utils.algorithms import search_from_hint
 
 
 def calculate_current_pos_index() -> int:
     if not bpy.context:
         return 0  # Won't actually happen
-    return binary_search(state.pos_start_record, bpy.context.scene.frame_current)
+    return search_from_hint(
+        state.pos_start_record,
+        bpy.context.scene.frame_current,
+        state.current_pos_index,
+    )
 
 
 def update_current_pos_by_index():
@@ -1,19 +1,41 @@
+from typing import Any
+
 import bpy
 
 from ....properties.types import LightType
-from ...models import FiberData, LEDData
+from ...models import FiberData, LEDBulbData, LEDData
 from ...states import state
-from ...utils.algorithms import binary_search
+from ...utils.algorithms import search_from_hint
+from ..property.lights import refresh_light_object
 
 
 def calculate_current_status_index() -> int:
     if not bpy.context:
         return 0  # Won't actually happen
-    return binary_search(state.control_start_record, bpy.context.scene.frame_current)
+    return search_from_hint(
+        state.control_start_record,
+        bpy.context.scene.frame_current,
+        state.current_control_index,
+    )
+
+
+def part_status_key(
+    part_status: FiberData | LEDData, part_led_status: list[LEDBulbData]
+) -> tuple[Any, ...]:
+    """Everything update_current_status_by_index writes to a part object"""
+    if isinstance(part_status, FiberData):
+        return (part_status.color_id, part_status.alpha)
+    if part_status.effect_id == 0:
+        bulbs = tuple((data.color_id, data.alpha) for data in part_led_status)
+        return (0, part_status.alpha, bulbs)
+    return (part_status.effect_id, part_status.alpha)
 
 
 def update_current_status_by_index():
-    """Update current status by index and set ld_color and ld_effect"""
+    """
+    Update current status by index and set ld_color and ld_effect.
+    Only parts whose status differs from the last applied one are written.
+    """
     if not bpy.context:
         return
 
@@ -26,36 +48,51 @@ def update_current_status_by_index():
     if current_control_map is None:
         return
 
-    setattr(bpy.context.window_manager, "ld_fade", current_control_map.fade)
-    setattr(bpy.context.window_manager, "ld_start", current_control_map.start)
+    window_manager = bpy.context.window_manager
+    if getattr(window_manager, "ld_fade") != current_control_map.fade:
+        setattr(window_manager, "ld_fade", current_control_map.fade)
+    if getattr(window_manager, "ld_start") != current_control_map.start:
+        setattr(window_manager, "ld_start", current_control_map.start)
 
     current_status = current_control_map.status
     current_led_status = current_control_map.led_status
     state.current_status = current_status
     state.current_led_status = current_led_status
 
-    show_dancer_dict = dict(zip(state.dancer_names, state.show_dancers))
-    for dancer in state.dancers_array:
-        if not show_dancer_dict[dancer.name]:
-            continue
+    applied_status = state.applied_status
+    changed: list[tuple[bpy.types.Object, tuple[Any, ...]]] = []
+
+    # Update callbacks are run once per changed part after the batch
+    state.applying_status = True
+    try:
+        show_dancer_dict = dict(zip(state.dancer_names, state.show_dancers))
+        for dancer in state.dancers_array:
+            if not show_dancer_dict[dancer.name]:
+                continue
 
-        dancer_status = current_status.get(dancer.name)
-        dancer_led_status = current_led_status.get(dancer.name)
-        if dancer_status is None or dancer_led_status is None:
-            continue
+            dancer_status = current_status.get(dancer.name)
+            dancer_led_status = current_led_status.get(dancer.name)
+            if dancer_status is None or dancer_led_status is None:
+                continue
+
+            dancer_part_objects = state.dancer_part_objects_map.get(dancer.name)
+            if dancer_part_objects is None:
+                continue
 
-        dancer_part_objects = state.dancer_part_objects_map.get(dancer.name)
-        if dancer_part_objects is not None:
             part_objects = dancer_part_objects[1]
 
             for part_name, part_obj in part_objects.items():
-                light_type = getattr(part_obj, "ld_light_type")
-
                 part_status = dancer_status.get(part_name)
                 part_led_status = dancer_led_status.get(part_name)
                 if part_status is None or part_led_status is None:
                     continue
 
+                key = part_status_key(part_status, part_led_status)
+                if applied_status.get(part_obj.name) == key:
+                    continue
+
+                light_type = getattr(part_obj, "ld_light_type")
+
                 match light_type:
                     case LightType.FIBER.value:
                         if not isinstance(part_status, FiberData):
@@ -88,4 +125,16 @@ def update_current_status_by_index():
                         setattr(part_obj, "ld_alpha", alpha)
 
                     case _:
-                        pass
+                        continue
+
+                changed.append((part_obj, key))
+
+    finally:
+        state.applying_status = False
+
+    for part_obj, _ in changed:
+        refresh_light_object(part_obj, bpy.context)
+
+    # Recorded last, refreshing writes bulb props which invalidate the diff
+    for part_obj, key in changed:
+        applied_status[part_obj.name] = key
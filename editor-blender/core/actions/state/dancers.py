@@ -0,0 +1,84 @@
+from ...models import (
+    DancerName,
+    DancerPartIndexMap,
+    DancerPartIndexMapItem,
+    Dancers,
+    DancersArray,
+    LEDPartLengthMap,
+    ModelDancerIndexMap,
+    ModelDancerIndexMapItem,
+    Models,
+    ModelsArray,
+    PartName,
+    PartType,
+    PartTypeMap,
+)
+from ...states import state
+
+
+def set_models(models_array: ModelsArray):
+    model_names = [model.name for model in models_array]
+    models: Models = dict(
+        [
+            (model.name, [dancer_name for dancer_name in model.dancers])
+            for model in models_array
+        ]
+    )
+
+    model_dancer_index_map: ModelDancerIndexMap = {}
+
+    for index, model in enumerate(models_array):
+        dancers: dict[DancerName, int] = dict(
+            [
+                (dancer_name, dancer_index)
+                for dancer_index, dancer_name in enumerate(model.dancers)
+            ]
+        )
+        model_dancer_index_map[model.name] = ModelDancerIndexMapItem(
+            index=index, dancers=dancers
+        )
+
+    state.models = models
+    state.model_names = model_names
+    state.models_array = models_array
+    state.model_dancer_index_map = model_dancer_index_map
+
+
+def set_dancers(dancers_array: DancersArray):
+    dancer_names = [dancer.name for dancer in dancers_array]
+    dancers: Dancers = dict(
+        [
+            (dancer.name, [part.name for part in dancer.parts])
+            for dancer in dancers_array
+        ]
+    )
+
+    part_type_map: PartTypeMap = {}
+    led_part_length_map: LEDPartLengthMap = {}
+
+    for dancer in dancers_array:
+        for part in dancer.parts:
+            part_type_map[part.name] = part.type
+            if part.type == PartType.LED and part.length is not None:
+                led_part_length_map[part.name] = part.length
+
+    dancer_part_index_map: DancerPartIndexMap = {}
+
+    for index, dancer in enumerate(dancers_array):
+        parts: dict[PartName, int] = dict(
+            [(part.name, part_index) for part_index, part in enumerate(dancer.parts)]
+        )
+        dancer_part_index_map[dancer.name] = DancerPartIndexMapItem(
+            index=index, parts=parts
+        )
+
+    state.dancers = dancers
+    state.dancer_names = dancer_names
+    state.part_type_map = part_type_map
+    state.led_part_length_map = led_part_length_map
+
+    state.dancers_array = dancers_array
+    state.dancer_part_index_map = dancer_part_index_map
+
+    if len(state.show_dancers) == 0:
+        state.show_dancers = [True] * len(state.dancer_names)
@@ -0,0 +1,38 @@
+import time
+
+from ...asyncio.pool import process_pool
+from ...log import logger
+from ...states import state
+from ...utils.compute import export_show
+from ...utils.convert import pack_show_export_input
+from ...utils.notification import notify
+
+
+async def export_show_tables(directory: str):
+    """
+    Compile the control and pos maps into per-dancer binary tables, written
+    by a worker process
+    """
+    if not state.ready:
+        notify("WARNING", "Editor is not ready")
+        return
+
+    start = time.perf_counter()
+    export_input = pack_show_export_input()
+    packed = time.perf_counter()
+
+    try:
+        sizes = await process_pool.run(export_show, directory, *export_input)
+
+    except Exception:
+        logger.exception("Failed to export show")
+        notify("ERROR", "Failed to export show")
+        return
+
+    end = time.perf_counter()
+    logger.info(
+        f"Exported {len(sizes)} dancers ({sum(sizes.values())} bytes) to {directory}: "
+        f"packed in {(packed - start) * 1000:.0f} ms, "
+        f"written in {(end - packed) * 1000:.0f} ms"
+    )
+    notify("INFO", f"Show exported in {end - start:.1f}s")
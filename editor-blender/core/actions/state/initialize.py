@@ -7,6 +7,7 @@ from ....api.color_agent import color_agent
 from ....api.dancer_agent import dancer_agent
 from ....api.led_agent import led_agent
 from ....api.model_agent import model_agent
+from ....api.ping_agent import ping_agent
 from ....client import client
 from ....client.subscription import subscribe
 from ....core.actions.property.partial_load import (
@@ -22,37 +23,41 @@ from ....core.actions.state.app_state import (
     set_sync,
 )
 from ....core.actions.state.color_map import set_color_map
+from ....core.actions.state.command import prune_shell_history
+from ....core.actions.state.control_map import set_control_data
 from ....core.actions.state.current_pos import update_current_pos_by_index
 from ....core.actions.state.current_status import (
     calculate_current_status_index,
     update_current_status_by_index,
 )
+from ....core.actions.state.dancers import set_dancers, set_models
 from ....core.actions.state.editor import setup_control_editor
 from ....core.actions.state.led_map import set_led_map
+from ....core.actions.state.pos_map import set_pos_data
+from ....core.actions.state.show_bundle import (
+    has_show_bundle,
+    load_show_bundle,
+    reconcile_show_bundle,
+    save_show_bundle,
+)
 from ....core.asyncio import AsyncTask
+from ....core.asyncio.graph import TaskGraph, TaskNode
 from ....core.log import logger
 from ....core.states import state
 from ....core.utils.get_data import get_control, get_pos
+from ....core.utils.notification import notify
+from ....core.utils.show_bundle import ShowBundle
 from ....core.utils.ui import redraw_area
 from ....handlers import mount_handlers, unmount_handlers
 from ....properties.types import Preferences
 from ....storage import get_storage
-from ...models import (
-    DancerName,
-    DancerPartIndexMap,
-    DancerPartIndexMapItem,
-    Dancers,
-    LEDPartLengthMap,
-    ModelDancerIndexMap,
-    ModelDancerIndexMapItem,
-    Models,
-    PartName,
-    PartType,
-    PartTypeMap,
-)
 from ...utils.convert import frame_to_time
 from ...utils.operator import execute_operator
-from ..state.load import init_assets, load_data
+from ..state.load import init_assets, init_bundled_assets, load_data
+
+# Seconds to wait for editor-server to answer before booting from the show
+# bundle
+OFFLINE_TIMEOUT = 20.0
 
 # from ....core.actions.state.load.objects import check_local_object_list
 # async def __merge_pos_map(
@@ -85,12 +90,16 @@ def read_preferences():
     state.preferences.follow_frame = preferences.follow_frame
     state.preferences.show_waveform = preferences.show_waveform
     state.preferences.show_nametag = preferences.show_nametag
+    state.preferences.use_draco = preferences.use_draco
+    state.preferences.shell_history_limit = preferences.shell_history_limit
 
     # Trigger property setter
     preferences.auto_sync = state.preferences.auto_sync
     preferences.follow_frame = state.preferences.follow_frame
     preferences.show_waveform = state.preferences.show_waveform
     preferences.show_nametag = state.preferences.show_nametag
+    preferences.use_draco = state.preferences.use_draco
+    preferences.shell_history_limit = state.preferences.shell_history_limit
 
 
 async def init():
@@ -119,6 +128,12 @@ async def init():
 
     read_preferences()
 
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, prune_shell_history)
+    except OSError:
+        logger.exception("Failed to prune shell history")
+
     # Open clients with token
     token: str = get_storage("token")
     username: str = get_storage("username")
@@ -139,6 +154,10 @@ async def init():
     if token_valid:
         set_logged_in(True)
         await init_blender()
+    elif token and has_show_bundle() and not await ping_agent.ping():
+        # editor-server is unreachable, the token can't be checked
+        set_logged_in(True)
+        await init_blender_offline()
 
     # Start background operators
     execute_operator("lightdance.animation_status_listener")
@@ -158,12 +177,17 @@ async def reload():
 
 
 async def init_blender():
+    if state.reconcile_task is not None:
+        state.reconcile_task.cancel()
+        state.reconcile_task = None
+    state.offline = False
+
     await client.restart_http()
     await client.restart_graphql()
 
     if state.subscription_task is not None:
         state.subscription_task.cancel()
-    state.subscription_task = AsyncTask(subscribe).exec()
+    state.subscription_task = AsyncTask(subscribe).exec(persistent=True)
 
     # Initialize editor
     if state.init_editor_task is not None:
@@ -171,6 +195,12 @@ async def init_blender():
     state.init_editor_task = AsyncTask(init_editor).exec()
 
 
+async def init_blender_offline():
+    if state.init_editor_task is not None:
+        state.init_editor_task.cancel()
+    state.init_editor_task = AsyncTask(init_editor_offline).exec()
+
+
 def close_blender():
     set_running(False)
     set_sync(False)
@@ -185,6 +215,11 @@ def close_blender():
         state.init_editor_task.cancel()
         state.init_editor_task = None
 
+    if state.reconcile_task is not None:
+        state.reconcile_task.cancel()
+        state.reconcile_task = None
+    state.offline = False
+
     unmount_handlers()
 
     close_client_tasks = [
@@ -198,51 +233,90 @@ def close_blender():
 
 
 async def init_editor():
-    empty_task = asyncio.create_task(asyncio.sleep(0))
+    init_graph = TaskGraph(
+        [
+            TaskNode("models", init_models),
+            TaskNode("dancers", init_dancers),
+            TaskNode("color_map", init_color_map),
+            TaskNode("led_map", init_led_map),
+            TaskNode("pos_map", init_pos_map, ["dancers"]),
+            TaskNode(
+                "control_map", init_control_map, ["dancers", "color_map", "led_map"]
+            ),
+            # Assets don't depend on the editor data
+            TaskNode("assets", init_assets),
+        ]
+    )
+    # Only whether editor-server answers is timed, a slow but healthy init
+    # (e.g. downloading the assets) runs to the end
+    ping_task = asyncio.create_task(ping_agent.ping())
+    try:
+        done, _ = await asyncio.wait([ping_task], timeout=OFFLINE_TIMEOUT)
+    except asyncio.CancelledError:
+        ping_task.cancel()
+        raise
+
+    responding = ping_task in done and ping_task.result()
+    if not responding:
+        ping_task.cancel()
+
+    bundle = None if responding or not has_show_bundle() else await load_show_bundle()
+    if bundle is not None:
+        logger.warning("editor-server not responding, booting from show bundle")
+        await init_offline(bundle)
+    else:
+        await init_graph.run()
+        logger.info(f"Editor data initialized\n{init_graph.report()}")
+        await save_show_bundle()
+
+    finish_init_editor()
+
+
+async def init_editor_offline():
+    bundle = await load_show_bundle()
+    if bundle is None:
+        set_logged_in(False)
+        notify("WARNING", "Failed to read the show bundle, please log in")
+        return
 
-    batches_functions = [
-        [init_models, init_dancers],
-        [init_color_map, init_led_map],
-        [init_pos_map, init_control_map],
-        [init_assets],
-    ]
-    ...
-    batches_completes = [[False] * len(batch) for batch in batches_functions]
-
-    while True:
-        try:
-            for batch in range(len(batches_functions)):
-                batch_functions = batches_functions[batch]
-                batch_completes = batches_completes[batch]
-                batch_tasks: list[asyncio.Task[BaseException | None]] = [
-                    empty_task
-                ] * len(batch_functions)
-
-                for index, function in enumerate(batch_functions):
-                    if not batch_completes[index]:
-                        batch_tasks[index] = asyncio.create_task(function())
-
-                batch_results = await asyncio.gather(
-                    *batch_tasks, return_exceptions=True
-                )
-
-                batch_done = True
-                for index, result in enumerate(batch_results):
-                    if isinstance(result, BaseException):
-                        batch_done = False
-                        logger.error(f"Batch {batch} failed: {result}")
-                    else:
-                        batch_completes[index] = True
-
-                if not batch_done:
-                    logger.exception(f"Batch {batch} failed")
-                    raise
-
-            break
-        except Exception as e:
-            logger.exception(e)
-
-        await asyncio.sleep(2)
+    await init_offline(bundle)
+    finish_init_editor()
+
+
+async def init_offline(bundle: ShowBundle):
+    """
+    Set up the editor data from the show bundle. Editing stays disabled until
+    the bundle is reconciled with editor-server.
+    """
+    state.user_log = "Loading show bundle..."
+
+    set_models(bundle.models_array)
+    set_dancers(bundle.dancers_array)
+    set_color_map(bundle.color_map)
+    set_led_map(bundle.led_map)
+
+    set_control_data(bundle.control_map, bundle.control_record)
+    state.current_control_index = 0
+    update_current_status_by_index()
+
+    set_pos_data(bundle.pos_map, bundle.pos_record)
+    state.current_pos_index = 0
+    update_current_pos_by_index()
+
+    await init_bundled_assets(bundle.assets_load, bundle.dancer_models_hash)
+
+    state.offline = True
+    set_sync(False)
+    notify("WARNING", "editor-server unreachable, playing the local show bundle")
+
+    if state.reconcile_task is not None:
+        state.reconcile_task.cancel()
+    state.reconcile_task = AsyncTask(reconcile_show_bundle).exec()
+
+    logger.info("Editor data loaded from show bundle")
+
+
+def finish_init_editor():
     state.user_log = ""
     state.loading = True
 
@@ -261,11 +335,12 @@ async def init_load():
     await load_data()
     logger.info("Editor initialized")
     # In case the connection is lost during long initialization
-    await client.restart_http()
-    await client.restart_graphql()
+    if not state.offline:
+        await client.restart_http()
+        await client.restart_graphql()
 
     set_ready(True)
-    set_sync(True)
+    set_sync(not state.offline)
 
     # Mount handlers
     mount_handlers()
@@ -294,7 +369,7 @@ async def init_load():
         region=[region for region in areas[0].regions if region.type == "WINDOW"][0],
         screen=bpy.context.window.screen,
     ):
-        if bpy.ops.action.view_frame.poll():  # type:ignore
+        if bpy.ops.action.view_frame.poll():  # type: ignore
             bpy.ops.action.view_frame()
 
 
@@ -306,31 +381,7 @@ async def init_models():
     if models_array is None:
         raise Exception("Failed to initialize models")
 
-    model_names = [model.name for model in models_array]
-    models: Models = dict(
-        [
-            (model.name, [dancer_name for dancer_name in model.dancers])
-            for model in models_array
-        ]
-    )
-
-    model_dancer_index_map: ModelDancerIndexMap = {}
-
-    for index, model in enumerate(models_array):
-        dancers: dict[DancerName, int] = dict(
-            [
-                (dancer_name, dancer_index)
-                for dancer_index, dancer_name in enumerate(model.dancers)
-            ]
-        )
-        model_dancer_index_map[model.name] = ModelDancerIndexMapItem(
-            index=index, dancers=dancers
-        )
-
-    state.models = models
-    state.model_names = model_names
-    state.models_array = models_array
-    state.model_dancer_index_map = model_dancer_index_map
+    set_models(models_array)
 
     logger.info("Models initialized")
 
@@ -343,43 +394,7 @@ async def init_dancers():
     if dancers_array is None:
         raise Exception("Failed to initialize dancers")
 
-    dancer_names = [dancer.name for dancer in dancers_array]
-    dancers: Dancers = dict(
-        [
-            (dancer.name, [part.name for part in dancer.parts])
-            for dancer in dancers_array
-        ]
-    )
-
-    part_type_map: PartTypeMap = {}
-    led_part_length_map: LEDPartLengthMap = {}
-
-    for dancer in dancers_array:
-        for part in dancer.parts:
-            part_type_map[part.name] = part.type
-            if part.type == PartType.LED and part.length is not None:
-                led_part_length_map[part.name] = part.length
-
-    dancer_part_index_map: DancerPartIndexMap = {}
-
-    for index, dancer in enumerate(dancers_array):
-        parts: dict[PartName, int] = dict(
-            [(part.name, part_index) for part_index, part in enumerate(dancer.parts)]
-        )
-        dancer_part_index_map[dancer.name] = DancerPartIndexMapItem(
-            index=index, parts=parts
-        )
-
-    state.dancers = dancers
-    state.dancer_names = dancer_names
-    state.part_type_map = part_type_map
-    state.led_part_length_map = led_part_length_map
-
-    state.dancers_array = dancers_array
-    state.dancer_part_index_map = dancer_part_index_map
-
-    if len(state.show_dancers) == 0:
-        state.show_dancers = [True] * len(state.dancer_names)
+    set_dancers(dancers_array)
 
     logger.info("Dancers initialized")
 
@@ -416,9 +431,7 @@ async def init_control_map():
     if control_map is None or control_record is None:
         raise Exception("Failed to initialize control map")
 
-    state.control_map = control_map
-    state.control_record = control_record
-    state.control_start_record = [control_map[id].start for id in control_record]
+    set_control_data(control_map, control_record)
 
     state.current_control_index = 0
     update_current_status_by_index()
@@ -433,9 +446,7 @@ async def init_pos_map():
     if pos_map is None or pos_record is None:
         raise Exception("Failed to initialize pos map")
 
-    state.pos_map = pos_map
-    state.pos_record = pos_record
-    state.pos_start_record = [pos_map[id].start for id in pos_record]
+    set_pos_data(pos_map, pos_record)
 
     state.current_pos_index = 0
     update_current_pos_by_index()
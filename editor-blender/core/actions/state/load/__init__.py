@@ -1,3 +1,3 @@
-from .load import init_assets, load_data
+from .load import init_assets, init_bundled_assets, load_data
 
-__all__ = ["init_assets", "load_data"]
+__all__ = ["init_assets", "init_bundled_assets", "load_data"]
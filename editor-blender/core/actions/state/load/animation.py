@@ -1,30 +1,42 @@
 from ....actions.property.revision import update_rev_changes
 from ....log import logger
 from ....states import state
+from ....utils.ui import user_log_progress
 from ...property.animation_data import (
     init_ctrl_keyframes_from_state,
+    init_ctrl_keyframes_from_state_in_pool,
     init_pos_keyframes_from_state,
+    init_pos_keyframes_from_state_progressively,
 )
 
 
-def setup_animation_data():
+async def setup_animation_data():
     dancers_reset_animation = state.init_temps.dancers_reset_animation
     reset_all = all(dancers_reset_animation)
     update_all = not any(dancers_reset_animation)
 
+    ctrl_progress = user_log_progress("Setting up control keyframes")
+    pos_progress = user_log_progress("Setting up position keyframes")
+
     if reset_all:
-        init_ctrl_keyframes_from_state()
-        init_pos_keyframes_from_state()
+        await init_ctrl_keyframes_from_state_in_pool(on_progress=ctrl_progress)
+        await init_pos_keyframes_from_state_progressively(on_progress=pos_progress)
         return
 
     try:
         if update_all:
-            update_rev_changes(state.pos_map, state.control_map)
+            await update_rev_changes(state.pos_map, state.control_map)
             return
 
-        init_ctrl_keyframes_from_state(dancers_reset_animation)
-        init_pos_keyframes_from_state(dancers_reset_animation)
-        update_rev_changes(state.pos_map, state.control_map, dancers_reset_animation)
+        await init_ctrl_keyframes_from_state_in_pool(
+            dancers_reset_animation, ctrl_progress
+        )
+        await init_pos_keyframes_from_state_progressively(
+            dancers_reset_animation, pos_progress
+        )
+        await update_rev_changes(
+            state.pos_map, state.control_map, dancers_reset_animation
+        )
 
     except Exception:
         logger.exception("Failed to setup animation data")
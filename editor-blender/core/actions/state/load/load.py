@@ -1,11 +1,14 @@
+import asyncio
 import json
 import os
+import time
 from typing import Any, cast
 
 from .....client import client
 from ....config import config
 from ....log import logger
 from ....states import state
+from ....utils.draco import decode_draco_glb, draco_library_path
 from ....utils.ui import update_user_log
 from ..current_pos import update_current_pos_by_index
 from .animation import setup_animation_data
@@ -25,12 +28,37 @@ def parse_config(config_dict: dict[str, Any]):
     setattr(config, "stage_scale", cast(float, stage_config["scale"]))
 
 
+async def decode_draco_model(
+    library_path: str, url: str, compressed: bytes
+) -> bytes | None:
+    """
+    Decode a Draco-compressed model in the executor, None if it fails.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        data = await loop.run_in_executor(
+            None, decode_draco_glb, library_path, compressed
+        )
+    except Exception:
+        logger.exception(f"Failed to decode {url}, falling back to raw glTF")
+        return None
+
+    logger.info(
+        f"decoded {url}: {len(compressed)} -> {len(data)} bytes "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    return data
+
+
 async def fetch_data(reload: bool = False):
     """
     Fetch assets from editor-server
     param reload: Fetch assets again even they already exist is true, otherwise only fetch missing assets.
     """
-    use_draco = False
+    library_path = draco_library_path() if state.preferences.use_draco else None
+    if state.preferences.use_draco and library_path is None:
+        logger.warning("Draco library not found, fetching raw glTF models")
 
     if client.file_client:
         assets_load: dict[str, Any] = await client.download_json("/data/load.json")
@@ -71,14 +99,15 @@ async def fetch_data(reload: bool = False):
 
             dancer_model_update: dict[str, bool] = {}
             dancer_models_hash: dict[str, str] = {}
+            # Raw model url -> Draco variant, decoded into the raw model path
+            draco_urls: dict[str, str] = {}
             for key in assets_load["DancerMap"]:
                 raw_url = assets_load["DancerMap"][key]["url"]
 
-                if use_draco:
-                    model_url = raw_url
-                else:
-                    model_url = "".join(raw_url.split(".draco"))
-                    assets_load["DancerMap"][key]["url"] = model_url
+                model_url = "".join(raw_url.split(".draco"))
+                assets_load["DancerMap"][key]["url"] = model_url
+                if library_path is not None and model_url != raw_url:
+                    draco_urls[model_url] = raw_url
 
                 dancer_models_hash[key] = assets_load_hash["DancerMap"][key]["url"]
                 if not new_load_hash and key in local_load_hash["DancerMap"]:
@@ -98,6 +127,8 @@ async def fetch_data(reload: bool = False):
 
             parse_config(assets_load["Config"])
 
+            transferred = 0
+            decode_time = 0.0
             for url, hash_match in url_set:
                 file_path = os.path.normpath(config.ASSET_PATH + url)
                 file_dir = os.path.dirname(file_path)
@@ -108,11 +139,29 @@ async def fetch_data(reload: bool = False):
                     os.makedirs(file_dir)
                     logger.info(f"created folder: {file_dir}")
 
-                data = await client.download_binary(url)
-                logger.info(f"fetched file {url} from server")
+                data: bytes | None = None
+                if library_path is not None and url in draco_urls:
+                    compressed = await client.download_binary(draco_urls[url])
+                    transferred += len(compressed)
+                    logger.info(f"fetched file {draco_urls[url]} from server")
+
+                    start = time.perf_counter()
+                    data = await decode_draco_model(library_path, url, compressed)
+                    decode_time += time.perf_counter() - start
+
+                if data is None:
+                    data = await client.download_binary(url)
+                    transferred += len(data)
+                    logger.info(f"fetched file {url} from server")
+
                 with open(file_path, "w+b") as file:
                     file.write(data)
 
+            logger.info(
+                f"Assets fetched: {transferred} bytes transferred, "
+                f"{decode_time * 1000:.1f} ms decoding models"
+            )
+
             with open(local_load_hash_path, "w") as file:
                 json.dump(assets_load_hash, file)
 
@@ -141,6 +190,30 @@ async def init_assets():
     setup_scene_marker()
 
 
+async def init_bundled_assets(
+    assets_load: dict[str, Any], dancer_models_hash: dict[str, str]
+):
+    """
+    Set up the assets of the show bundle, already in the asset folder, without
+    editor-server
+    """
+    await update_user_log("Setting up bundled assets...")
+    parse_config(assets_load["Config"])
+
+    state.init_temps.assets_load = assets_load
+    state.init_temps.dancer_model_update = {
+        key: False for key in assets_load["DancerMap"]
+    }
+    state.init_temps.dancer_models_hash = dancer_models_hash
+
+    setup_render()
+    setup_display()
+
+    await update_user_log("Setting up music...")
+    setup_music()
+    setup_scene_marker()
+
+
 async def load_data():
     await update_user_log("Setting up objects...")
     try:
@@ -151,5 +224,5 @@ async def load_data():
     setup_floor()
 
     await update_user_log("Setting up animation data...")
-    setup_animation_data()
+    await setup_animation_data()
     update_current_pos_by_index()
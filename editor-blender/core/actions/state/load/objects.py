@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import os
 from typing import cast
 
@@ -7,50 +8,73 @@ import bpy
 from .....properties.types import DancerModelHashItemType, LightType, ObjectType
 from ....config import config
 from ....log import logger
-from ....models import DancersArrayPartsItem, ModelName, PartType
+from ....models import (
+    DancersArrayItem,
+    DancersArrayPartsItem,
+    ModelName,
+    ObjectIndex,
+    ObjectIndexItem,
+    PartType,
+)
 from ....states import state
 from ....utils.object import set_bpy_props
 
 
 def check_local_object_list():
+    """
+    Registry pass: decide which dancers already have a complete object tree
+    and which models need to be updated. Only the objects of shown dancers are
+    inspected, hidden dancers are removed and built again once shown.
+    """
     if not bpy.context:
         return
     data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
-    dancer_objects_exist = {}
+    dancer_objects_exist: dict[str, bool] = {}
     dancer_model_update = state.init_temps.dancer_model_update
 
     dancer_models_hash = state.init_temps.dancer_models_hash
 
-    # local_dancer_models_hash_list = cast(
     local_dancer_models_hash = cast(
         list[DancerModelHashItemType],
         getattr(bpy.context.scene, "ld_dancer_model_hash"),
     )
+    local_dancer_models_hash_index: dict[str, tuple[int, DancerModelHashItemType]] = {}
+    for index, model_hash in enumerate(local_dancer_models_hash):
+        local_dancer_models_hash_index.setdefault(
+            model_hash.dancer_name, (index, model_hash)
+        )
+    outdated_model_hash_indices: list[int] = []
+
+    show_dancer_dict = dict(zip(state.dancer_names, state.show_dancers))
 
-    # Do NOT skip unselected dancers here
+    # Model hashes of hidden dancers are checked too
     for dancer_item in state.dancers_array:
         dancer_name = dancer_item.name
-        dancer_objects_exist[dancer_name] = True
+        dancer_objects_exist[dancer_name] = dancer_name in data_objects.keys()
+
+        local_dancer_model_hash = local_dancer_models_hash_index.get(dancer_name)
+        if local_dancer_model_hash is None or local_dancer_model_hash[
+            1
+        ].model_hash != dancer_models_hash.get(dancer_name, ""):
+            logger.warning(f"Model hash mismatch for {dancer_name}")
+            dancer_model_update[dancer_name] = True
+            if local_dancer_model_hash is not None:
+                outdated_model_hash_indices.append(local_dancer_model_hash[0])
 
-        if dancer_name not in bpy.data.objects.keys():
-            dancer_objects_exist[dancer_name] = False
+        if not dancer_objects_exist[dancer_name] or not show_dancer_dict[dancer_name]:
             continue
 
-        dancer_parts = dancer_item.parts
         dancer_index = dancer_name.split("_")[0]
-        for part_item in dancer_parts:
-            part_name = part_item.name
-            part_type = part_item.type
-            part_obj_name = f"{dancer_index}_{part_name}"
+        for part_item in dancer_item.parts:
+            part_obj_name = f"{dancer_index}_{part_item.name}"
 
-            match part_type:
+            match part_item.type:
                 case PartType.LED:
                     part_parent = data_objects.get(part_obj_name)
-                    if part_parent is None:
-                        dancer_objects_exist[dancer_name] = False
-                        break
-
-                    if len(part_parent.children) != part_item.length:
+                    if (
+                        part_parent is None
+                        or len(part_parent.children) != part_item.length
+                    ):
                         dancer_objects_exist[dancer_name] = False
                         break
 
@@ -59,26 +83,12 @@ def check_local_object_list():
                         dancer_objects_exist[dancer_name] = False
                         break
 
-        local_dancer_model_hash = None
-        for i, model_hash in enumerate(local_dancer_models_hash):
-            if model_hash.dancer_name == dancer_name:
-                local_dancer_model_hash = (i, model_hash)
-                break
-
-        if local_dancer_model_hash is None or local_dancer_model_hash[
-            1
-        ].model_hash != dancer_models_hash.get(dancer_name, ""):
-            logger.warning(f"Model hash mismatch for {dancer_name}")
-            dancer_model_update[dancer_name] = True
-            if local_dancer_model_hash is not None:
-                getattr(bpy.context.scene, "ld_dancer_model_hash").remove(
-                    local_dancer_model_hash[0]
-                )
-
-        # Model should be updated, remove dancer first
+        # Object tree is incomplete, remove dancer first
         if not dancer_objects_exist[dancer_name]:
-            dancer_obj = data_objects[dancer_name]
-            recursive_remove_object(dancer_obj)
+            recursive_remove_object(data_objects[dancer_name])
+
+    for index in sorted(outdated_model_hash_indices, reverse=True):
+        getattr(bpy.context.scene, "ld_dancer_model_hash").remove(index)
 
     state.init_temps.dancers_object_exist = dancer_objects_exist
 
@@ -173,6 +183,55 @@ async def import_model_to_asset(
     logger.info(f"Model: {model_name} imported")
 
 
+def model_library_path(model_name: str, model_hash: str) -> str:
+    """Processed model collections are kept in a .blend file per model hash"""
+    digest = hashlib.sha1(model_hash.encode()).hexdigest()[:16]
+    return os.path.join(config.ASSET_PATH, "library", f"{model_name}.{digest}.blend")
+
+
+def save_model_to_library(model_name: str, model_hash: str):
+    library_path = model_library_path(model_name, model_hash)
+    library_dir = os.path.dirname(library_path)
+    os.makedirs(library_dir, exist_ok=True)
+
+    # Files of previous hashes of the model
+    for filename in os.listdir(library_dir):
+        file_path = os.path.join(library_dir, filename)
+        if (
+            filename.startswith(f"{model_name}.")
+            and filename.endswith(".blend")
+            and file_path != library_path
+        ):
+            os.remove(file_path)
+
+    collection = cast(bpy.types.Collection, bpy.data.collections[model_name])
+    bpy.data.libraries.write(library_path, {collection}, fake_user=True)
+    logger.info(f"Model: {model_name} saved to library")
+
+
+def load_model_from_library(model_name: str, model_hash: str) -> bool:
+    """Append the processed model collection, False if it is not in the library"""
+    library_path = model_library_path(model_name, model_hash)
+    if not os.path.exists(library_path):
+        return False
+
+    try:
+        with bpy.data.libraries.load(library_path, link=False) as (
+            data_from,
+            data_to,
+        ):
+            if model_name not in data_from.collections:
+                return False
+            data_to.collections = [model_name]
+
+    except Exception:
+        logger.exception(f"Failed to load model {model_name} from library")
+        return False
+
+    logger.info(f"Model: {model_name} loaded from library")
+    return True
+
+
 def find_first_mesh(mesh_name: str) -> bpy.types.Mesh | None:
     data_meshes = cast(dict[str, bpy.types.Mesh], bpy.data.meshes)
     mesh = data_meshes.get(mesh_name)
@@ -191,6 +250,11 @@ def find_first_mesh(mesh_name: str) -> bpy.types.Mesh | None:
 def setup_dancer_part_objects_map():
     data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
 
+    # Objects may have been recreated, their props no longer match
+    state.applied_status.clear()
+    # Objects of hidden dancers have been removed
+    state.dancer_part_objects_map.clear()
+
     show_dancer = state.show_dancers
 
     dancer_array = state.dancers_array
@@ -211,6 +275,46 @@ def setup_dancer_part_objects_map():
 
             state.dancer_part_objects_map[dancer_name][1][part_name] = part_obj
 
+    setup_object_index()
+
+
+def setup_object_index():
+    """Classify the objects of shown dancers once for the selection handlers"""
+    object_index: ObjectIndex = {}
+
+    for dancer_obj, _ in state.dancer_part_objects_map.values():
+        human_objs: list[bpy.types.Object] = []
+
+        for child_obj in cast(list[bpy.types.Object], dancer_obj.children):
+            object_type: str = getattr(child_obj, "ld_object_type")
+            light_type: str = getattr(child_obj, "ld_light_type")
+
+            if object_type == ObjectType.HUMAN.value:
+                human_objs.append(child_obj)
+
+            bulb_objs = cast(list[bpy.types.Object], list(child_obj.children))
+            if light_type == LightType.LED.value:
+                for bulb_obj in bulb_objs:
+                    object_index[bulb_obj.name] = ObjectIndexItem(
+                        object_type=ObjectType.LIGHT.value,
+                        light_type=LightType.LED_BULB.value,
+                        group=[],
+                    )
+
+            object_index[child_obj.name] = ObjectIndexItem(
+                object_type=object_type,
+                light_type=light_type,
+                group=bulb_objs if light_type == LightType.LED.value else [],
+            )
+
+        object_index[dancer_obj.name] = ObjectIndexItem(
+            object_type=ObjectType.DANCER.value,
+            light_type=getattr(dancer_obj, "ld_light_type"),
+            group=human_objs,
+        )
+
+    state.object_index = object_index
+
 
 def recursive_remove_object(obj: bpy.types.Object):
     for child in obj.children:
@@ -219,6 +323,138 @@ def recursive_remove_object(obj: bpy.types.Object):
     bpy.data.objects.remove(obj)
 
 
+def model_asset_objects(model_name: str) -> dict[str, bpy.types.Object]:
+    dancer_asset = cast(bpy.types.Collection, bpy.data.collections[model_name])
+    return {
+        cast(str, obj.name): obj
+        for obj in cast(list[bpy.types.Object], dancer_asset.all_objects)
+    }
+
+
+def materialize_dancer(
+    dancer_index: int,
+    dancer: DancersArrayItem,
+    model_name: str,
+    dancer_asset_objects: dict[str, bpy.types.Object],
+) -> bpy.types.Object | None:
+    """
+    Copy the objects of a dancer from its model collection, None if the model
+    doesn't contain the dancer or its human.
+    """
+    if not bpy.context:
+        return None
+    dancer_name = dancer.name
+
+    asset_dancer_obj = dancer_asset_objects.get(f"{model_name}.{model_name}")
+    if asset_dancer_obj is None:
+        logger.warning(f"Dancer {dancer_name} not found in asset")
+        return None
+
+    dancer_obj = cast(bpy.types.Object, asset_dancer_obj.copy())
+    set_bpy_props(
+        dancer_obj,
+        name=dancer_name,
+        empty_display_size=0,
+        ld_dancer_name=dancer.name,
+        ld_model_name=model_name,
+        ld_object_type=ObjectType.DANCER.value,
+        rotation_mode="XYZ",
+    )
+    bpy.context.scene.collection.objects.link(dancer_obj)
+
+    asset_human_obj = dancer_asset_objects.get(f"{model_name}.Human")
+    if asset_human_obj is None:
+        logger.warning(f"Human not found in dancer {dancer_name}")
+        return None
+
+    human_obj = cast(bpy.types.Object, asset_human_obj.copy())
+    set_bpy_props(
+        human_obj,
+        name=f"{dancer_index}_Human",
+        parent=dancer_obj,
+        color=(0, 0, 0, 1),
+        ld_object_type=ObjectType.HUMAN.value,
+        ld_dancer_name=dancer.name,
+        ld_model_name=model_name,
+    )
+    bpy.context.scene.collection.objects.link(human_obj)
+
+    for part_item in dancer.parts:
+        asset_part_obj_name = f"{model_name}.{part_item.name}"
+        asset_part_obj = dancer_asset_objects.get(asset_part_obj_name)
+        if asset_part_obj is None:
+            logger.warning(
+                f"Object {asset_part_obj_name} not found in dancer {dancer_name}"
+            )
+            continue
+
+        part_obj = cast(bpy.types.Object, asset_part_obj.copy())
+        part_obj_name = f"{dancer_index}_{part_item.name}"
+
+        if part_item.type.value == "LED":
+            set_bpy_props(
+                part_obj,
+                name=part_obj_name,
+                parent=dancer_obj,
+                empty_display_size=0,
+                ld_object_type=ObjectType.LIGHT.value,
+                ld_light_type=LightType.LED.value,
+                ld_part_name=part_item.name,
+                ld_dancer_name=dancer.name,
+                ld_model_name=model_name,
+            )
+            bpy.context.scene.collection.objects.link(part_obj)
+
+            length = part_item.length
+            if length is None:
+                logger.warning(
+                    f"LED part {part_item.name} length not found in dancer {dancer_name}"
+                )
+                continue
+
+            for position in range(length):
+                asset_sub_obj_name = f"{asset_part_obj_name}.{position:03}"
+                asset_led_obj = dancer_asset_objects.get(asset_sub_obj_name)
+                if asset_led_obj is None:
+                    logger.warning(
+                        f"LED part {part_item.name} position {position} not found in dancer {dancer_name}"
+                    )
+                    continue
+
+                led_obj = cast(bpy.types.Object, asset_led_obj.copy())
+                sub_obj_name = f"{part_obj_name}.{position:03}"
+
+                set_bpy_props(
+                    led_obj,
+                    name=sub_obj_name,
+                    parent=part_obj,
+                    color=(0, 0, 0, 1),
+                    ld_object_type=ObjectType.LIGHT.value,
+                    ld_light_type=LightType.LED_BULB.value,
+                    ld_part_name=part_item.name,
+                    ld_dancer_name=dancer.name,
+                    ld_model_name=model_name,
+                    ld_led_pos=position,
+                )
+                bpy.context.scene.collection.objects.link(led_obj)
+
+        elif part_item.type.value == "FIBER":
+            set_bpy_props(
+                part_obj,
+                name=part_obj_name,
+                parent=dancer_obj,
+                color=(0, 0, 0, 1),
+                ld_object_type=ObjectType.LIGHT.value,
+                ld_light_type=LightType.FIBER.value,
+                ld_part_name=part_item.name,
+                ld_dancer_name=dancer.name,
+                ld_model_name=model_name,
+            )
+            bpy.context.scene.collection.objects.link(part_obj)
+
+    return dancer_obj
+
+
 async def setup_objects():
     if not bpy.context:
         return
@@ -232,14 +468,13 @@ async def setup_objects():
             bpy.data.objects.remove(old_obj)
 
     """
-    set dancer objects
+    registry pass
     """
     assets_load = state.init_temps.assets_load
     dancers_model_update = state.init_temps.dancer_model_update
+    state.init_temps.dancers_reset_animation = [True] * len(state.dancers_array)
     dancer_reset_animation = state.init_temps.dancers_reset_animation
 
-    dancer_reset_animation.extend([True] * len(state.dancers_array))
-
     check_local_object_list()
     dancers_object_exist = state.init_temps.dancers_object_exist
 
@@ -249,175 +484,83 @@ async def setup_objects():
             if old_obj.visible_get():
                 bpy.data.objects.remove(old_obj)
 
-    models_ready: dict[ModelName, bool] = {}
-
     show_dancer_dict = dict(zip(state.dancer_names, state.show_dancers))
 
-    dancer_array = state.dancers_array
-    for dancer_index, dancer in enumerate(dancer_array):
+    # Shown dancers whose objects need to be built
+    pending_dancers: list[tuple[int, DancersArrayItem]] = []
+    for dancer_index, dancer in enumerate(state.dancers_array):
         dancer_name = dancer.name
         dancer_object_exist = dancers_object_exist[dancer_name]
-        dancer_model_update = dancers_model_update[dancer_name]
 
-        if not show_dancer_dict[dancer.name]:
+        if not show_dancer_dict[dancer_name]:
             if dancer_object_exist:
-                dancer_obj = data_objects[dancer_name]
-                recursive_remove_object(dancer_obj)
+                recursive_remove_object(data_objects[dancer_name])
             continue
 
         # Dancer object exists and model doesn't need to be updated
-        if dancer_object_exist and not dancer_model_update:
-            state.init_temps.dancers_reset_animation[dancer_index] = False
+        if dancer_object_exist and not dancers_model_update[dancer_name]:
+            dancer_reset_animation[dancer_index] = False
             continue
 
-        logger.info(f"Setting up dancer {dancer.name}...")
-        dancer_load = assets_load["DancerMap"][dancer_name]
-
         # Remove existing dancer object if model needs to be updated
         if dancer_object_exist:
-            dancer_obj = data_objects[dancer_name]
-            recursive_remove_object(dancer_obj)
-
-        model_file: str = dancer_load["url"]
-        model_filepath = os.path.normpath(config.ASSET_PATH + model_file)
-        model_name: str = dancer_load["modelName"]
-
-        # Remove model in collections if model needs to be updated
-        if (
-            dancer_model_update
-            and not models_ready.get(model_name, False)
-            and model_name in bpy.data.collections.keys()
-        ):
-            collection = cast(bpy.types.Collection, bpy.data.collections[model_name])
-            all_objects = cast(list[bpy.types.Object], collection.all_objects)
-            collection_objects = [obj for obj in all_objects]
-
-            bpy.data.collections.remove(collection)
-            for obj in collection_objects:
-                bpy.data.objects.remove(obj)
+            recursive_remove_object(data_objects[dancer_name])
 
-        if model_name not in bpy.data.collections.keys():
-            await import_model_to_asset(model_name, model_filepath, dancer.parts)
+        pending_dancers.append((dancer_index, dancer))
 
-        models_ready[model_name] = True
-
-        data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
-        dancer_asset = cast(bpy.types.Collection, bpy.data.collections[model_name])
-        dancer_asset_objects = {
-            cast(str, obj.name): obj
-            for obj in cast(list[bpy.types.Object], dancer_asset.all_objects)
-        }
-
-        asset_dancer_obj = dancer_asset_objects.get(f"{model_name}.{model_name}")
-        if asset_dancer_obj is None:
-            logger.warning(f"Dancer {dancer_name} not found in asset")
-            continue
-
-        dancer_obj = cast(bpy.types.Object, asset_dancer_obj.copy())
-        set_bpy_props(
-            dancer_obj,
-            name=dancer_name,
-            empty_display_size=0,
-            ld_dancer_name=dancer.name,
-            ld_model_name=model_name,
-            ld_object_type=ObjectType.DANCER.value,
-            rotation_mode="XYZ",
-        )
-        bpy.context.scene.collection.objects.link(dancer_obj)
+    """
+    materialization pass
+    """
+    models_ready: dict[ModelName, dict[str, bpy.types.Object]] = {}
+    dancer_objs: list[bpy.types.Object] = []
 
-        asset_human_obj = dancer_asset_objects.get(f"{model_name}.Human")
-        if asset_human_obj is None:
-            logger.warning(f"Human not found in dancer {dancer_name}")
-            continue
+    for dancer_index, dancer in pending_dancers:
+        dancer_name = dancer.name
+        logger.info(f"Setting up dancer {dancer_name}...")
+        dancer_load = assets_load["DancerMap"][dancer_name]
 
-        human_obj = cast(bpy.types.Object, asset_human_obj.copy())
-        set_bpy_props(
-            human_obj,
-            name=f"{dancer_index}_Human",
-            parent=dancer_obj,
-            color=(0, 0, 0, 1),
-            ld_object_type=ObjectType.HUMAN.value,
-            ld_dancer_name=dancer.name,
-            ld_model_name=model_name,
-        )
-        bpy.context.scene.collection.objects.link(human_obj)
+        model_file: str = dancer_load["url"]
+        model_filepath = os.path.normpath(config.ASSET_PATH + model_file)
+        model_name: str = dancer_load["modelName"]
 
-        for part_item in dancer.parts:
-            asset_part_obj_name = f"{model_name}.{part_item.name}"
-            asset_part_obj = dancer_asset_objects.get(asset_part_obj_name)
-            if asset_part_obj is None:
-                logger.warning(
-                    f"Object {asset_part_obj_name} not found in dancer {dancer_name}"
+        if model_name not in models_ready:
+            # Remove model in collections if model needs to be updated
+            if (
+                dancers_model_update[dancer_name]
+                and model_name in bpy.data.collections.keys()
+            ):
+                collection = cast(
+                    bpy.types.Collection, bpy.data.collections[model_name]
                 )
-                continue
+                all_objects = cast(list[bpy.types.Object], collection.all_objects)
+                collection_objects = [obj for obj in all_objects]
 
-            part_obj = cast(bpy.types.Object, asset_part_obj.copy())
-            part_obj_name = f"{dancer_index}_{part_item.name}"
+                bpy.data.collections.remove(collection)
+                for obj in collection_objects:
+                    bpy.data.objects.remove(obj)
 
-            if part_item.type.value == "LED":
-                set_bpy_props(
-                    part_obj,
-                    name=part_obj_name,
-                    parent=dancer_obj,
-                    empty_display_size=0,
-                    ld_object_type=ObjectType.LIGHT.value,
-                    ld_light_type=LightType.LED.value,
-                    ld_part_name=part_item.name,
-                    ld_dancer_name=dancer.name,
-                    ld_model_name=model_name,
-                )
-                bpy.context.scene.collection.objects.link(part_obj)
+            if model_name not in bpy.data.collections.keys():
+                model_hash = state.init_temps.dancer_models_hash[dancer_name]
 
-                length = part_item.length
-                if length is None:
-                    logger.warning(
-                        f"LED part {part_item.name} length not found in dancer {dancer_name}"
+                if not load_model_from_library(model_name, model_hash):
+                    await import_model_to_asset(
+                        model_name, model_filepath, dancer.parts
                     )
-                    continue
-
-                for position in range(length):
-                    asset_sub_obj_name = f"{asset_part_obj_name}.{position:03}"
-                    asset_led_obj = dancer_asset_objects.get(asset_sub_obj_name)
-                    if asset_led_obj is None:
-                        logger.warning(
-                            f"LED part {part_item.name} position {position} not found in dancer {dancer_name}"
+                    try:
+                        save_model_to_library(model_name, model_hash)
+                    except Exception:
+                        logger.exception(
+                            f"Failed to save model {model_name} to library"
                         )
-                        continue
-
-                    led_obj = cast(bpy.types.Object, asset_led_obj.copy())
-                    sub_obj_name = f"{part_obj_name}.{position:03}"
-
-                    set_bpy_props(
-                        led_obj,
-                        name=sub_obj_name,
-                        parent=part_obj,
-                        color=(0, 0, 0, 1),
-                        ld_object_type=ObjectType.LIGHT.value,
-                        ld_light_type=LightType.LED_BULB.value,
-                        ld_part_name=part_item.name,
-                        ld_dancer_name=dancer.name,
-                        ld_model_name=model_name,
-                        ld_led_pos=position,
-                    )
-                    bpy.context.scene.collection.objects.link(led_obj)
 
-            elif part_item.type.value == "FIBER":
-                set_bpy_props(
-                    part_obj,
-                    name=part_obj_name,
-                    parent=dancer_obj,
-                    color=(0, 0, 0, 1),
-                    ld_object_type=ObjectType.LIGHT.value,
-                    ld_light_type=LightType.FIBER.value,
-                    ld_part_name=part_item.name,
-                    ld_dancer_name=dancer.name,
-                    ld_model_name=model_name,
-                )
-                bpy.context.scene.collection.objects.link(part_obj)
+            models_ready[model_name] = model_asset_objects(model_name)
 
-        bpy.ops.object.select_all(action="DESELECT")
-        dancer_obj.select_set(True)
-        bpy.ops.object.transform_apply(rotation=True)
+        dancer_obj = materialize_dancer(
+            dancer_index, dancer, model_name, models_ready[model_name]
+        )
+        if dancer_obj is None:
+            continue
+        dancer_objs.append(dancer_obj)
 
         # Add model hash to blender if dancer is successfully loaded
         new_dancer_models_hash = cast(
@@ -429,4 +572,10 @@ async def setup_objects():
             dancer_name
         ]
 
+    if dancer_objs:
+        bpy.ops.object.select_all(action="DESELECT")
+        for dancer_obj in dancer_objs:
+            dancer_obj.select_set(True)
+        bpy.ops.object.transform_apply(rotation=True)
+
     setup_dancer_part_objects_map()
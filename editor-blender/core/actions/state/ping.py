@@ -1,4 +1,5 @@
 from ....api.ping_agent import ping_agent
+from ...states import state
 from .app_state import set_sync
 
 fail_count = 0
@@ -13,4 +14,6 @@ async def ping_server():
             set_sync(False)
     else:
         fail_count = 0
-        set_sync(True)
+        # Booted from the show bundle, sync is enabled once reconciled
+        if not state.offline:
+            set_sync(True)
@@ -20,25 +20,23 @@ def set_pos_record(pos_record: PosRecord):
     state.pos_record = pos_record
 
 
-def add_pos(id: MapID, frame: PosMapElement):
+def set_pos_data(pos_map: PosMap, pos_record: PosRecord):
+    state.pos_map = pos_map
+    state.pos_record = pos_record
+    state.pos_start_record = [pos_map[id].start for id in pos_record]
+
+
+def add_pos(id: MapID, frame: PosMapElement, apply: bool = True):
     logger.info(f"Add pos {id} at {frame.start}")
 
     pos_map_updates = state.pos_map_updates
     pos_map_updates.added[id] = frame
 
-    if (
-        state.edit_state == EditMode.EDITING
-        or not state.preferences.auto_sync
-        or not state.ready
-    ):
-        state.pos_map_pending = True
-        redraw_area({"VIEW_3D", "DOPESHEET_EDITOR"})
-    else:
-        apply_pos_map_updates()
-        notify("INFO", f"Added position frame at {frame.start}")
+    if apply:
+        flush_pos_map_updates(f"Added position frame at {frame.start}")
 
 
-def delete_pos(id: MapID):
+def delete_pos(id: MapID, apply: bool = True):
     logger.info(f"Delete pos {id}")
 
     old_frame = state.pos_map.get(id)
@@ -66,19 +64,11 @@ def delete_pos(id: MapID):
 
     pos_map_updates.deleted[id] = old_frame.start
 
-    if (
-        state.edit_state == EditMode.EDITING
-        or not state.preferences.auto_sync
-        or not state.ready
-    ):
-        state.pos_map_pending = True
-        redraw_area({"VIEW_3D", "DOPESHEET_EDITOR"})
-    else:
-        apply_pos_map_updates()
-        notify("INFO", f"Deleted position frame {id}")
+    if apply:
+        flush_pos_map_updates(f"Deleted position frame {id}")
 
 
-def update_pos(id: MapID, frame: PosMapElement):
+def update_pos(id: MapID, frame: PosMapElement, apply: bool = True):
     logger.info(f"Update pos {id} at {frame.start}")
 
     pos_map_updates = state.pos_map_updates
@@ -98,6 +88,15 @@ def update_pos(id: MapID, frame: PosMapElement):
 
     pos_map_updates.updated[id] = (frame.start, frame)
 
+    if apply:
+        flush_pos_map_updates(f"Updated position frame {id}")
+
+
+def flush_pos_map_updates(message: str):
+    """
+    Apply the queued updates, they stay pending while editing, without auto
+    sync or before the editor is ready
+    """
     if (
         state.edit_state == EditMode.EDITING
         or not state.preferences.auto_sync
@@ -107,7 +106,7 @@ def update_pos(id: MapID, frame: PosMapElement):
         redraw_area({"VIEW_3D", "DOPESHEET_EDITOR"})
     else:
         apply_pos_map_updates()
-        notify("INFO", f"Updated position frame {id}")
+        notify("INFO", message)
 
 
 def apply_pos_map_updates():
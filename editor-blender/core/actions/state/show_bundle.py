@@ -0,0 +1,184 @@
+import asyncio
+import os
+import time
+
+from ....api.auth_agent import auth_agent
+from ....api.color_agent import color_agent
+from ....api.dancer_agent import dancer_agent
+from ....api.led_agent import led_agent
+from ....api.model_agent import model_agent
+from ....api.ping_agent import ping_agent
+from ....client import client
+from ....client.subscription import subscribe
+from ...asyncio import AsyncTask
+from ...config import config
+from ...log import logger
+from ...states import state
+from ...utils.get_data import get_control, get_pos
+from ...utils.notification import notify
+from ...utils.show_bundle import (
+    ShowBundle,
+    dump_show_bundle,
+    read_show_bundle,
+    write_show_bundle,
+)
+from ..property.animation_data import init_ctrl_keyframes_from_state_in_pool
+from .app_state import set_logged_in, set_sync
+from .catch_up import catch_up_control, catch_up_pos
+from .color_map import set_color_map
+from .control_map import set_control_data
+from .led_map import set_led_map
+from .pos_map import set_pos_data
+
+RECONCILE_INITIAL_DELAY = 2.0
+RECONCILE_MAX_DELAY = 60.0
+
+
+def show_bundle_path() -> str:
+    return os.path.join(config.ASSET_PATH, "show_bundle.bin")
+
+
+def has_show_bundle() -> bool:
+    return os.path.exists(show_bundle_path())
+
+
+def snapshot_show_bundle() -> ShowBundle:
+    """
+    Copy the containers of the state, the frames themselves are replaced and
+    not resized, so the copy can be pickled while the state changes
+    """
+    return ShowBundle(
+        models_array=list(state.models_array),
+        dancers_array=list(state.dancers_array),
+        color_map=dict(state.color_map),
+        led_map={
+            model: {part: dict(effects) for part, effects in parts.items()}
+            for model, parts in state.led_map.items()
+        },
+        control_map=dict(state.control_map),
+        control_record=list(state.control_record),
+        pos_map=dict(state.pos_map),
+        pos_record=list(state.pos_record),
+        assets_load=dict(state.init_temps.assets_load),
+        dancer_models_hash=dict(state.init_temps.dancer_models_hash),
+    )
+
+
+async def save_show_bundle():
+    """Snapshot the show, it is serialized and written in the executor"""
+    start = time.perf_counter()
+    try:
+        bundle = snapshot_show_bundle()
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, dump_show_bundle, bundle)
+        await loop.run_in_executor(None, write_show_bundle, show_bundle_path(), data)
+
+    except Exception:
+        logger.exception("Failed to save show bundle")
+        return
+
+    logger.info(
+        f"Show bundle saved: {len(data)} bytes "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+
+
+async def load_show_bundle() -> ShowBundle | None:
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        bundle = await loop.run_in_executor(None, read_show_bundle, show_bundle_path())
+
+    except Exception:
+        logger.exception("Failed to read show bundle")
+        return None
+
+    if bundle is not None:
+        logger.info(
+            f"Show bundle loaded in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+    return bundle
+
+
+async def reconcile_show_bundle():
+    """
+    Wait for editor-server, then bring the data loaded from the show bundle up
+    to date and enable editing again.
+    """
+    delay = RECONCILE_INITIAL_DELAY
+    while not await ping_agent.ping():
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RECONCILE_MAX_DELAY)
+
+    logger.info("editor-server reachable, reconciling show bundle...")
+
+    if not await auth_agent.check_token():
+        state.offline = False
+        set_logged_in(False)
+        notify("WARNING", "editor-server is back, please log in again")
+        return
+
+    await client.restart_http()
+    await client.restart_graphql()
+
+    models_array = await model_agent.get_models()
+    dancers_array = await dancer_agent.get_dancers()
+    if models_array is None or dancers_array is None:
+        notify("WARNING", "Failed to reconcile show bundle, reload to edit")
+        return
+    if models_array != state.models_array or dancers_array != state.dancers_array:
+        notify("WARNING", "Dancers changed on editor-server, reload to edit")
+        return
+
+    # Subscribe first, so no change after the snapshot below is missed
+    if state.subscription_task is not None:
+        state.subscription_task.cancel()
+    state.subscription_task = AsyncTask(subscribe).exec(persistent=True)
+
+    color_map = await color_agent.get_color_map()
+    led_map = await led_agent.get_led_map()
+    if color_map is None or led_map is None:
+        notify("WARNING", "Failed to reconcile show bundle, reload to edit")
+        return
+
+    maps_changed = color_map != state.color_map or led_map != state.led_map
+    set_color_map(color_map)
+    set_led_map(led_map)
+
+    if state.ready:
+        # Animation data is set up: fetch only the frames changed since the
+        # bundle was saved, skipping those the subscription delivered meanwhile
+        control_changes = await catch_up_control()
+        pos_changes = await catch_up_pos()
+        if control_changes is None or pos_changes is None:
+            notify("WARNING", "Failed to reconcile show bundle, reload to edit")
+            return
+        changes = control_changes + pos_changes
+
+        # Frames using a changed color or effect keep their revision
+        if maps_changed:
+            await init_ctrl_keyframes_from_state_in_pool()
+    else:
+        control_map, control_record = await get_control()
+        pos_map, pos_record = await get_pos()
+        if (
+            control_map is None
+            or control_record is None
+            or pos_map is None
+            or pos_record is None
+        ):
+            notify("WARNING", "Failed to reconcile show bundle, reload to edit")
+            return
+
+        changes = len(state.control_map.keys() ^ control_map.keys())
+        changes += len(state.pos_map.keys() ^ pos_map.keys())
+        set_control_data(control_map, control_record)
+        set_pos_data(pos_map, pos_record)
+
+    state.offline = False
+    set_sync(True)
+
+    logger.info(f"Show bundle reconciled, {changes} frames changed")
+    notify("INFO", "Back online, editing enabled")
+
+    await save_show_bundle()
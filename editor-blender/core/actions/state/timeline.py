@@ -4,7 +4,6 @@ import bpy
 
 from ...models import Editor
 from ...states import state
-from ...utils.algorithms import binary_search
 
 
 def increase_frame_index():
@@ -95,21 +94,16 @@ def decrease_frame_index():
 def increase_beat_index():
     if not bpy.context:
         return
-    data = state.music_beats
     current_time = cast(int, bpy.context.scene.frame_current)
-    index = binary_search(arr=data, x=current_time) + 1
-    index = index % len(data)
-    # index = min(len(data) - 1, index)
-    bpy.context.scene.frame_current = data[index]
+    beat = state.beat_index.next_beat(current_time, *state.dancer_load_frames)
+    if beat is not None:
+        bpy.context.scene.frame_current = beat
 
 
 def decrease_beat_index():
     if not bpy.context:
         return
-    data = state.music_beats
     current_time = cast(int, bpy.context.scene.frame_current)
-    index = binary_search(arr=data, x=current_time)
-    if index >= 0 and data[index] == current_time:
-        index -= 1
-    index = (index + len(data)) % len(data)
-    bpy.context.scene.frame_current = data[index]
+    beat = state.beat_index.prev_beat(current_time, *state.dancer_load_frames)
+    if beat is not None:
+        bpy.context.scene.frame_current = beat
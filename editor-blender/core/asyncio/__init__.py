@@ -1,9 +1,12 @@
 import asyncio
 import inspect
+import os
+import sys
 from collections.abc import Callable, Coroutine
 from typing import Any, Generic, TypeVar
 
 from ...core.log import logger
+from .registry import TaskRecord, task_registry
 
 R = TypeVar("R")
 
@@ -16,6 +19,10 @@ class AsyncTask(Generic[R]):
     args: tuple[Any, ...]
     kwargs: dict[str, Any]
 
+    name: str
+    origin: str
+    record: TaskRecord | None
+
     def __init__(
         self, task: Callable[..., Coroutine[Any, Any, R]], *args: Any, **kwargs: Any
     ):
@@ -26,6 +33,11 @@ class AsyncTask(Generic[R]):
         self.args = args
         self.kwargs = kwargs
 
+        self.name = getattr(task, "__qualname__", repr(task))
+        caller = sys._getframe(1)
+        self.origin = f"{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno}"
+        self.record = None
+
     async def __run__(self) -> None:
         try:
             self.__task__ = self.task(*self.args, **self.kwargs)
@@ -37,6 +49,9 @@ class AsyncTask(Generic[R]):
                     self.then_callback(result)
 
         except Exception as err:
+            if self.record is not None:
+                self.record.outcome = "failed"
+                self.record.error = repr(err)
             if self.catch_callback is not None:
                 logger.exception("Failed to run task")
                 if inspect.iscoroutinefunction(self.catch_callback):
@@ -56,5 +71,12 @@ class AsyncTask(Generic[R]):
         self.catch_callback = callback
         return self
 
-    def exec(self) -> asyncio.Task[Any]:
-        return asyncio.ensure_future(self.__run__())
+    def exec(self, persistent: bool = False) -> asyncio.Task[Any]:
+        """
+        Schedules the task. Mark tasks that are meant to run for the whole
+        session as persistent so they are not reported as long-running.
+        """
+        self.record = task_registry.start(self.name, self.origin, persistent)
+        future = asyncio.ensure_future(self.__run__())
+        task_registry.track(future, self.record)
+        return future
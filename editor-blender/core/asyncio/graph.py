@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..log import logger
+
+
+@dataclass
+class TaskNode:
+    name: str
+    run: Callable[[], Coroutine[Any, Any, Any]]
+    dependencies: list[str] = field(default_factory=list)
+
+
+@dataclass
+class NodeTiming:
+    # Seconds since the graph started
+    start: float = 0.0
+    end: float = 0.0
+    attempts: int = 0
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class TaskGraph:
+    """
+    Run coroutines as soon as their dependencies are done. A failing node is
+    retried on its own with exponential backoff, the other nodes keep running.
+    """
+
+    def __init__(
+        self,
+        nodes: list[TaskNode],
+        initial_delay: float = 0.5,
+        max_delay: float = 8.0,
+    ):
+        self.nodes = {node.name: node for node in nodes}
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timings: dict[str, NodeTiming] = {}
+
+        for node in nodes:
+            for dependency in node.dependencies:
+                if dependency not in self.nodes:
+                    raise ValueError(f"Unknown dependency {dependency} of {node.name}")
+        self.__check_cycles__()
+
+    def __check_cycles__(self):
+        visited: set[str] = set()
+        visiting: set[str] = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+
+            visiting.add(name)
+            for dependency in self.nodes[name].dependencies:
+                visit(dependency)
+            visiting.remove(name)
+            visited.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    async def __run_node__(
+        self, node: TaskNode, tasks: dict[str, asyncio.Task[None]], origin: float
+    ):
+        for dependency in node.dependencies:
+            await tasks[dependency]
+
+        timing = self.timings[node.name]
+        timing.start = time.perf_counter() - origin
+        delay = self.initial_delay
+
+        while True:
+            timing.attempts += 1
+            try:
+                await node.run()
+                break
+            except Exception:
+                logger.exception(
+                    f"{node.name} failed (attempt {timing.attempts}), "
+                    f"retrying in {delay:.1f}s"
+                )
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_delay)
+
+        timing.end = time.perf_counter() - origin
+
+    async def run(self):
+        origin = time.perf_counter()
+        self.timings = {name: NodeTiming() for name in self.nodes}
+
+        tasks: dict[str, asyncio.Task[None]] = {}
+        for node in self.nodes.values():
+            tasks[node.name] = asyncio.create_task(
+                self.__run_node__(node, tasks, origin)
+            )
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def critical_path(self) -> list[str]:
+        """Chain of nodes, each waiting for the previous one, that ended last"""
+        if not self.timings:
+            return []
+
+        name = max(self.timings, key=lambda name: self.timings[name].end)
+        path = [name]
+        while self.nodes[name].dependencies:
+            name = max(
+                self.nodes[name].dependencies,
+                key=lambda name: self.timings[name].end,
+            )
+            path.append(name)
+
+        return path[::-1]
+
+    def report(self) -> str:
+        lines = [
+            f"{name}: {timing.start * 1000:.0f} -> {timing.end * 1000:.0f} ms"
+            f" ({timing.attempts} attempts)"
+            for name, timing in sorted(
+                self.timings.items(), key=lambda item: item[1].start
+            )
+        ]
+        lines.append(f"Critical path: {' -> '.join(self.critical_path())}")
+        return "\n".join(lines)
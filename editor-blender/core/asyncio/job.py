@@ -0,0 +1,62 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+# Time spent on steps before yielding back to the event loop (seconds)
+SLICE_TIME_BUDGET = 0.02
+
+# (done, total, eta in seconds)
+ProgressCallback = Callable[[int, int, float], None]
+
+
+class ProgressiveJob:
+    """
+    A list of synchronous steps run cooperatively: steps are executed until the
+    slice time budget is spent, then control goes back to the event loop so
+    Blender can redraw. If the awaiting task is cancelled, calling `run` again
+    resumes from the first step that has not run yet.
+    """
+
+    def __init__(
+        self,
+        steps: list[Callable[[], None]],
+        on_progress: ProgressCallback | None = None,
+        time_budget: float = SLICE_TIME_BUDGET,
+    ):
+        self.steps = steps
+        self.on_progress = on_progress
+        self.time_budget = time_budget
+
+        self.next_step = 0
+        self.elapsed = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.next_step >= len(self.steps)
+
+    @property
+    def eta(self) -> float:
+        if self.next_step == 0:
+            return 0.0
+        remaining = len(self.steps) - self.next_step
+        return self.elapsed / self.next_step * remaining
+
+    async def run(self) -> None:
+        total = len(self.steps)
+
+        while not self.done:
+            slice_start = time.perf_counter()
+
+            while not self.done:
+                self.steps[self.next_step]()
+                self.next_step += 1
+
+                if time.perf_counter() - slice_start >= self.time_budget:
+                    break
+
+            self.elapsed += time.perf_counter() - slice_start
+
+            if self.on_progress is not None:
+                self.on_progress(self.next_step, total, self.eta)
+            if not self.done:
+                await asyncio.sleep(0)
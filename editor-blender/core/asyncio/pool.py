@@ -0,0 +1,120 @@
+import asyncio
+import functools
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import ModuleType
+from typing import Any, TypeVar
+
+from ..log import logger
+
+R = TypeVar("R")
+
+# Worker processes cannot import bpy nor the add-on package (which Blender may
+# load under bl_ext.*), so the stdlib-only compute module is loaded by path
+# under a fixed top-level name, in the workers and in Blender alike, for its
+# functions to be picklable by reference.
+WORKER_MODULE_NAME = "lightdance_compute"
+WORKER_MODULE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    "utils",
+    "compute.py",
+)
+
+WORKER_BOOTSTRAP = """
+import importlib.util
+import sys
+
+spec = importlib.util.spec_from_file_location(name, path)
+module = importlib.util.module_from_spec(spec)
+sys.modules[name] = module
+spec.loader.exec_module(module)
+"""
+
+MAX_WORKERS = max(min((os.cpu_count() or 2) - 1, 4), 1)
+
+
+def load_worker_module() -> ModuleType:
+    module = sys.modules.get(WORKER_MODULE_NAME)
+    if module is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(
+        WORKER_MODULE_NAME, WORKER_MODULE_PATH
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {WORKER_MODULE_PATH}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[WORKER_MODULE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class ProcessPool:
+    """
+    Lazily started process pool for the pure functions of core/utils/compute.py.
+    Falls back to running them in Blender if worker processes cannot be used.
+    """
+
+    def __init__(self):
+        self.executor: ProcessPoolExecutor | None = None
+        self.module: ModuleType | None = None
+        self.disabled = False
+
+    def __start__(self) -> tuple[ProcessPoolExecutor, ModuleType]:
+        if self.executor is None or self.module is None:
+            self.module = load_worker_module()
+            self.executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=functools.partial(
+                    exec,
+                    WORKER_BOOTSTRAP,
+                    {"name": WORKER_MODULE_NAME, "path": WORKER_MODULE_PATH},
+                ),
+            )
+            logger.info(f"Started process pool with {MAX_WORKERS} workers")
+
+        return self.executor, self.module
+
+    async def run(self, fn: Callable[..., R], *args: Any) -> R:
+        """
+        Runs a function of core/utils/compute.py in a worker process. Errors
+        raised by the function itself are raised here.
+        """
+        if self.disabled:
+            return fn(*args)
+
+        try:
+            executor, module = self.__start__()
+            worker_fn: Callable[..., R] = getattr(module, fn.__name__)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, worker_fn, *args)
+
+        except asyncio.CancelledError:
+            raise
+
+        except pickle.PicklingError:
+            logger.exception("Cannot send to the process pool, computing in Blender")
+            return fn(*args)
+
+        except (BrokenProcessPool, ImportError, OSError):
+            # Workers cannot be spawned or died
+            logger.exception("Process pool failed, computing in Blender instead")
+            self.shutdown()
+            self.disabled = True
+            return fn(*args)
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+process_pool = ProcessPool()
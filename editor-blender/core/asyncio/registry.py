@@ -0,0 +1,180 @@
+import asyncio
+import json
+import time
+import weakref
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Literal
+
+from ..log import logger
+
+TaskOutcome = Literal["running", "done", "failed", "cancelled", "leaked"]
+
+# Tasks running longer than this are reported as long-running (seconds)
+LONG_RUNNING_THRESHOLD = 10.0
+
+# Number of finished tasks and durations per task name to keep
+HISTORY_SIZE = 500
+DURATION_SAMPLES = 256
+
+
+@dataclass
+class TaskRecord:
+    id: int
+    name: str
+    origin: str
+    # Wall clock time for dumps, perf counter for durations
+    started_at: float
+    start: float
+    persistent: bool = False
+    duration: float | None = None
+    outcome: TaskOutcome = "running"
+    error: str | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.duration is not None:
+            return self.duration
+        return time.perf_counter() - self.start
+
+
+@dataclass
+class TaskTypeStats:
+    name: str
+    outcomes: dict[str, int] = field(default_factory=dict)
+    durations: deque[float] = field(
+        default_factory=lambda: deque(maxlen=DURATION_SAMPLES)
+    )
+
+    def percentile(self, percentile: float) -> float:
+        if len(self.durations) == 0:
+            return 0.0
+        durations = sorted(self.durations)
+        index = min(int(len(durations) * percentile / 100), len(durations) - 1)
+        return durations[index]
+
+
+class TaskRegistry:
+    """
+    Keeps track of every task started through AsyncTask or AsyncOperator.
+
+    A task is flagged long-running when it outlives LONG_RUNNING_THRESHOLD
+    without being marked persistent, and leaked when it is garbage collected
+    before finishing.
+    """
+
+    def __init__(self):
+        self.next_id = 0
+        self.running: dict[int, TaskRecord] = {}
+        self.history: deque[TaskRecord] = deque(maxlen=HISTORY_SIZE)
+        self.types: dict[str, TaskTypeStats] = {}
+        self.task_refs: dict[int, weakref.ref[asyncio.Future[Any]]] = {}
+
+    def start(self, name: str, origin: str, persistent: bool = False) -> TaskRecord:
+        self.next_id += 1
+        record = TaskRecord(
+            id=self.next_id,
+            name=name,
+            origin=origin,
+            started_at=time.time(),
+            start=time.perf_counter(),
+            persistent=persistent,
+        )
+        self.running[record.id] = record
+        return record
+
+    def track(self, task: asyncio.Future[Any], record: TaskRecord) -> None:
+        def on_done(task: asyncio.Future[Any]):
+            if task.cancelled():
+                self.finish(record, "cancelled")
+                return
+
+            error = task.exception()
+            if error is not None:
+                self.finish(record, "failed", repr(error))
+            else:
+                self.finish(record, "done")
+
+        def on_collected(_: weakref.ref[asyncio.Future[Any]]):
+            if record.id in self.running:
+                logger.warning(f"Task {record.name} from {record.origin} leaked")
+                self.finish(record, "leaked")
+
+        task.add_done_callback(on_done)
+        self.task_refs[record.id] = weakref.ref(task, on_collected)
+
+    def finish(
+        self, record: TaskRecord, outcome: TaskOutcome, error: str | None = None
+    ) -> None:
+        if record.id not in self.running:
+            return
+
+        del self.running[record.id]
+        self.task_refs.pop(record.id, None)
+
+        record.duration = time.perf_counter() - record.start
+        # The task may have swallowed its exception and flagged itself
+        if record.outcome == "failed" and outcome == "done":
+            outcome = "failed"
+        record.outcome = outcome
+        if error is not None:
+            record.error = error
+
+        self.history.append(record)
+
+        stats = self.types.get(record.name)
+        if stats is None:
+            stats = TaskTypeStats(name=record.name)
+            self.types[record.name] = stats
+        stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+        stats.durations.append(record.duration)
+
+    def long_running(
+        self, threshold: float = LONG_RUNNING_THRESHOLD
+    ) -> list[TaskRecord]:
+        return sorted(
+            (
+                record
+                for record in self.running.values()
+                if not record.persistent and record.elapsed > threshold
+            ),
+            key=lambda record: record.start,
+        )
+
+    def leaked(self) -> list[TaskRecord]:
+        return [record for record in self.history if record.outcome == "leaked"]
+
+    def to_dict(self) -> dict[str, Any]:
+        def record_to_dict(record: TaskRecord) -> dict[str, Any]:
+            data = asdict(record)
+            data["elapsed"] = record.elapsed
+            return data
+
+        return {
+            "dumped_at": time.time(),
+            "running": [record_to_dict(record) for record in self.running.values()],
+            "long_running": [record.id for record in self.long_running()],
+            "history": [record_to_dict(record) for record in self.history],
+            "types": {
+                name: {
+                    "outcomes": stats.outcomes,
+                    "count": len(stats.durations),
+                    "p50": stats.percentile(50),
+                    "p90": stats.percentile(90),
+                    "p99": stats.percentile(99),
+                    "max": max(stats.durations, default=0.0),
+                }
+                for name, stats in self.types.items()
+            },
+        }
+
+    def dump(self, path: str, extra: dict[str, Any] | None = None) -> None:
+        data = self.to_dict()
+        if extra is not None:
+            data.update(extra)
+
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2, default=str)
+
+
+task_registry = TaskRegistry()
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Tick intervals of the Blender timer driving the asyncio loop (seconds)
+TICK_INTERVAL_BUSY = 1 / 60
+TICK_INTERVAL_IDLE = 0.5
+
+# Keep ticking fast for this long after the last piece of work
+BUSY_GRACE_PERIOD = 1.0
+
+# Maximum time spent running the loop in one tick, so the UI stays responsive
+TICK_TIME_BUDGET = 0.012
+
+# Do not re-create the Blender timer for interval changes smaller than this
+INTERVAL_CHANGE_RATIO = 0.2
+
+
+@dataclass
+class LoopStats:
+    ticks: int = 0
+    busy_ticks: int = 0
+    budget_exceeded: int = 0
+    interval: float = TICK_INTERVAL_IDLE
+    # How late the loop got to run compared to when work was due (seconds)
+    lag: float = 0.0
+    lag_avg: float = 0.0
+    lag_max: float = 0.0
+    tick_duration_avg: float = 0.0
+    tick_duration_max: float = 0.0
+    recent_lags: deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def record(self, lag: float, duration: float, busy: bool) -> None:
+        self.ticks += 1
+        if busy:
+            self.busy_ticks += 1
+
+        self.lag = lag
+        self.lag_avg = self.lag_avg * 0.95 + lag * 0.05
+        self.lag_max = max(self.lag_max, lag)
+        self.recent_lags.append(lag)
+
+        self.tick_duration_avg = self.tick_duration_avg * 0.95 + duration * 0.05
+        self.tick_duration_max = max(self.tick_duration_max, duration)
+
+    def lag_percentile(self, percentile: float) -> float:
+        if len(self.recent_lags) == 0:
+            return 0.0
+        lags = sorted(self.recent_lags)
+        index = min(int(len(lags) * percentile / 100), len(lags) - 1)
+        return lags[index]
+
+    def reset_max(self) -> None:
+        self.lag_max = 0.0
+        self.tick_duration_max = 0.0
+
+
+loop_stats = LoopStats()
+
+
+def _ready_count(loop: asyncio.AbstractEventLoop) -> int:
+    ready: Any = getattr(loop, "_ready", None)
+    return len(ready) if ready is not None else 0
+
+
+def _next_timer(loop: asyncio.AbstractEventLoop) -> float | None:
+    """Loop time of the earliest scheduled callback, if any."""
+    scheduled: Any = getattr(loop, "_scheduled", None)
+    if not scheduled:
+        return None
+    return scheduled[0].when()
+
+
+def _io_pending(loop: asyncio.AbstractEventLoop) -> bool:
+    """Polls the selector without blocking, events stay queued for the loop."""
+    selector: Any = getattr(loop, "_selector", None)
+    if selector is None:
+        return False
+    try:
+        return len(selector.select(0)) > 0
+    except Exception:
+        return False
+
+
+class TickPolicy:
+    """
+    Adaptive tick policy for driving the asyncio loop from a Blender timer.
+
+    Each tick runs loop iterations until nothing is ready or the time budget is
+    spent, then picks the next timer interval: fast while there is work, slow
+    when idle, and never later than the next scheduled callback.
+    """
+
+    def __init__(self):
+        self.interval = TICK_INTERVAL_IDLE
+        self.last_tick = time.perf_counter()
+        self.last_busy = 0.0
+        self.next_due: float | None = None
+
+    def run(self, loop: asyncio.AbstractEventLoop) -> None:
+        start = time.perf_counter()
+
+        # Lag is measured against the earliest moment work was due: either the
+        # next scheduled callback or the tick we asked Blender for.
+        expected = self.last_tick + self.interval
+        if self.next_due is not None:
+            expected = min(expected, self.next_due)
+        lag = max(start - expected, 0.0)
+
+        busy = False
+        while True:
+            loop.stop()
+            loop.run_forever()
+
+            if time.perf_counter() - start > TICK_TIME_BUDGET:
+                if _ready_count(loop) > 0:
+                    loop_stats.budget_exceeded += 1
+                    busy = True
+                break
+
+            if _ready_count(loop) == 0 and not _io_pending(loop):
+                break
+            busy = True
+
+        end = time.perf_counter()
+        if busy:
+            self.last_busy = end
+
+        self.interval = self._next_interval(loop, end)
+        self.last_tick = end
+
+        loop_stats.interval = self.interval
+        loop_stats.record(lag, end - start, busy)
+
+    def _next_interval(self, loop: asyncio.AbstractEventLoop, now: float) -> float:
+        self.next_due = None
+
+        if _ready_count(loop) > 0 or now - self.last_busy < BUSY_GRACE_PERIOD:
+            return TICK_INTERVAL_BUSY
+
+        next_timer = _next_timer(loop)
+        if next_timer is not None:
+            delay = max(next_timer - loop.time(), 0.0)
+            self.next_due = now + delay
+            return min(max(delay, TICK_INTERVAL_BUSY), TICK_INTERVAL_IDLE)
+
+        return TICK_INTERVAL_IDLE
+
+    def should_reschedule(self, current_interval: float) -> bool:
+        """Whether the Blender timer must be re-created with `self.interval`."""
+        return (
+            abs(self.interval - current_interval)
+            > current_interval * INTERVAL_CHANGE_RATIO
+        )
@@ -1,10 +1,16 @@
 from asyncio import Task
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import bpy
 
+from ..utils.beat import BeatIndex
+
+if TYPE_CHECKING:
+    from ..utils.shell_log import ShellLog
+
 ID = int
 
 ColorName = str
@@ -131,6 +137,9 @@ PosMap = dict[MapID, PosMapElement]
 
 PosRecord = list[MapID]
 
+# id -> (start, revision) of every frame on editor-server
+FrameRevisions = dict[MapID, tuple[int, Revision]]
+
 PosStartRecord = list[int]
 
 
@@ -333,9 +342,62 @@ RPiStatus = dict[str, RPiStatusItem]
 class ShellTransaction:
     command: str
     output: str
+    # Unix time of the response
+    time: float
+
+
+ShellHistory = dict[str, "ShellLog"]
+
+
+class CommandAckStatus(Enum):
+    PENDING = 0
+    ACKED = 1
+    FAILED = 2
+    TIMEOUT = 3
+
+
+@dataclass
+class CommandAck:
+    status: CommandAckStatus
+    # Round trip in ms
+    latency: float | None = None
+    # Replies still expected, boards answer once per connected interface
+    replies: int = 1
+    # time.perf_counter() when acked or timed out
+    finished: float | None = None
+
+
+@dataclass
+class CommandRequest:
+    id: int
+    topic: str
+    # What controller server runs on the RPis, echoed in their replies
+    command: str
+    # time.perf_counter() when sent
+    sent: float
+    acks: dict[DancerName, CommandAck]
 
 
-ShellHistory = dict[str, list[ShellTransaction]]
+# Recent round trips in ms, per dancer or per command topic
+CommandLatency = dict[str, deque[float]]
+
+
+@dataclass
+class ClockSample:
+    # Controller-server clock - local clock, in ms
+    offset: float
+    # Round trip without the server processing time, in ms
+    delay: float
+
+
+@dataclass
+class ClockEstimate:
+    offset: float
+    # Of the fastest accepted sample
+    delay: float
+    # RMS spread of the accepted offsets
+    jitter: float
+    samples: int
 
 
 @dataclass
@@ -344,6 +406,8 @@ class Preferences:
     follow_frame: bool
     show_waveform: bool
     show_nametag: bool
+    use_draco: bool
+    shell_history_limit: int
 
 
 DancerPartObjectsMap = dict[
@@ -351,6 +415,18 @@ DancerPartObjectsMap = dict[
 ]
 
 
+@dataclass
+class ObjectIndexItem:
+    object_type: str
+    light_type: str
+    # Objects selected along with this one (human of a dancer, bulbs of an LED)
+    group: list[bpy.types.Object]
+
+
+# Object name -> item, for the objects of shown dancers
+ObjectIndex = dict[str, ObjectIndexItem]
+
+
 @dataclass
 class InitializationTemporaries:
     assets_load: dict[str, Any]
@@ -364,6 +440,8 @@ class InitializationTemporaries:
 class State:
     running: bool
     sync: bool
+    # Booted from the local show bundle, read-only until reconciled
+    offline: bool
 
     user_log: str
 
@@ -378,6 +456,8 @@ class State:
     subscription_task: Task[None] | None
     init_editor_task: Task[None] | None
     command_task: Task[None] | None
+    clock_task: Task[None] | None
+    reconcile_task: Task[None] | None
 
     init_temps: InitializationTemporaries
     music_frame_length: int
@@ -408,6 +488,9 @@ class State:
     current_status: ControlMapStatus
     current_led_status: ControlMapLEDStatus
     current_pos: PosMapStatus
+    # Resolved status last written to each part object (by object name)
+    applied_status: dict[str, tuple[Any, ...]]
+    applying_status: bool
 
     current_editing_frame: int
     current_editing_detached: bool
@@ -422,6 +505,8 @@ class State:
     selection_mode: SelectMode
     selected_obj_names: list[str]
     selected_obj_type: SelectedPartType | None
+    # Most recently selected dancers, latest last
+    recent_dancers: list[DancerName]
 
     clipboard: Clipboard
 
@@ -443,6 +528,11 @@ class State:
 
     rpi_status: RPiStatus
     shell_history: ShellHistory
+    command_requests: dict[int, CommandRequest]
+    command_summary: str
+    dancer_latency: CommandLatency
+    command_latency: CommandLatency
+    clock_estimate: ClockEstimate | None
     last_play_timestamp_ms: int
 
     color_map_updates: ColorMapUpdates
@@ -458,6 +548,6 @@ class State:
     led_map_pending: LEDMapPending
 
     dancer_part_objects_map: DancerPartObjectsMap
+    object_index: ObjectIndex
 
-    music_beats: list[int]
-    scene_start_point: list[int]
+    beat_index: BeatIndex
@@ -15,13 +15,20 @@ from ..models import (
     SelectMode,
     State,
 )
+from ..utils.beat import BeatIndex
 
 state = State(
     running=False,
     sync=False,
+    offline=False,
     user_log="Loading...",
     preferences=Preferences(
-        auto_sync=True, follow_frame=True, show_waveform=True, show_nametag=True
+        auto_sync=True,
+        follow_frame=True,
+        show_waveform=True,
+        show_nametag=True,
+        use_draco=False,
+        shell_history_limit=200,
     ),
     logged_in=False,
     loading=False,
@@ -31,6 +38,8 @@ state = State(
     subscription_task=None,
     init_editor_task=None,
     command_task=None,
+    clock_task=None,
+    reconcile_task=None,
     init_temps=InitializationTemporaries(
         assets_load={},
         dancer_models_hash={},
@@ -59,6 +68,8 @@ state = State(
     current_status={},
     current_led_status={},
     current_pos={},
+    applied_status={},
+    applying_status=False,
     current_editing_frame=0,
     current_editing_detached=False,
     current_editing_frame_synced=True,
@@ -70,6 +81,7 @@ state = State(
     selection_mode=SelectMode.PART_MODE,
     selected_obj_names=[],
     selected_obj_type=None,
+    recent_dancers=[],
     clipboard=Clipboard(CopiedType.NONE),
     models={},
     model_names=[],
@@ -86,6 +98,11 @@ state = State(
     color_map={},
     rpi_status={},
     shell_history={},
+    command_requests={},
+    command_summary="",
+    dancer_latency={},
+    command_latency={},
+    clock_estimate=None,
     last_play_timestamp_ms=0,
     color_map_updates=ColorMapUpdates(added=[], updated=[], deleted=[]),
     color_map_pending=ColorMapPending(add_or_delete=False, update=False),
@@ -96,6 +113,6 @@ state = State(
     pos_map_updates=PosMapUpdates(added={}, updated={}, deleted={}),
     pos_map_pending=False,
     dancer_part_objects_map={},
-    music_beats=[],
-    scene_start_point=[],
+    object_index={},
+    beat_index=BeatIndex(),
 )
@@ -1,3 +1,4 @@
+import random
 from typing import Literal
 
 
@@ -17,6 +18,22 @@ def binary_search(arr: list[int], x: int) -> int:
     return r
 
 
+def search_from_hint(arr: list[int], x: int, hint: int) -> int:
+    """
+    Same result as binary_search, but checks `hint` and the index after it
+    first. During playback the index usually stays or advances by one.
+    """
+    n = len(arr)
+    for index in (hint, hint + 1):
+        if (
+            0 <= index < n
+            and arr[index] <= x
+            and (index + 1 == n or arr[index + 1] > x)
+        ):
+            return index
+    return binary_search(arr, x)
+
+
 def binary_search_for_neighbors(
     arr: list[int], x: int
 ) -> (
@@ -100,3 +117,25 @@ def linear_interpolation(lval: float, ldist: int, rval: float, rdist: int):
         return lval
     else:
         return (lval * float(rdist) + rval * float(ldist)) / float(ldist + rdist)
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    :param samples: sorted list of samples, not empty
+    :param q: percentile in [0, 100]
+    :return: linearly interpolated q-th percentile
+    """
+    position = (len(samples) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def backoff_delay(attempt: int, initial: float, maximum: float) -> float:
+    """
+    :param attempt: retries so far, from 0
+    :return: `initial` doubled on each attempt up to `maximum`, with the upper
+        half randomized so that clients do not retry in lockstep
+    """
+    delay = min(initial * 2 ** min(attempt, 32), maximum)
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,114 @@
+"""
+beat.py
+
+- `data/beat.csv` holds one column per scene: the scene name in the first
+  row, then the beat times (in seconds) of the scene. The first beat is the
+  start of the scene.
+- The file is parsed once into sorted millisecond arrays, cached against the
+  hash of its content.
+"""
+
+import csv
+import hashlib
+import io
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+
+
+@dataclass
+class BeatIndex:
+    scene_names: list[str] = field(default_factory=list)
+    # Start of each scene (milliseconds), sorted
+    scene_starts: array = field(default_factory=lambda: array("i"))
+    # Every beat (milliseconds), sorted
+    beats: array = field(default_factory=lambda: array("i"))
+
+    def beat_range(self, left: float, right: float) -> tuple[int, int]:
+        """Indices [start, end) of the beats within [left, right]"""
+        return bisect_left(self.beats, left), bisect_right(self.beats, right)
+
+    def next_beat(self, time: int, left: float, right: float) -> int | None:
+        """
+        First beat after `time` within [left, right], wrapping around to the
+        first beat of the range.
+        """
+        start, end = self.beat_range(left, right)
+        if start >= end:
+            return None
+
+        index = bisect_right(self.beats, time, start, end)
+        return self.beats[index if index < end else start]
+
+    def prev_beat(self, time: int, left: float, right: float) -> int | None:
+        """
+        Last beat before `time` within [left, right], wrapping around to the
+        last beat of the range.
+        """
+        start, end = self.beat_range(left, right)
+        if start >= end:
+            return None
+
+        index = bisect_left(self.beats, time, start, end) - 1
+        return self.beats[index if index >= start else end - 1]
+
+    def nearest_beat(self, time: int) -> int | None:
+        beats = self.beats
+        if len(beats) == 0:
+            return None
+
+        index = bisect_left(beats, time)
+        if index == 0:
+            return beats[0]
+        if index == len(beats):
+            return beats[-1]
+
+        before, after = beats[index - 1], beats[index]
+        return before if time - before <= after - time else after
+
+    def scene_at(self, time: int) -> int:
+        """Index of the scene playing at `time`, -1 before the first scene"""
+        return bisect_right(self.scene_starts, time) - 1
+
+
+def csv_second_to_miliseconds(second: str) -> int:
+    return int(float(second) * 1000)
+
+
+def parse_beat_csv(content: str) -> BeatIndex:
+    rows = list(csv.reader(io.StringIO(content)))
+    if len(rows) < 2:
+        return BeatIndex()
+
+    scene_names = rows[0]
+    scene_starts = array("i", (csv_second_to_miliseconds(second) for second in rows[1]))
+    beats = array(
+        "i",
+        sorted(
+            csv_second_to_miliseconds(second)
+            for row in rows[1:]
+            for second in row
+            if second != ""
+        ),
+    )
+
+    return BeatIndex(scene_names=scene_names, scene_starts=scene_starts, beats=beats)
+
+
+beat_index_cache: tuple[str, BeatIndex] | None = None
+
+
+def load_beat_index(path: str) -> BeatIndex:
+    global beat_index_cache
+
+    with open(path, "rb") as file:
+        raw = file.read()
+
+    digest = hashlib.md5(raw).hexdigest()
+    if beat_index_cache is not None and beat_index_cache[0] == digest:
+        return beat_index_cache[1]
+
+    beat_index = parse_beat_csv(raw.decode("utf-8"))
+    beat_index_cache = (digest, beat_index)
+
+    return beat_index
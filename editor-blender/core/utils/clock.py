@@ -0,0 +1,72 @@
+"""
+clock.py
+
+- Offset of the controller-server clock from the local one, NTP style: a
+  request carries the local send time t0, the server answers with its receive
+  and reply times t1 and t2, and the answer arrives at local time t3.
+- offset = ((t1 - t0) + (t2 - t3)) / 2, delay = (t3 - t0) - (t2 - t1). The
+  offset is off by at most delay / 2, so the fastest round trips are trusted
+  most: samples far slower than the median are dropped, and the estimate is
+  the median offset of the fastest remaining ones.
+"""
+
+from collections import deque
+
+from ..models import ClockEstimate, ClockSample
+from .algorithms import percentile
+
+# Samples kept, and how many of the fastest ones make the estimate
+CLOCK_WINDOW = 16
+CLOCK_BEST = 4
+# Round trips over median + CLOCK_OUTLIER_MADS * MAD are dropped
+CLOCK_OUTLIER_MADS = 3.0
+# Floor of the MAD, controller-server stamps are whole ms
+CLOCK_MIN_MAD = 1.0
+
+
+def make_clock_sample(t0: float, t1: float, t2: float, t3: float) -> ClockSample:
+    return ClockSample(
+        offset=((t1 - t0) + (t2 - t3)) / 2,
+        # Negative only by rounding of the server stamps
+        delay=max((t3 - t0) - (t2 - t1), 0.0),
+    )
+
+
+class ClockEstimator:
+    def __init__(self, window: int = CLOCK_WINDOW, best: int = CLOCK_BEST):
+        self.samples: deque[ClockSample] = deque(maxlen=window)
+        self.best = best
+
+    def clear(self):
+        self.samples.clear()
+
+    def add(self, t0: float, t1: float, t2: float, t3: float) -> ClockEstimate:
+        self.samples.append(make_clock_sample(t0, t1, t2, t3))
+        return self.estimate()
+
+    def accepted(self) -> list[ClockSample]:
+        """Samples without round trip outliers, fastest first"""
+        samples = sorted(self.samples, key=lambda sample: sample.delay)
+        delays = [sample.delay for sample in samples]
+
+        median = percentile(delays, 50)
+        mad = percentile(sorted(abs(delay - median) for delay in delays), 50)
+        limit = median + CLOCK_OUTLIER_MADS * max(mad, CLOCK_MIN_MAD)
+
+        return [sample for sample in samples if sample.delay <= limit]
+
+    def estimate(self) -> ClockEstimate:
+        accepted = self.accepted()
+        offset = percentile(
+            sorted(sample.offset for sample in accepted[: self.best]), 50
+        )
+        jitter = (
+            sum((sample.offset - offset) ** 2 for sample in accepted) / len(accepted)
+        ) ** 0.5
+
+        return ClockEstimate(
+            offset=offset,
+            delay=accepted[0].delay,
+            jitter=jitter,
+            samples=len(self.samples),
+        )
@@ -0,0 +1,464 @@
+"""
+compute.py
+
+- Pure data stages of the control animation data computation.
+- This file must only import the standard library. Worker processes load it on
+  its own (see core/asyncio/pool.py), where neither bpy nor the add-on package
+  can be imported.
+"""
+
+import os
+import struct
+from typing import Any
+
+RGB = tuple[int, ...]
+RGBFloat = tuple[float, ...]
+
+# color id -> rgb
+RGBTable = dict[int, RGB]
+# LED effect id -> color id of each bulb
+EffectTable = dict[int, list[int]]
+
+# (part name, is LED, LED length)
+PartLayout = tuple[str, bool, int]
+# (dancer name, parts), only dancers that are shown
+DancerLayout = tuple[str, list[PartLayout]]
+
+# (color id or effect id, alpha) of each part of each dancer
+PackedStatus = list[list[tuple[int, int]]]
+# (color id, alpha) of each bulb of each part of each dancer
+PackedLEDStatus = list[list[list[tuple[int, int]]]]
+# (start, fade, status, led status)
+PackedControlFrame = tuple[int, bool, PackedStatus, PackedLEDStatus]
+# (start, (x, y, z, rx, ry, rz) of each dancer)
+PackedPosFrame = tuple[int, list[tuple[float, ...]]]
+
+# Per-dancer show export, all little-endian:
+# - header: magic, version, part count, control frame count, pos frame count
+# - parts: name length, utf-8 name (at most 255 bytes), is LED, bulb count (1
+#   for fiber parts)
+# - control frames: start, fade, then RGBA of each bulb of each part, RGB with
+#   the alpha applied (as shown in the editor) and A the alpha itself, the one
+#   of the bulb for gradients
+# - pos frames: start, x, y, z, rx, ry, rz
+EXPORT_MAGIC = b"LDEX"
+EXPORT_VERSION = 1
+EXPORT_HEADER = struct.Struct("<4sHHII")
+EXPORT_PART = struct.Struct("<BH")
+EXPORT_CONTROL_FRAME = struct.Struct("<IB")
+EXPORT_POS_FRAME = struct.Struct("<I6f")
+EXPORT_MAX_NAME_LENGTH = 255
+
+
+def rgba_to_float(rgb: tuple[int, ...] | list[int], a: int) -> RGBFloat:
+    r, g, b = rgb
+    a_float = a / 255
+    return (
+        r / 255 * a_float,
+        g / 255 * a_float,
+        b / 255 * a_float,
+    )
+
+
+def interpolate_gradient(
+    bulb_segment: list[tuple[int, int]], rgb_table: RGBTable
+) -> list[RGBFloat]:
+    """
+    Linearly interpolate color gradient.
+    Rules:
+    - If input is a single color, return it.
+    - If both head and tail are specified, interpolate between them.
+    - If head color is -1, fill with tail color.
+    - If tail color is -1, fill with head color.
+    - If both head and tail are -1, fill with black.
+    """
+    length = len(bulb_segment) - 2
+
+    head_color_id, head_alpha = bulb_segment[0]
+    if length == -1:  # Single specified color
+        return [rgba_to_float(rgb_table[head_color_id], head_alpha)]
+    if length == 0:
+        return []
+
+    tail_color_id, tail_alpha = bulb_segment[-1]
+    if head_color_id == -1:
+        if tail_color_id == -1:
+            return [(0.0, 0.0, 0.0)] * (length + 2)  # No color specified, return black
+        else:
+            return [rgba_to_float(rgb_table[tail_color_id], tail_alpha)] * (
+                length + 1
+            )  # Fill with tail color
+    elif tail_color_id == -1:
+        return [rgba_to_float(rgb_table[head_color_id], head_alpha)] * (length + 1)
+
+    head_rgb_float = rgba_to_float(rgb_table[head_color_id], head_alpha)
+    tail_rgb_float = rgba_to_float(rgb_table[tail_color_id], tail_alpha)
+    delta_float = [
+        (tail_rgb_float[i] - head_rgb_float[i]) / (length + 1) for i in range(3)
+    ]
+    return [
+        tuple(head_rgb_float[d] + delta_float[d] * (i + 1) for d in range(3))
+        for i in range(length)
+    ]
+
+
+def gradient_to_rgb_float(
+    bulb_sequence: list[tuple[int, int]], rgb_table: RGBTable
+) -> list[RGBFloat]:
+    """
+    Cut LED bulb sequence into segments and interpolate gradient for color_id=-1.
+    NOTE: The segments are sliced while preserving head and tail.
+    e.g. Color ID : `-1, 1, -1, -1, 2, 3 -> [[-1, 1], [1], [1, -1, -1, 2], [2], [3]]`
+    """
+    segments: list[list[tuple[int, int]]] = []
+    head = 0
+    for i, bulb_status in enumerate(bulb_sequence):
+        if bulb_status[0] == -1 and i != len(bulb_sequence) - 1:
+            continue
+        elif (i != 0 and bulb_sequence[i - 1][0] == -1) or i == len(bulb_sequence) - 1:
+            segments.append(bulb_sequence[head : i + 1])
+            head = i
+        if bulb_status[0] != -1:
+            segments.append([bulb_status])
+            head = i
+
+    free_l, free_r = bulb_sequence[0][0] == -1, bulb_sequence[-1][0] == -1
+    if free_l or free_r:
+        offset = len(segments[-1]) - 1
+        segments = [[*(segments[-1]), *(segments[0])]] + segments[
+            (1 if free_l else 0) : (-1 if free_r else len(segments))
+        ]
+    else:
+        offset = 0
+
+    rgb_float_list: list[RGBFloat] = []
+    for segment in segments:
+        rgb_float_list.extend(interpolate_gradient(segment, rgb_table))
+    rgb_float_list = rgb_float_list[offset:] + rgb_float_list[:offset]
+    return rgb_float_list
+
+
+class ColorResolver:
+    """
+    Resolves the color of every part of a frame. LED parts without an effect
+    fall back to the last effect of the same part, so frames must be fed in
+    order. Resolved LED colors are shared between frames, don't modify them.
+    """
+
+    def __init__(self, rgb_table: RGBTable, effect_table: EffectTable):
+        self.rgb_table = rgb_table
+        self.effect_table = effect_table
+        self.prev_effect_ids: dict[tuple[int, int], int] = {}
+        self.prev_led_bulbs: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self.effect_colors: dict[tuple[int, int], list[RGBFloat]] = {}
+        self.gradient_colors: dict[tuple[tuple[int, int], ...], list[RGBFloat]] = {}
+        self.black: dict[int, list[RGBFloat]] = {}
+
+    def fiber(self, color_id: int, alpha: int) -> RGBFloat:
+        return rgba_to_float(self.rgb_table[color_id], alpha)
+
+    def effect(self, effect_id: int, alpha: int) -> list[RGBFloat]:
+        colors = self.effect_colors.get((effect_id, alpha))
+        if colors is None:
+            rgb_table = self.rgb_table
+            colors = [
+                rgba_to_float(rgb_table[color_id], alpha)
+                for color_id in self.effect_table[effect_id]
+            ]
+            self.effect_colors[(effect_id, alpha)] = colors
+        return colors
+
+    def gradient(self, bulbs: list[tuple[int, int]]) -> list[RGBFloat]:
+        bulbs_key = tuple(bulbs)
+        colors = self.gradient_colors.get(bulbs_key)
+        if colors is None:
+            colors = gradient_to_rgb_float(bulbs, self.rgb_table)
+            self.gradient_colors[bulbs_key] = colors
+        return colors
+
+    def led(
+        self,
+        key: tuple[int, int],
+        effect_id: int,
+        alpha: int,
+        bulbs: list[tuple[int, int]],
+        length: int,
+    ) -> list[RGBFloat]:
+        prev_effect_id = self.prev_effect_ids.get(key, -1)
+
+        if effect_id > 0:
+            self.prev_effect_ids[key] = effect_id
+            return self.effect(effect_id, alpha)
+
+        if effect_id == 0:
+            self.prev_led_bulbs[key] = bulbs
+            return self.gradient(bulbs)
+
+        if prev_effect_id > 0:
+            return self.effect(prev_effect_id, alpha)
+
+        if prev_effect_id == 0:
+            return self.gradient(self.prev_led_bulbs.get(key, []))
+
+        black = self.black.get(length)
+        if black is None:
+            black = [(0.0, 0.0, 0.0)] * length
+            self.black[length] = black
+        return black
+
+
+def compute_control_animation_data(
+    layout: list[DancerLayout],
+    rgb_table: RGBTable,
+    effect_table: EffectTable,
+    frames: list[PackedControlFrame],
+) -> dict[str, dict[str, Any]]:
+    """
+    Keyframes (start, fade, rgb) of each part, or of each bulb for LED parts.
+    Frames need to be sorted by start time.
+    """
+    new_map: dict[str, dict[str, Any]] = {}
+    for dancer_name, parts in layout:
+        new_map[dancer_name] = dict((part[0], []) for part in parts)
+
+    resolver = ColorResolver(rgb_table, effect_table)
+
+    for start, fade, status, led_status in frames:
+        for dancer_index, (dancer_name, parts) in enumerate(layout):
+            dancer_map = new_map[dancer_name]
+
+            for part_index, (part_name, is_led, length) in enumerate(parts):
+                part_map = dancer_map[part_name]
+                color_id, alpha = status[dancer_index][part_index]
+
+                if is_led:
+                    led_rgb_floats = resolver.led(
+                        (dancer_index, part_index),
+                        color_id,
+                        alpha,
+                        led_status[dancer_index][part_index],
+                        length,
+                    )
+
+                    if len(part_map) == 0:
+                        part_map.extend([] for _ in range(length))
+
+                    for i in range(length):
+                        part_map[i].append((start, fade, led_rgb_floats[i]))
+
+                else:
+                    part_map.append((start, fade, resolver.fiber(color_id, alpha)))
+
+    return new_map
+
+
+def compute_control_modify_animation_data(
+    layout: list[DancerLayout],
+    rgb_table: RGBTable,
+    effect_table: EffectTable,
+    delete_starts: list[int],
+    update_frames: list[tuple[int, PackedControlFrame]],
+    add_frames: list[PackedControlFrame],
+) -> dict[str, dict[str, Any]]:
+    """
+    (delete, update, add) keyframe lists of each part, or of each bulb for LED
+    parts. Updated frames are keyed by their old start.
+    """
+    new_map: dict[str, dict[str, Any]] = {}
+    for dancer_name, parts in layout:
+        dancer_map: dict[str, Any] = {}
+        for part_name, is_led, length in parts:
+            if is_led:
+                dancer_map[part_name] = [([], [], []) for _ in range(length)]
+            else:
+                dancer_map[part_name] = ([], [], [])
+        new_map[dancer_name] = dancer_map
+
+    for old_start in delete_starts:
+        for dancer_name, parts in layout:
+            dancer_map = new_map[dancer_name]
+
+            for part_name, is_led, length in parts:
+                part_map = dancer_map[part_name]
+
+                if is_led:
+                    for i in range(length):
+                        part_map[i][0].append(old_start)
+                else:
+                    part_map[0].append(old_start)
+
+    resolver = ColorResolver(rgb_table, effect_table)
+    # Update entries carry the old start, add entries do not
+    keyed_frames: list[tuple[int | None, PackedControlFrame]] = [
+        *update_frames,
+        *((None, frame) for frame in add_frames),
+    ]
+
+    for old_start, (start, fade, status, led_status) in keyed_frames:
+        slot = 2 if old_start is None else 1
+
+        for dancer_index, (dancer_name, parts) in enumerate(layout):
+            dancer_map = new_map[dancer_name]
+
+            for part_index, (part_name, is_led, length) in enumerate(parts):
+                part_map = dancer_map[part_name]
+                color_id, alpha = status[dancer_index][part_index]
+
+                if is_led:
+                    led_rgb_floats = resolver.led(
+                        (dancer_index, part_index),
+                        color_id,
+                        alpha,
+                        led_status[dancer_index][part_index],
+                        length,
+                    )
+
+                    for i in range(length):
+                        if old_start is None:
+                            entry = (start, fade, led_rgb_floats[i])
+                        else:
+                            entry = (old_start, start, fade, led_rgb_floats[i])
+                        part_map[i][slot].append(entry)
+
+                else:
+                    rgb_float = resolver.fiber(color_id, alpha)
+                    if old_start is None:
+                        entry = (start, fade, rgb_float)
+                    else:
+                        entry = (old_start, start, fade, rgb_float)
+                    part_map[slot].append(entry)
+
+    return new_map
+
+
+def to_rgba_bytes(rgb_floats: list[RGBFloat], alpha: int) -> bytes:
+    return bytes(
+        value
+        for r, g, b in rgb_floats
+        for value in (round(r * 255), round(g * 255), round(b * 255), alpha)
+    )
+
+
+def to_bulb_rgba_bytes(
+    rgb_floats: list[RGBFloat], bulbs: list[tuple[int, int]]
+) -> bytes:
+    """Same as to_rgba_bytes, with the alpha of each (color id, alpha) bulb"""
+    return bytes(
+        value
+        for (r, g, b), (_, alpha) in zip(rgb_floats, bulbs)
+        for value in (round(r * 255), round(g * 255), round(b * 255), alpha)
+    )
+
+
+def export_dancer(
+    path: str,
+    dancer_index: int,
+    parts: list[PartLayout],
+    resolver: ColorResolver,
+    frames: list[PackedControlFrame],
+    pos_frames: list[PackedPosFrame],
+) -> int:
+    """Stream the tables of one dancer to `path`, return the bytes written"""
+    # Resolved LED colors are shared by the resolver, so are their bytes
+    led_bytes: dict[tuple[int, int], bytes] = {}
+    fiber_bytes: dict[tuple[int, int], bytes] = {}
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        written = file.write(
+            EXPORT_HEADER.pack(
+                EXPORT_MAGIC,
+                EXPORT_VERSION,
+                len(parts),
+                len(frames),
+                len(pos_frames),
+            )
+        )
+        for part_name, is_led, length in parts:
+            name = part_name.encode()
+            written += file.write(bytes([len(name)]) + name)
+            written += file.write(EXPORT_PART.pack(is_led, length if is_led else 1))
+
+        for start, fade, status, led_status in frames:
+            chunks = [EXPORT_CONTROL_FRAME.pack(start, fade)]
+
+            for part_index, (_, is_led, length) in enumerate(parts):
+                color_id, alpha = status[dancer_index][part_index]
+
+                if is_led:
+                    led_rgb_floats = resolver.led(
+                        (dancer_index, part_index),
+                        color_id,
+                        alpha,
+                        led_status[dancer_index][part_index],
+                        length,
+                    )
+                    # Gradient colors are shared per bulbs, so are their alphas
+                    gradient = color_id == 0
+                    bytes_key = (id(led_rgb_floats), -1 if gradient else alpha)
+                    part_bytes = led_bytes.get(bytes_key)
+                    if part_bytes is None:
+                        if gradient:
+                            part_bytes = to_bulb_rgba_bytes(
+                                led_rgb_floats[:length],
+                                led_status[dancer_index][part_index],
+                            )
+                        else:
+                            part_bytes = to_rgba_bytes(led_rgb_floats[:length], alpha)
+                        led_bytes[bytes_key] = part_bytes
+
+                else:
+                    part_bytes = fiber_bytes.get((color_id, alpha))
+                    if part_bytes is None:
+                        part_bytes = to_rgba_bytes(
+                            [resolver.fiber(color_id, alpha)], alpha
+                        )
+                        fiber_bytes[(color_id, alpha)] = part_bytes
+
+                chunks.append(part_bytes)
+
+            written += file.write(b"".join(chunks))
+
+        for start, positions in pos_frames:
+            written += file.write(
+                EXPORT_POS_FRAME.pack(start, *positions[dancer_index])
+            )
+
+    os.replace(tmp_path, path)
+    return written
+
+
+def export_show(
+    directory: str,
+    layout: list[DancerLayout],
+    rgb_table: RGBTable,
+    effect_table: EffectTable,
+    frames: list[PackedControlFrame],
+    pos_frames: list[PackedPosFrame],
+) -> dict[str, int]:
+    """
+    Write `<dancer>.bin` for each dancer in `layout` to `directory`, return the
+    bytes written per dancer. Frames need to be sorted by start time.
+    """
+    for dancer_name, parts in layout:
+        for part_name, _, _ in parts:
+            if len(part_name.encode()) > EXPORT_MAX_NAME_LENGTH:
+                raise ValueError(
+                    f"Part name of {dancer_name} longer than "
+                    f"{EXPORT_MAX_NAME_LENGTH} bytes: {part_name}"
+                )
+
+    os.makedirs(directory, exist_ok=True)
+
+    sizes: dict[str, int] = {}
+    for dancer_index, (dancer_name, parts) in enumerate(layout):
+        sizes[dancer_name] = export_dancer(
+            os.path.join(directory, f"{dancer_name}.bin"),
+            dancer_index,
+            parts,
+            ColorResolver(rgb_table, effect_table),
+            frames,
+            pos_frames,
+        )
+
+    return sizes
@@ -62,6 +62,15 @@ from ..models import (
     Rotation,
 )
 from ..states import state
+from . import compute
+from .compute import (
+    DancerLayout,
+    EffectTable,
+    PackedControlFrame,
+    PackedPosFrame,
+    RGBTable,
+    rgba_to_float,
+)
 
 
 def models_query_to_state(payload: QueryModelPayload) -> ModelsArray:
@@ -402,93 +411,20 @@ def float_to_rgb(color_float: tuple[float, ...]) -> tuple[int, ...]:
     return tuple([round(color * 255) for color in color_float])
 
 
-def rgba_to_float(rgb: tuple[int, ...] | list[int], a: int) -> tuple[float, ...]:
-    r, g, b = rgb
-    a_float = a / 255
-    return (
-        r / 255 * a_float,
-        g / 255 * a_float,
-        b / 255 * a_float,
-    )
+def color_rgb_table() -> RGBTable:
+    return dict((color_id, color.rgb) for color_id, color in state.color_map.items())
 
 
 def interpolate_gradient(
     bulb_segment: list[tuple[ColorID, int]]
 ) -> list[tuple[float, ...]]:
-    """
-    Linearly interpolate color gradient.
-    Rules:
-    - If input is a single color, return it.
-    - If both head and tail are specified, interpolate between them.
-    - If head color is -1, fill with tail color.
-    - If tail color is -1, fill with head color.
-    - If both head and tail are -1, fill with black.
-    """
-    color_map = state.color_map
-    length = len(bulb_segment) - 2
-
-    head_color_id, head_alpha = bulb_segment[0]
-    if length == -1:  # Single specified color
-        return [rgba_to_float(color_map[head_color_id].rgb, head_alpha)]
-    if length == 0:
-        return []
-
-    tail_color_id, tail_alpha = bulb_segment[-1]
-    if head_color_id == -1:
-        if tail_color_id == -1:
-            return [(0.0, 0.0, 0.0)] * (length + 2)  # No color specified, return black
-        else:
-            return [rgba_to_float(color_map[tail_color_id].rgb, tail_alpha)] * (
-                length + 1
-            )  # Fill with tail color
-    elif tail_color_id == -1:
-        return [rgba_to_float(color_map[head_color_id].rgb, head_alpha)] * (length + 1)
-
-    head_rgb_float = rgba_to_float(color_map[head_color_id].rgb, head_alpha)
-    tail_rgb_float = rgba_to_float(color_map[tail_color_id].rgb, tail_alpha)
-    delta_float = [
-        (tail_rgb_float[i] - head_rgb_float[i]) / (length + 1) for i in range(3)
-    ]
-    return [
-        tuple(head_rgb_float[d] + delta_float[d] * (i + 1) for d in range(3))
-        for i in range(length)
-    ]
+    return compute.interpolate_gradient(bulb_segment, color_rgb_table())
 
 
 def gradient_to_rgb_float(
     bulb_sequence: list[tuple[ColorID, int]],
 ) -> list[tuple[float, ...]]:
-    """
-    Cut LED bulb sequence into segments and interpolate gradient for color_id=-1.
-    NOTE: The segments are sliced while preserving head and tail.
-    e.g. Color ID : `-1, 1, -1, -1, 2, 3 -> [[-1, 1], [1], [1, -1, -1, 2], [2], [3]]`
-    """
-    segments: list[list[tuple[ColorID, int]]] = []
-    head = 0
-    for i, bulb_status in enumerate(bulb_sequence):
-        if bulb_status[0] == -1 and i != len(bulb_sequence) - 1:
-            continue
-        elif (i != 0 and bulb_sequence[i - 1][0] == -1) or i == len(bulb_sequence) - 1:
-            segments.append(bulb_sequence[head : i + 1])
-            head = i
-        if bulb_status[0] != -1:
-            segments.append([bulb_status])
-            head = i
-
-    free_l, free_r = bulb_sequence[0][0] == -1, bulb_sequence[-1][0] == -1
-    if free_l or free_r:
-        offset = len(segments[-1]) - 1
-        segments = [[*(segments[-1]), *(segments[0])]] + segments[
-            (1 if free_l else 0) : (-1 if free_r else len(segments))
-        ]
-    else:
-        offset = 0
-
-    rgb_float_list: list[tuple[float, ...]] = []
-    for segment in segments:
-        rgb_float_list.extend(interpolate_gradient(segment))
-    rgb_float_list = rgb_float_list[offset:] + rgb_float_list[:offset]
-    return rgb_float_list
+    return compute.gradient_to_rgb_float(bulb_sequence, color_rgb_table())
 
 
 def is_color_code(color_code: str) -> bool:
@@ -521,10 +457,6 @@ def time_to_frame(time: str) -> int:
     return (minutes * 60 + seconds) * 1000 + milliseconds
 
 
-def csv_second_to_miliseconds(second: str) -> int:
-    return int(float(second) * 1000)
-
-
 PosDeleteCurveData = list[int]
 PosUpdateCurveData = list[
     tuple[int, int, tuple[float, float, float], tuple[float, float, float]]
@@ -648,193 +580,135 @@ ControlAddAnimationData = dict[
 ]
 
 
-def control_modify_to_animation_data(
-    control_delete: list[tuple[int, MapID]],
-    control_update: list[tuple[int, MapID, ControlMapElement]],
-    control_add: list[tuple[MapID, ControlMapElement]],
-) -> ControlModifyAnimationData:
-    new_map: ControlModifyAnimationData = {}
+def pack_control_layout(shown_only: bool = True) -> list[DancerLayout]:
+    """Parts of the shown dancers, in the order packed frames use."""
     show_dancer_dict = dict(zip(state.dancer_names, state.show_dancers))
-    for dancer_name in state.dancers_array:
-        if not show_dancer_dict[dancer_name.name]:
-            continue
-        new_map[dancer_name.name] = {}
-        for part in dancer_name.parts:
-            if part.type == PartType.LED:
-                length = cast(int, part.length)
-                new_map[dancer_name.name][part.name] = [
-                    ([], [], []) for _ in range(length)
-                ]
-            else:
-                new_map[dancer_name.name][part.name] = ([], [], [])
-
-    color_map = state.color_map
-    led_effect_table = state.led_effect_id_table
-    prev_effect_ids: dict[DancerName, dict[PartName, list[int]]] = {}
-    prev_led_status: dict[DancerName, dict[PartName, list[list[tuple[int, int]]]]] = {}
-
-    for old_start, _ in control_delete:
-        for _, dancer_item in enumerate(state.dancers_array):
-            dancer_name = dancer_item.name
-            if not show_dancer_dict[dancer_name]:
-                continue
-            parts = dancer_item.parts
-
-            for _, part in enumerate(parts):
-                part_name = part.name
-                part_map = new_map[dancer_name][part_name]
-
-                if part.type == PartType.LED:
-                    part_length = cast(int, part.length)
-
-                    for i in range(part_length):
-                        part_map[i][0].append(old_start)  # type: ignore
-
-                else:
-                    part_map[0].append(old_start)  # type: ignore
-
-    for old_start, _, frame in control_update:
-        for _, dancer_item in enumerate(state.dancers_array):
-            dancer_name = dancer_item.name
-            if not show_dancer_dict[dancer_name]:
-                continue
-
-            parts = dancer_item.parts
-
-            for _, part in enumerate(parts):
-                part_name = part.name
-                part_map = new_map[dancer_name][part_name]
-                part_led_status = frame.led_status[dancer_name][part_name]
-
-                part_data = frame.status[dancer_name][part_name]
-                part_alpha = part_data.alpha
-
-                if isinstance(part_data, LEDData):
-                    part_length = cast(int, part.length)
-                    prev_effect_id = prev_effect_ids.setdefault(
-                        dancer_name, {}
-                    ).setdefault(part_name, [-1])
-                    prev_led_bulbs = prev_led_status.setdefault(
-                        dancer_name, {}
-                    ).setdefault(part_name, [[]])
-
-                    led_rgb_floats = []
-                    if part_data.effect_id > 0:
-                        part_effect = led_effect_table[part_data.effect_id].effect
-                        led_rgb_floats = [
-                            rgba_to_float(color_map[led_data.color_id].rgb, part_alpha)
-                            for led_data in part_effect
-                        ]
-
-                        prev_effect_id[0] = part_data.effect_id
-
-                    elif part_data.effect_id == 0:
-                        led_rgb_floats = gradient_to_rgb_float(
-                            [
-                                (led_data.color_id, led_data.alpha)
-                                for led_data in part_led_status
-                            ]
-                        )
-                        prev_led_bulbs[0] = [
-                            (led_data.color_id, led_data.alpha)
-                            for led_data in part_led_status
-                        ]
-
-                    elif prev_effect_id[0] > 0:
-                        prev_effect = led_effect_table[prev_effect_id[0]].effect
-                        led_rgb_floats = [
-                            rgba_to_float(color_map[led_data.color_id].rgb, part_alpha)
-                            for led_data in prev_effect
-                        ]
-
-                    elif prev_effect_id[0] == 0:
-                        led_rgb_floats = gradient_to_rgb_float(prev_led_bulbs[0])
-
-                    else:
-                        led_rgb_floats = [(0, 0, 0)] * part_length
-
-                    for i in range(part_length):
-                        part_map[i][1].append((old_start, frame.start, frame.fade, led_rgb_floats[i]))  # type: ignore
+    return [
+        (
+            dancer_item.name,
+            [
+                (part.name, part.type == PartType.LED, part.length or 0)
+                for part in dancer_item.parts
+            ],
+        )
+        for dancer_item in state.dancers_array
+        if not shown_only or show_dancer_dict[dancer_item.name]
+    ]
 
-                else:
-                    part_rgb = color_map[part_data.color_id].rgb
-                    fiber_rgb_float = rgba_to_float(part_rgb, part_data.alpha)
 
-                    part_map[1].append((old_start, frame.start, frame.fade, fiber_rgb_float))  # type: ignore
+def pack_control_tables() -> tuple[RGBTable, EffectTable]:
+    effect_table = dict(
+        (effect_id, [led_data.color_id for led_data in effect.effect])
+        for effect_id, effect in state.led_effect_id_table.items()
+    )
+    return color_rgb_table(), effect_table
 
-    for _, frame in control_add:
-        for _, dancer_item in enumerate(state.dancers_array):
-            dancer_name = dancer_item.name
-            if not show_dancer_dict[dancer_name]:
-                continue
 
-            parts = dancer_item.parts
+def pack_control_frame(
+    frame: ControlMapElement, layout: list[DancerLayout]
+) -> PackedControlFrame:
+    status: list[list[tuple[int, int]]] = []
+    led_status: list[list[list[tuple[int, int]]]] = []
 
-            for _, part in enumerate(parts):
-                part_name = part.name
-                part_map = new_map[dancer_name][part_name]
-                part_led_status = frame.led_status[dancer_name][part_name]
+    for dancer_name, parts in layout:
+        dancer_status = frame.status[dancer_name]
+        dancer_led_status = frame.led_status[dancer_name]
 
-                part_data = frame.status[dancer_name][part_name]
-                part_alpha = part_data.alpha
+        part_status: list[tuple[int, int]] = []
+        part_led_status: list[list[tuple[int, int]]] = []
+        for part_name, _, _ in parts:
+            part_data = dancer_status[part_name]
+            if isinstance(part_data, LEDData):
+                part_status.append((part_data.effect_id, part_data.alpha))
+            else:
+                part_status.append((part_data.color_id, part_data.alpha))
 
-                if isinstance(part_data, LEDData):
-                    part_length = cast(int, part.length)
-                    prev_effect_id = prev_effect_ids.setdefault(
-                        dancer_name, {}
-                    ).setdefault(part_name, [-1])
-                    prev_led_bulbs = prev_led_status.setdefault(
-                        dancer_name, {}
-                    ).setdefault(part_name, [[]])
+            part_led_status.append(
+                [
+                    (led_data.color_id, led_data.alpha)
+                    for led_data in dancer_led_status[part_name]
+                ]
+            )
 
-                    led_rgb_floats = []
-                    if part_data.effect_id > 0:
-                        part_effect = led_effect_table[part_data.effect_id].effect
-                        led_rgb_floats = [
-                            rgba_to_float(color_map[led_data.color_id].rgb, part_alpha)
-                            for led_data in part_effect
-                        ]
+        status.append(part_status)
+        led_status.append(part_led_status)
 
-                        prev_effect_id[0] = part_data.effect_id
+    return frame.start, frame.fade, status, led_status
 
-                    elif part_data.effect_id == 0:
-                        led_rgb_floats = gradient_to_rgb_float(
-                            [
-                                (led_data.color_id, led_data.alpha)
-                                for led_data in part_led_status
-                            ]
-                        )
-                        prev_led_bulbs[0] = [
-                            (led_data.color_id, led_data.alpha)
-                            for led_data in part_led_status
-                        ]
 
-                    elif prev_effect_id[0] > 0:
-                        prev_effect = led_effect_table[prev_effect_id[0]].effect
-                        led_rgb_floats = [
-                            rgba_to_float(color_map[led_data.color_id].rgb, part_alpha)
-                            for led_data in prev_effect
-                        ]
+def pack_control_map_input(
+    control_map: list[tuple[MapID, ControlMapElement]],
+) -> tuple[list[DancerLayout], RGBTable, EffectTable, list[PackedControlFrame]]:
+    """Arguments of compute.compute_control_animation_data"""
+    layout = pack_control_layout()
+    rgb_table, effect_table = pack_control_tables()
+    frames = [pack_control_frame(frame, layout) for _, frame in control_map]
+    return layout, rgb_table, effect_table, frames
+
+
+def pack_pos_frame(frame: PosMapElement, layout: list[DancerLayout]) -> PackedPosFrame:
+    positions: list[tuple[float, ...]] = []
+    for dancer_name, _ in layout:
+        position = frame.pos[dancer_name]
+        location, rotation = position.location, position.rotation
+        positions.append(
+            (location.x, location.y, location.z, rotation.rx, rotation.ry, rotation.rz)
+        )
 
-                    elif prev_effect_id[0] == 0:
-                        led_rgb_floats = gradient_to_rgb_float(prev_led_bulbs[0])
+    return frame.start, positions
 
-                    else:
-                        led_rgb_floats = [(0, 0, 0)] * part_length
 
-                    if len(part_map) == 0:
-                        part_map.extend([[] for _ in range(part_length)])  # type: ignore
+def pack_show_export_input() -> (
+    tuple[
+        list[DancerLayout],
+        RGBTable,
+        EffectTable,
+        list[PackedControlFrame],
+        list[PackedPosFrame],
+    ]
+):
+    """Arguments of compute.export_show, after the output directory"""
+    layout = pack_control_layout(shown_only=False)
+    rgb_table, effect_table = pack_control_tables()
+    frames = [
+        pack_control_frame(state.control_map[id], layout) for id in state.control_record
+    ]
+    pos_frames = [pack_pos_frame(state.pos_map[id], layout) for id in state.pos_record]
+    return layout, rgb_table, effect_table, frames, pos_frames
 
-                    for i in range(part_length):
-                        part_map[i][2].append((frame.start, frame.fade, led_rgb_floats[i]))  # type: ignore
 
-                else:
-                    part_rgb = color_map[part_data.color_id].rgb
-                    fiber_rgb_float = rgba_to_float(part_rgb, part_data.alpha)
+def pack_control_modify_input(
+    control_delete: list[tuple[int, MapID]],
+    control_update: list[tuple[int, MapID, ControlMapElement]],
+    control_add: list[tuple[MapID, ControlMapElement]],
+) -> tuple[
+    list[DancerLayout],
+    RGBTable,
+    EffectTable,
+    list[int],
+    list[tuple[int, PackedControlFrame]],
+    list[PackedControlFrame],
+]:
+    """Arguments of compute.compute_control_modify_animation_data"""
+    layout = pack_control_layout()
+    rgb_table, effect_table = pack_control_tables()
+    delete_starts = [old_start for old_start, _ in control_delete]
+    update_frames = [
+        (old_start, pack_control_frame(frame, layout))
+        for old_start, _, frame in control_update
+    ]
+    add_frames = [pack_control_frame(frame, layout) for _, frame in control_add]
+    return layout, rgb_table, effect_table, delete_starts, update_frames, add_frames
 
-                    part_map[2].append((frame.start, frame.fade, fiber_rgb_float))  # type: ignore
 
-    return new_map
+def control_modify_to_animation_data(
+    control_delete: list[tuple[int, MapID]],
+    control_update: list[tuple[int, MapID, ControlMapElement]],
+    control_add: list[tuple[MapID, ControlMapElement]],
+) -> ControlModifyAnimationData:
+    return compute.compute_control_modify_animation_data(
+        *pack_control_modify_input(control_delete, control_update, control_add)
+    )
 
 
 def control_add_to_animation_data(
@@ -1063,91 +937,4 @@ def control_update_to_animation_data(
 def control_map_to_animation_data(
     control_map: list[tuple[MapID, ControlMapElement]],
 ) -> ControlAnimationData:
-    new_map: ControlAnimationData = {}
-    show_dancer_dict = dict(zip(state.dancer_names, state.show_dancers))
-    for dancer_name in state.dancers_array:
-        if not show_dancer_dict[dancer_name.name]:
-            continue
-        new_map[dancer_name.name] = {}
-        for part_name in dancer_name.parts:
-            new_map[dancer_name.name][part_name.name] = []
-
-    color_map = state.color_map
-    led_effect_table = state.led_effect_id_table
-    prev_effect_ids: dict[DancerName, dict[PartName, list[int]]] = {}
-    prev_led_status: dict[DancerName, dict[PartName, list[list[tuple[int, int]]]]] = {}
-
-    for _, frame in control_map:
-        for _, dancer_item in enumerate(state.dancers_array):
-            if not show_dancer_dict[dancer_item.name]:
-                continue
-            dancer_name = dancer_item.name
-            parts = dancer_item.parts
-
-            for _, part in enumerate(parts):
-                part_name = part.name
-                part_map = new_map[dancer_name][part_name]
-
-                part_data = frame.status[dancer_name][part_name]
-                part_led_status = frame.led_status[dancer_name][part_name]
-                part_alpha = part_data.alpha
-
-                if isinstance(part_data, LEDData):
-                    part_length = cast(int, part.length)
-                    prev_effect_id = prev_effect_ids.setdefault(
-                        dancer_name, {}
-                    ).setdefault(part_name, [-1])
-                    prev_led_bulbs = prev_led_status.setdefault(
-                        dancer_name, {}
-                    ).setdefault(part_name, [[]])
-
-                    led_rgb_floats = []
-                    if part_data.effect_id > 0:
-                        part_effect = led_effect_table[part_data.effect_id].effect
-                        led_rgb_floats = [
-                            rgba_to_float(color_map[led_data.color_id].rgb, part_alpha)
-                            for led_data in part_effect
-                        ]
-
-                        prev_effect_id[0] = part_data.effect_id
-
-                    elif part_data.effect_id == 0:
-                        led_rgb_floats = gradient_to_rgb_float(
-                            [
-                                (led_data.color_id, led_data.alpha)
-                                for led_data in part_led_status
-                            ]
-                        )
-                        prev_led_bulbs[0] = [
-                            (led_data.color_id, led_data.alpha)
-                            for led_data in part_led_status
-                        ]
-
-                    elif prev_effect_id[0] > 0:
-                        prev_effect = led_effect_table[prev_effect_id[0]].effect
-                        led_rgb_floats = [
-                            rgba_to_float(color_map[led_data.color_id].rgb, part_alpha)
-                            for led_data in prev_effect
-                        ]
-
-                    elif prev_effect_id[0] == 0:
-                        led_rgb_floats = gradient_to_rgb_float(prev_led_bulbs[0])
-
-                    else:
-                        led_rgb_floats = [(0, 0, 0)] * part_length
-
-                    if len(part_map) == 0:
-                        part_map.extend([[] for _ in range(part_length)])  # type: ignore
-
-                    for i in range(part_length):
-                        part_map[i].append((frame.start, frame.fade, led_rgb_floats[i]))  # type: ignore
-
-                else:
-                    part_rgb = color_map[part_data.color_id].rgb
-                    fiber_rgb_float = rgba_to_float(part_rgb, part_data.alpha)
-
-                    part_map.append((frame.start, frame.fade, fiber_rgb_float))  # type: ignore
-
-        # print("Frame: ", frame.start)
-
-    return new_map
+    return compute.compute_control_animation_data(*pack_control_map_input(control_map))
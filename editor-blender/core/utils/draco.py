@@ -0,0 +1,221 @@
+"""
+draco.py
+
+- Dancer models are also served as Draco-compressed glTF binaries
+  (`*.draco.glb`, KHR_draco_mesh_compression).
+- They are decoded into plain glTF binaries with the Draco library bundled
+  with Blender's glTF add-on, so the decoded file can be cached and imported
+  like the uncompressed model.
+- The library is called through ctypes, which releases the GIL, so decoding
+  can run in the thread pool executor.
+"""
+
+import json
+import struct
+from ctypes import (
+    CDLL,
+    c_bool,
+    c_char_p,
+    c_size_t,
+    c_uint32,
+    c_void_p,
+    cdll,
+    create_string_buffer,
+)
+from typing import Any
+
+EXTENSION = "KHR_draco_mesh_compression"
+
+GLB_MAGIC = b"glTF"
+GLB_HEADER = struct.Struct("<4sII")
+CHUNK_HEADER = struct.Struct("<II")
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+
+class DracoError(Exception):
+    pass
+
+
+def draco_library_path() -> str | None:
+    """Path of the Draco library shipped with Blender, None if missing"""
+    try:
+        try:
+            from io_scene_gltf2.io.com.draco import dll_exists, dll_path  # type: ignore
+        except ImportError:
+            from io_scene_gltf2.io.com.gltf2_io_draco_compression_extension import (  # type: ignore
+                dll_exists,
+                dll_path,
+            )
+    except ImportError:
+        return None
+
+    if not dll_exists(quiet=True):
+        return None
+    return str(dll_path().resolve())
+
+
+def load_draco_library(path: str) -> CDLL:
+    dll = cdll.LoadLibrary(path)
+
+    dll.decoderCreate.restype = c_void_p
+    dll.decoderCreate.argtypes = []
+
+    dll.decoderRelease.restype = None
+    dll.decoderRelease.argtypes = [c_void_p]
+
+    dll.decoderDecode.restype = c_bool
+    dll.decoderDecode.argtypes = [c_void_p, c_void_p, c_size_t]
+
+    dll.decoderReadAttribute.restype = c_bool
+    dll.decoderReadAttribute.argtypes = [c_void_p, c_uint32, c_size_t, c_char_p]
+
+    dll.decoderAttributeIsNormalized.restype = c_bool
+    dll.decoderAttributeIsNormalized.argtypes = [c_void_p, c_uint32]
+
+    dll.decoderGetAttributeByteLength.restype = c_size_t
+    dll.decoderGetAttributeByteLength.argtypes = [c_void_p, c_uint32]
+
+    dll.decoderCopyAttribute.restype = None
+    dll.decoderCopyAttribute.argtypes = [c_void_p, c_uint32, c_void_p]
+
+    dll.decoderReadIndices.restype = c_bool
+    dll.decoderReadIndices.argtypes = [c_void_p, c_size_t]
+
+    dll.decoderGetIndicesByteLength.restype = c_size_t
+    dll.decoderGetIndicesByteLength.argtypes = [c_void_p]
+
+    dll.decoderCopyIndices.restype = None
+    dll.decoderCopyIndices.argtypes = [c_void_p, c_void_p]
+
+    return dll
+
+
+def read_glb(data: bytes) -> tuple[dict[str, Any], bytes]:
+    magic, _, length = GLB_HEADER.unpack_from(data, 0)
+    if magic != GLB_MAGIC:
+        raise DracoError("Not a glTF binary")
+
+    gltf: dict[str, Any] | None = None
+    binary = b""
+
+    offset = GLB_HEADER.size
+    while offset < length:
+        chunk_length, chunk_type = CHUNK_HEADER.unpack_from(data, offset)
+        offset += CHUNK_HEADER.size
+        chunk = data[offset : offset + chunk_length]
+        offset += chunk_length
+
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(chunk)
+        elif chunk_type == CHUNK_BIN:
+            binary = chunk
+
+    if gltf is None:
+        raise DracoError("Missing JSON chunk")
+
+    return gltf, binary
+
+
+def write_glb(gltf: dict[str, Any], binary: bytes) -> bytes:
+    content = json.dumps(gltf, separators=(",", ":")).encode()
+    content += b" " * (-len(content) % 4)
+    binary += b"\x00" * (-len(binary) % 4)
+
+    length = GLB_HEADER.size + CHUNK_HEADER.size + len(content)
+    if binary:
+        length += CHUNK_HEADER.size + len(binary)
+
+    chunks = [
+        GLB_HEADER.pack(GLB_MAGIC, 2, length),
+        CHUNK_HEADER.pack(len(content), CHUNK_JSON),
+        content,
+    ]
+    if binary:
+        chunks += [CHUNK_HEADER.pack(len(binary), CHUNK_BIN), binary]
+
+    return b"".join(chunks)
+
+
+def decode_draco_glb(library_path: str, data: bytes) -> bytes:
+    """
+    Decode every Draco-compressed primitive of a glTF binary. Decoded data is
+    appended to the binary chunk and the accessors are pointed at it.
+    """
+    gltf, binary = read_glb(data)
+
+    buffer_views: list[dict[str, Any]] = gltf.setdefault("bufferViews", [])
+    accessors: list[dict[str, Any]] = gltf.get("accessors", [])
+    output = bytearray(binary)
+
+    def append_view(decoded: bytes) -> int:
+        output.extend(b"\x00" * (-len(output) % 4))
+        buffer_views.append(
+            {"buffer": 0, "byteOffset": len(output), "byteLength": len(decoded)}
+        )
+        output.extend(decoded)
+        return len(buffer_views) - 1
+
+    dll = load_draco_library(library_path)
+
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            extension = primitive.get("extensions", {}).pop(EXTENSION, None)
+            if extension is None:
+                continue
+
+            view = buffer_views[extension["bufferView"]]
+            start = view.get("byteOffset", 0)
+            compressed = bytes(binary[start : start + view["byteLength"]])
+
+            decoder = dll.decoderCreate()
+            try:
+                if not dll.decoderDecode(decoder, compressed, len(compressed)):
+                    raise DracoError(f"Failed to decode mesh {mesh.get('name')}")
+
+                if "indices" in primitive:
+                    accessor = accessors[primitive["indices"]]
+                    if not dll.decoderReadIndices(decoder, accessor["componentType"]):
+                        raise DracoError("Failed to read indices")
+
+                    decoded = create_string_buffer(
+                        dll.decoderGetIndicesByteLength(decoder)
+                    )
+                    dll.decoderCopyIndices(decoder, decoded)
+                    accessor["bufferView"] = append_view(decoded.raw)
+                    accessor.pop("byteOffset", None)
+
+                for attribute, draco_id in extension["attributes"].items():
+                    accessor = accessors[primitive["attributes"][attribute]]
+                    if not dll.decoderReadAttribute(
+                        decoder,
+                        draco_id,
+                        accessor["componentType"],
+                        accessor["type"].encode(),
+                    ):
+                        raise DracoError(f"Failed to read attribute {attribute}")
+
+                    decoded = create_string_buffer(
+                        dll.decoderGetAttributeByteLength(decoder, draco_id)
+                    )
+                    dll.decoderCopyAttribute(decoder, draco_id, decoded)
+                    accessor["bufferView"] = append_view(decoded.raw)
+                    accessor.pop("byteOffset", None)
+                    if dll.decoderAttributeIsNormalized(decoder, draco_id):
+                        accessor["normalized"] = True
+
+            finally:
+                dll.decoderRelease(decoder)
+
+            if not primitive["extensions"]:
+                del primitive["extensions"]
+
+    for key in ["extensionsUsed", "extensionsRequired"]:
+        if key in gltf:
+            gltf[key] = [name for name in gltf[key] if name != EXTENSION]
+            if not gltf[key]:
+                del gltf[key]
+
+    gltf["buffers"][0]["byteLength"] = len(output)
+
+    return write_glb(gltf, bytes(output))
@@ -1,11 +1,9 @@
 import asyncio
-import time
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from typing import Any
 
 import bpy
 
-from ..asyncio import AsyncTask
 from ..log import logger
 
 slider_dragging_callback: Callable[[], None] | None = None
@@ -40,17 +38,58 @@ def execute_operator(idname: str, **kwargs: Any):
         logger.exception(f"Failed to execute operator {idname}")
 
 
-class Debounce:
-    def __init__(self, action: Callable[[], None], delay: float):
-        self.action = action
+class CoalescingScheduler:
+    """
+    Runs an action once, `delay` seconds after the last trigger of its key.
+
+    Each key owns at most one timer on the event loop. Triggers only push the
+    deadline back; when the timer fires early it re-arms itself for the
+    remaining time, so bursts of triggers never pile up tasks or timers.
+    """
+
+    def __init__(self, delay: float):
         self.delay = delay
-        self.last_time = 0
+        self.deadlines: dict[Hashable, float] = {}
+        self.actions: dict[Hashable, Callable[[], None]] = {}
+        self.timers: dict[Hashable, asyncio.TimerHandle] = {}
+
+        self.triggered = 0
+        self.coalesced = 0
+        self.executed = 0
+
+    def trigger(self, key: Hashable, action: Callable[[], None]):
+        loop = asyncio.get_event_loop()
+
+        self.triggered += 1
+        self.deadlines[key] = loop.time() + self.delay
+        self.actions[key] = action
+
+        if key in self.timers:
+            self.coalesced += 1
+            return
+        self.timers[key] = loop.call_later(self.delay, self.__fire__, key)
+
+    def __fire__(self, key: Hashable):
+        loop = asyncio.get_event_loop()
+
+        remaining = self.deadlines[key] - loop.time()
+        if remaining > 0:
+            self.timers[key] = loop.call_later(remaining, self.__fire__, key)
+            return
+
+        del self.timers[key]
+        del self.deadlines[key]
+        action = self.actions.pop(key)
 
-    async def delayed_action(self, trigger_time: float):
-        await asyncio.sleep(self.delay)
-        if trigger_time == self.last_time:
-            self.action()
+        self.executed += 1
+        try:
+            action()
+        except Exception:
+            logger.exception("Failed to run scheduled action")
 
-    def trigger(self):
-        self.last_time = time.time()
-        AsyncTask(self.delayed_action, self.last_time).exec()
+    def cancel(self, key: Hashable):
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        self.deadlines.pop(key, None)
+        self.actions.pop(key, None)
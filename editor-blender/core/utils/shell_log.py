@@ -0,0 +1,146 @@
+"""
+shell_log.py
+
+- Shell transactions of a dancer. At most `limit` of the latest ones stay in
+  memory. Past that, the oldest half are appended to a log file in one write,
+  one JSON object per line.
+- Transactions are numbered in order of arrival. Spilled ones are indexed by
+  byte offset and time, and all of them by command, so lookups and pages only
+  read the lines they need. The last page read is kept until a transaction
+  arrives, so redrawing it doesn't read the file again.
+"""
+
+import json
+import os
+from bisect import bisect_left
+from collections import deque
+
+from ..models import ShellTransaction
+
+# Transactions per page in the command center
+SHELL_PAGE_SIZE = 8
+
+
+class ShellLog:
+    def __init__(self, path: str, limit: int):
+        self.path = path
+        self.limit = max(limit, 1)
+
+        self.recent: deque[ShellTransaction] = deque()
+        # Of each spilled transaction, in order
+        self.offsets: list[int] = []
+        self.times: list[float] = []
+        self.file_size = 0
+        # command -> numbers of its transactions
+        self.commands: dict[str, list[int]] = {}
+        # (page, page size, command, transaction count) and its transactions
+        self.last_page: (
+            tuple[tuple[int, int, str | None, int], list[ShellTransaction]] | None
+        ) = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) + len(self.recent)
+
+    def append(self, transaction: ShellTransaction):
+        self.commands.setdefault(transaction.command, []).append(len(self))
+        self.recent.append(transaction)
+        self.spill_over_limit()
+
+    def set_limit(self, limit: int):
+        self.limit = max(limit, 1)
+        self.spill_over_limit()
+
+    def spill_over_limit(self):
+        """Keep half the limit in memory, so the file is written once per half"""
+        if len(self.recent) > self.limit:
+            self.spill(len(self.recent) - (self.limit + 1) // 2)
+
+    def spill(self, count: int):
+        lines: list[bytes] = []
+        for _ in range(count):
+            transaction = self.recent.popleft()
+            line = (
+                json.dumps(
+                    {
+                        "time": transaction.time,
+                        "command": transaction.command,
+                        "output": transaction.output,
+                    }
+                )
+                + "\n"
+            ).encode()
+
+            self.offsets.append(self.file_size)
+            self.times.append(transaction.time)
+            self.file_size += len(line)
+            lines.append(line)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as file:
+            file.write(b"".join(lines))
+
+    def get(self, numbers: list[int]) -> list[ShellTransaction]:
+        """Transactions by number, spilled ones are read from the log file"""
+        spilled = len(self.offsets)
+        transactions: list[ShellTransaction] = []
+
+        file = open(self.path, "rb") if any(n < spilled for n in numbers) else None
+        try:
+            for number in numbers:
+                if number >= spilled:
+                    transactions.append(self.recent[number - spilled])
+                    continue
+
+                assert file is not None
+                file.seek(self.offsets[number])
+                data = json.loads(file.readline())
+                transactions.append(
+                    ShellTransaction(
+                        command=data["command"],
+                        output=data["output"],
+                        time=data["time"],
+                    )
+                )
+        finally:
+            if file is not None:
+                file.close()
+
+        return transactions
+
+    def find_time(self, time: float) -> int:
+        """Number of the first transaction at or after `time`"""
+        number = bisect_left(self.times, time)
+        if number < len(self.offsets):
+            return number
+
+        for index, transaction in enumerate(self.recent):
+            if transaction.time >= time:
+                return number + index
+        return len(self)
+
+    def find_command(self, command: str) -> list[int]:
+        return self.commands.get(command, [])
+
+    def page(
+        self, page: int, page_size: int, command: str | None = None
+    ) -> list[ShellTransaction]:
+        """Newest first, optionally only transactions of `command`"""
+        key = (page, page_size, command, len(self))
+        if self.last_page is not None and self.last_page[0] == key:
+            return self.last_page[1]
+
+        if command is None:
+            end = len(self) - page * page_size
+            numbers = list(range(end - 1, max(end - page_size, 0) - 1, -1))
+        else:
+            matches = self.find_command(command)
+            end = len(matches) - page * page_size
+            numbers = matches[max(end - page_size, 0) : max(end, 0)][::-1]
+
+        transactions = self.get(numbers)
+        self.last_page = (key, transactions)
+        return transactions
+
+    def page_count(self, page_size: int, command: str | None = None) -> int:
+        count = len(self) if command is None else len(self.find_command(command))
+        return max((count + page_size - 1) // page_size, 1)
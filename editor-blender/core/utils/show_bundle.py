@@ -0,0 +1,81 @@
+"""
+show_bundle.py
+
+- A snapshot of the show (editor data from editor-server and the descriptors
+  of the downloaded assets) is kept in `show_bundle.bin` in the asset folder,
+  so the editor can boot without editor-server.
+- The file is a header (magic, version, payload length) followed by a pickle,
+  read whole and unpickled in a worker thread. Unpickling builds every object
+  anyway, so mapping the file would not save the copy.
+"""
+
+import os
+import pickle
+import struct
+from dataclasses import dataclass
+from typing import Any
+
+from ..models import (
+    ColorMap,
+    ControlMap,
+    ControlRecord,
+    DancersArray,
+    LEDMap,
+    ModelsArray,
+    PosMap,
+    PosRecord,
+)
+
+MAGIC = b"LDSB"
+VERSION = 1
+
+# magic, version, payload length
+HEADER = struct.Struct("<4sHQ")
+
+
+@dataclass
+class ShowBundle:
+    models_array: ModelsArray
+    dancers_array: DancersArray
+    color_map: ColorMap
+    led_map: LEDMap
+    control_map: ControlMap
+    control_record: ControlRecord
+    pos_map: PosMap
+    pos_record: PosRecord
+    # `load.json` of the assets, as used by fetch_data
+    assets_load: dict[str, Any]
+    dancer_models_hash: dict[str, str]
+
+
+def dump_show_bundle(bundle: ShowBundle) -> bytes:
+    payload = pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL)
+    return HEADER.pack(MAGIC, VERSION, len(payload)) + payload
+
+
+def write_show_bundle(path: str, data: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+
+    os.replace(tmp_path, path)
+
+
+def read_show_bundle(path: str) -> ShowBundle | None:
+    """None if the bundle is missing or written by another version"""
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+        return None
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version, length = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or HEADER.size + length > len(data):
+        return None
+
+    with memoryview(data) as view:
+        bundle = pickle.loads(view[HEADER.size : HEADER.size + length])
+
+    if not isinstance(bundle, ShowBundle):
+        return None
+    return bundle
@@ -2,6 +2,7 @@ import asyncio
 
 import bpy
 
+from ..asyncio.job import ProgressCallback
 from ..states import state
 
 
@@ -11,6 +12,17 @@ async def update_user_log(message: str):
     await asyncio.sleep(0.1)
 
 
+def user_log_progress(message: str) -> ProgressCallback:
+    """Progress callback showing percentage and ETA in the user log."""
+
+    def on_progress(done: int, total: int, eta: float):
+        percentage = done * 100 // max(total, 1)
+        state.user_log = f"{message} {percentage}% (ETA {eta:.0f}s)"
+        redraw_area({"VIEW_3D"})
+
+    return on_progress
+
+
 def redraw_area(area_types: set[str]):
     if bpy.context.screen is None:  # type: ignore
         return
@@ -20,6 +32,25 @@ def redraw_area(area_types: set[str]):
             area.tag_redraw()  # type: ignore
 
 
+# Seconds between batched redraws
+REDRAW_INTERVAL = 0.1
+
+pending_redraw_areas: set[str] = set()
+
+
+def flush_redraw():
+    area_types = set(pending_redraw_areas)
+    pending_redraw_areas.clear()
+    redraw_area(area_types)
+
+
+def request_redraw(area_types: set[str]):
+    """Batched redraw_area, at most once per REDRAW_INTERVAL."""
+    if not pending_redraw_areas:
+        asyncio.get_event_loop().call_later(REDRAW_INTERVAL, flush_redraw)
+    pending_redraw_areas.update(area_types)
+
+
 def set_dopesheet_filter(content: str):
     for area in bpy.context.screen.areas:  # type: ignore
         if area.type == "DOPESHEET_EDITOR":  # type: ignore
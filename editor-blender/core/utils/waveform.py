@@ -0,0 +1,171 @@
+"""
+waveform.py
+
+- `data/waveform.json` (audiowaveform output) is converted once into
+  `data/waveform.bin`, and converted again only when the JSON is newer.
+- The binary file holds the (min, max) sample pairs followed by mip levels:
+  each level halves the previous one, keeping the min of mins and the max of
+  maxes, down to `MIN_LEVEL_LENGTH` pairs.
+- Levels are memory-mapped, nothing is parsed on later loads.
+"""
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+MAGIC = b"LDWF"
+VERSION = 1
+
+# magic, version, bits, levels, length, samples per pixel, sample rate
+HEADER = struct.Struct("<4sHHIIII")
+# Length of each level (in pairs), after the header
+LEVEL_LENGTH = struct.Struct("<I")
+
+# The coarsest level has at most this many pairs
+MIN_LEVEL_LENGTH = 256
+
+
+@dataclass
+class Waveform:
+    # (min, max) pairs of each level, level 0 is the original data
+    levels: list[np.ndarray]
+    bits: int
+    length: int
+    milliseconds: int
+
+    @property
+    def data_range(self) -> int:
+        return 1 << (self.bits - 1)
+
+    def pair_duration(self, level: int) -> float:
+        """Milliseconds covered by one pair of the level"""
+        return self.milliseconds / self.length * (1 << level)
+
+
+def build_levels(pairs: np.ndarray) -> list[np.ndarray]:
+    levels = [pairs]
+
+    while len(levels[-1]) > MIN_LEVEL_LENGTH:
+        prev = levels[-1]
+        if len(prev) % 2 == 1:
+            prev = np.concatenate([prev, prev[-1:]])
+
+        grouped = prev.reshape(-1, 2, 2)
+        level = np.empty((len(grouped), 2), dtype=prev.dtype)
+        level[:, 0] = grouped[:, :, 0].min(axis=1)
+        level[:, 1] = grouped[:, :, 1].max(axis=1)
+        levels.append(level)
+
+    return levels
+
+
+def sample_dtype(bits: int) -> type[np.signedinteger]:
+    return np.int8 if bits == 8 else np.int16
+
+
+def convert_waveform_json(json_path: str, bin_path: str):
+    with open(json_path, "r") as file:
+        waveform_data = json.load(file)
+
+    length: int = waveform_data["length"]
+    bits: int = waveform_data["bits"]
+    samples_per_pixel: int = waveform_data["samples_per_pixel"]
+    sample_rate: int = waveform_data["sample_rate"]
+
+    data = np.asarray(waveform_data["data"][: 2 * length], dtype=sample_dtype(bits))
+    levels = build_levels(data.reshape(-1, 2))
+
+    tmp_path = bin_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                bits,
+                len(levels),
+                length,
+                samples_per_pixel,
+                sample_rate,
+            )
+        )
+        for level in levels:
+            file.write(LEVEL_LENGTH.pack(len(level)))
+        for level in levels:
+            file.write(level.tobytes())
+
+    os.replace(tmp_path, bin_path)
+
+
+def read_waveform_bin(bin_path: str) -> Waveform | None:
+    with open(bin_path, "rb") as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+
+        (
+            magic,
+            version,
+            bits,
+            level_count,
+            length,
+            samples_per_pixel,
+            sample_rate,
+        ) = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            return None
+
+        level_lengths = [
+            LEVEL_LENGTH.unpack(file.read(LEVEL_LENGTH.size))[0]
+            for _ in range(level_count)
+        ]
+
+    dtype = sample_dtype(bits)
+    data = np.memmap(
+        bin_path,
+        dtype=dtype,
+        mode="r",
+        offset=HEADER.size + LEVEL_LENGTH.size * level_count,
+    )
+
+    levels: list[np.ndarray] = []
+    start = 0
+    for level_length in level_lengths:
+        end = start + 2 * level_length
+        levels.append(data[start:end].reshape(-1, 2))
+        start = end
+
+    return Waveform(
+        levels=levels,
+        bits=bits,
+        length=length,
+        milliseconds=int(length * samples_per_pixel / sample_rate * 1000),
+    )
+
+
+def load_waveform(json_path: str) -> Waveform | None:
+    """
+    Load the binary waveform next to `json_path`, converting the JSON first if
+    the binary file is missing or outdated.
+    """
+    bin_path = os.path.splitext(json_path)[0] + ".bin"
+
+    json_exists = os.path.exists(json_path)
+    if not json_exists and not os.path.exists(bin_path):
+        return None
+
+    if json_exists and (
+        not os.path.exists(bin_path)
+        or os.path.getmtime(bin_path) < os.path.getmtime(json_path)
+    ):
+        convert_waveform_json(json_path, bin_path)
+
+    waveform = read_waveform_bin(bin_path)
+    if waveform is None and json_exists:
+        # Written by another version
+        convert_waveform_json(json_path, bin_path)
+        waveform = read_waveform_bin(bin_path)
+
+    return waveform
@@ -13,7 +13,7 @@ from ..core.actions.state.pos_editor import sync_editing_pos_frame_properties
 from ..core.models import EditMode, Editor
 from ..core.states import state
 from ..core.utils.convert import frame_to_time
-from ..core.utils.operator import Debounce
+from ..core.utils.operator import CoalescingScheduler
 
 
 def frame_change_post_body():
@@ -59,7 +59,7 @@ def frame_change_post_body():
             pass
 
 
-debounce = Debounce(frame_change_post_body, 0.3)
+frame_change_scheduler = CoalescingScheduler(0.3)
 
 
 # This won't be triggered when pause animation
@@ -74,7 +74,7 @@ def frame_change_post(scene: bpy.types.Scene):
     if state.playing:
         return
 
-    debounce.trigger()
+    frame_change_scheduler.trigger("frame_change", frame_change_post_body)
 
 
 def mount():
@@ -1,5 +1,3 @@
-import csv
-import os
 from typing import Any, cast
 
 import bpy
@@ -7,11 +5,8 @@ import bpy.path
 import gpu
 from gpu_extras import batch as g_batch
 
-from ..core.config import config
 from ..core.log import logger
 from ..core.states import state
-from ..core.utils.algorithms import largest_range_in_lr
-from ..core.utils.convert import csv_second_to_miliseconds
 from ..core.utils.ui import redraw_area
 
 
@@ -19,7 +14,11 @@ class BeatSettings:
     def __init__(self):
         self.region: bpy.types.Region | None = None
         self.shader: gpu.types.GPUShader | None = None
-        self.batches: list[gpu.types.GPUBatch] = []
+        # Line ends in view space, relative to the region height
+        self.top: float = 0.0
+        # Batch of the beats in view, with their index range
+        self.batch: gpu.types.GPUBatch | None = None
+        self.batch_range: tuple[int, int] = (0, 0)
         self.handle_dope: Any = None
 
 
@@ -30,7 +29,6 @@ def draw():
     global beat_settings
 
     shader = beat_settings.shader
-    batches = beat_settings.batches
     region = beat_settings.region
 
     if shader is None or region is None:
@@ -44,37 +42,32 @@ def draw():
     shader.uniform_float("view_x_mid", x_mid)  # type: ignore
     shader.uniform_float("view_x_scale", x_scale)  # type: ignore
 
-    for batch in batches:
-        batch.draw(shader)
-
+    load_l, load_r = state.dancer_load_frames
+    beat_range = state.beat_index.beat_range(max(x0, load_l), min(x1, load_r))
+    if beat_range[0] >= beat_range[1]:
+        return
 
-def mount():
-    global beat_settings
+    if beat_settings.batch is None or beat_settings.batch_range != beat_range:
+        beat_settings.batch = create_beats_batch(shader, *beat_range)
+        beat_settings.batch_range = beat_range
 
-    # Load beat data
-    beat_path = os.path.join(config.ASSET_PATH, "data/beat.csv")
+    beat_settings.batch.draw(shader)
 
-    with open(beat_path, "r", encoding="utf-8") as file:
-        reader = list(csv.reader(file))  # Convert reader object to list
 
-    # Transpose and flatten (column-wise reading)
-    data = [
-        reader[row][col]
-        for col in range(len(reader[0]))
-        for row in range(1, len(reader))
-        if reader[row][col] != ""
-    ]
+def create_beats_batch(
+    shader: gpu.types.GPUShader, start: int, end: int
+) -> gpu.types.GPUBatch:
+    top = beat_settings.top
+    points: list[tuple[float, float]] = []
+    for x in state.beat_index.beats[start:end]:
+        points.append((x, top * (-0.55)))
+        points.append((x, top * 0.46))
 
-    # Convert to miliseconds
-    data = list(map(csv_second_to_miliseconds, data))
+    return g_batch.batch_for_shader(shader, "LINES", {"position": points})
 
-    frame_range_l, frame_range_r = state.dancer_load_frames
-    filtered_data_start, filtered_data_end = largest_range_in_lr(
-        data, frame_range_l, frame_range_r
-    )
-    filtered_data = data[filtered_data_start : filtered_data_end + 1]
 
-    state.music_beats = filtered_data
+def mount():
+    global beat_settings
 
     # Find timeline region
     screen = cast(bpy.types.Screen, bpy.data.screens["Layout"])
@@ -127,17 +120,9 @@ def mount():
     beat_settings.shader = shader
     beat_settings.region = region
 
-    # Create batches for drawing lines
-    top = region.view2d.region_to_view(0, region.height)[1]
-
-    for x in state.music_beats:
-        points = [
-            (x, top * (-0.55)),
-            (x, top * 0.46),
-        ]
-        batch = g_batch.batch_for_shader(shader, "LINES", {"position": points})
-        if beat_settings.batches is not None:
-            beat_settings.batches.append(batch)
+    # Batches are created for the beats in view when drawing
+    beat_settings.top = region.view2d.region_to_view(0, region.height)[1]
+    beat_settings.batch = None
 
     # Enable handler
     beat_settings.handle_dope = bpy.types.SpaceDopeSheetEditor.draw_handler_add(
@@ -156,6 +141,6 @@ def unmount():
             beat_settings.handle_dope, "WINDOW"
         )
         beat_settings.handle_dope = None
-        beat_settings.batches = []
+        beat_settings.batch = None
 
     redraw_area({"DOPESHEET_EDITOR"})
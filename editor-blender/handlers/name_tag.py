@@ -1,9 +1,10 @@
+import time
 from typing import Any, cast
 
 import blf
 import bpy
 from bpy_extras.view3d_utils import location_3d_to_region_2d
-from mathutils import Vector
+from mathutils import Matrix, Vector
 
 from ..core.log import logger
 from ..core.states import state
@@ -23,18 +24,65 @@ class NameTagSettings:
         self.name_tag_draw: Any = None
         self.region: bpy.types.Region | None = None
 
+        # (name, font size) -> text dimensions
+        self.dimensions: dict[tuple[str, int], tuple[float, float]] = {}
+        # Projection of each name tag, None if off-screen, valid while the view
+        # and the dancer location stay the same
+        self.view_key: tuple[Matrix, int, int, int] | None = None
+        self.locations: dict[str, tuple[float, float, float]] = {}
+        self.positions: dict[str, tuple[float, float] | None] = {}
+
+        self.draw_time_avg: float = 0.0
+        self.draw_time_max: float = 0.0
+
 
 name_tag_settings = NameTagSettings()
 
 
+def text_dimensions(name: str) -> tuple[float, float]:
+    key = (name, name_tag_settings.fontsize)
+    dimensions = name_tag_settings.dimensions.get(key)
+    if dimensions is None:
+        dimensions = cast(
+            tuple[float, float], blf.dimensions(name_tag_settings.font_id, name)
+        )
+        name_tag_settings.dimensions[key] = dimensions
+    return dimensions
+
+
+def project_name_tag(
+    region: bpy.types.Region,
+    region_data: bpy.types.RegionView3D,
+    name: str,
+    location: tuple[float, float, float],
+) -> tuple[float, float] | None:
+    """Bottom-left position of the name tag text, None if it is off-screen"""
+    text_location_3d = Vector(
+        (
+            location[0] + name_tag_settings.x_offset,
+            location[1] + name_tag_settings.y_offset,
+            location[2] + name_tag_settings.z_offset,
+        )
+    )
+    text_view_2d = location_3d_to_region_2d(region, region_data, text_location_3d)
+    if not text_view_2d:
+        return None
+
+    text_w, text_h = text_dimensions(name)
+    x = text_view_2d[0] - text_w / 2
+    y = text_view_2d[1] - text_h / 2
+    if x + text_w < 0 or x > region.width or y + text_h < 0 or y > region.height:
+        return None
+
+    return (x, y)
+
+
 def name_tag_draw():
     global name_tag_settings
 
     if not getattr(get_storage("preferences"), "show_nametag"):
         return
 
-    data_objects = cast(dict[str, bpy.types.Object], bpy.data.objects)
-
     blf.size(name_tag_settings.font_id, name_tag_settings.fontsize)
     blf.color(name_tag_settings.font_id, *name_tag_settings.text_rgba)
     if name_tag_settings.region:
@@ -45,53 +93,64 @@ def name_tag_draw():
     if state.local_view:
         return
 
-    dancer_names = state.dancer_names
-    for name in dancer_names:
+    start_time = time.perf_counter()
+
+    view_key = (
+        region_data.perspective_matrix.copy(),
+        region.width,
+        region.height,
+        name_tag_settings.fontsize,
+    )
+    if view_key != name_tag_settings.view_key:
+        name_tag_settings.view_key = view_key
+        name_tag_settings.locations.clear()
+
+    locations = name_tag_settings.locations
+    positions = name_tag_settings.positions
+
+    for name, (dancer_obj, _) in state.dancer_part_objects_map.items():
         try:
-            dancer_obj = data_objects.get(name)
-            if dancer_obj is None:
-                continue
+            location = cast(tuple[float, float, float], dancer_obj.location.to_tuple())
+            if locations.get(name) != location:
+                locations[name] = location
+                positions[name] = project_name_tag(region, region_data, name, location)
 
-            dancer_location = dancer_obj.location
-            text_location_3d = Vector(
-                (
-                    dancer_location[0] + name_tag_settings.x_offset,
-                    dancer_location[1] + name_tag_settings.y_offset,
-                    dancer_location[2] + name_tag_settings.z_offset,
-                )
-            )
-            text_view_2d = location_3d_to_region_2d(
-                region, region_data, text_location_3d
-            )
-            if not text_view_2d:
+            position = positions[name]
+            if position is None:
                 continue
-            text_w, text_h = cast(
-                tuple[float, float], blf.dimensions(name_tag_settings.font_id, name)
-            )
-            blf.position(
-                name_tag_settings.font_id,
-                text_view_2d[0] - text_w / 2,
-                text_view_2d[1] - text_h / 2,
-                0,
-            )
+
+            blf.position(name_tag_settings.font_id, position[0], position[1], 0)
             blf.draw(name_tag_settings.font_id, name)
 
+        except ReferenceError:
+            # Object removed, the map is rebuilt when objects are set up again
+            continue
+
         except AttributeError:
             logger.exception("Failed to draw name tag")
 
         except TypeError:
             logger.exception("Failed to draw name tag")
 
+    draw_time = time.perf_counter() - start_time
+    name_tag_settings.draw_time_avg = (
+        name_tag_settings.draw_time_avg * 0.95 + draw_time * 0.05
+    )
+    name_tag_settings.draw_time_max = max(name_tag_settings.draw_time_max, draw_time)
+
 
 def name_tag_handler():
     global name_tag_settings
-    if name_tag_settings.name_tag_draw is not None:
+    # Replace this handler with name_tag_draw on the first redraw
+    if name_tag_settings.name_tag_handle is not None:
         bpy.types.SpaceView3D.draw_handler_remove(
             name_tag_settings.name_tag_handle, "WINDOW"
         )
-    name_tag_settings.name_tag_draw = bpy.types.SpaceView3D.draw_handler_add(
-        name_tag_draw, (), "WINDOW", "POST_PIXEL"
-    )
+        name_tag_settings.name_tag_handle = None
+    if name_tag_settings.name_tag_draw is None:
+        name_tag_settings.name_tag_draw = bpy.types.SpaceView3D.draw_handler_add(
+            name_tag_draw, (), "WINDOW", "POST_PIXEL"
+        )
 
 
 def mount():
@@ -123,5 +182,14 @@ def unmount():
                 name_tag_settings.name_tag_handle, "WINDOW"
             )
             name_tag_settings.name_tag_handle = None
+        if name_tag_settings.name_tag_draw is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(
+                name_tag_settings.name_tag_draw, "WINDOW"
+            )
+            name_tag_settings.name_tag_draw = None
     except:
         pass
+
+    name_tag_settings.view_key = None
+    name_tag_settings.locations.clear()
+    name_tag_settings.positions.clear()
@@ -1,3 +1,5 @@
+from typing import Any
+
 import bpy
 
 from ..core.models import EditMode, Editor, SelectedPartType, SelectMode
@@ -13,37 +15,48 @@ from ..properties.ui.types import (
 # TODO: Please make this bullshit cleaner
 
 
+def object_types(obj: bpy.types.Object) -> tuple[str, str]:
+    """(ld_object_type, ld_light_type), from the object index when possible"""
+    item = state.object_index.get(obj.name)
+    if item is not None:
+        return item.object_type, item.light_type
+    return getattr(obj, "ld_object_type"), getattr(obj, "ld_light_type")
+
+
 def is_light(obj: bpy.types.Object) -> bool:
-    return getattr(obj, "ld_object_type") == ObjectType.LIGHT.value
+    return object_types(obj)[0] == ObjectType.LIGHT.value
 
 
 def is_led(obj: bpy.types.Object) -> bool:
-    return (
-        getattr(obj, "ld_object_type") == ObjectType.LIGHT.value
-        and getattr(obj, "ld_light_type") == LightType.LED.value
-    )
+    return object_types(obj) == (ObjectType.LIGHT.value, LightType.LED.value)
 
 
 def is_led_bulb(obj: bpy.types.Object) -> bool:
-    return (
-        getattr(obj, "ld_object_type") == ObjectType.LIGHT.value
-        and getattr(obj, "ld_light_type") == LightType.LED_BULB.value
-    )
+    return object_types(obj) == (ObjectType.LIGHT.value, LightType.LED_BULB.value)
 
 
 def is_fiber(obj: bpy.types.Object) -> bool:
-    return (
-        getattr(obj, "ld_object_type") == ObjectType.LIGHT.value
-        and getattr(obj, "ld_light_type") == LightType.FIBER.value
-    )
+    return object_types(obj) == (ObjectType.LIGHT.value, LightType.FIBER.value)
 
 
 def is_dancer(obj: bpy.types.Object) -> bool:
-    return getattr(obj, "ld_object_type") == ObjectType.DANCER.value
+    return object_types(obj)[0] == ObjectType.DANCER.value
 
 
 def is_human(obj: bpy.types.Object) -> bool:
-    return getattr(obj, "ld_object_type") == ObjectType.HUMAN.value
+    return object_types(obj)[0] == ObjectType.HUMAN.value
+
+
+def relation_group(obj: bpy.types.Object) -> list[bpy.types.Object]:
+    """Objects selected along with a dancer (human) or an LED part (bulbs)"""
+    item = state.object_index.get(obj.name)
+    if item is not None:
+        return item.group
+    if is_led(obj):
+        return list(obj.children)
+    if is_dancer(obj):
+        return [child_obj for child_obj in obj.children if is_human(child_obj)]
+    return []
 
 
 def handle_autoselect_in_control_editor_dancer_mode():
@@ -74,8 +87,7 @@ def handle_autoselect_in_control_editor_dancer_mode():
 
     # Select parent if child is selected
     for obj in context_selected_objects:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-        if ld_object_type == ObjectType.HUMAN.value and not obj.parent.select_get():  # type: ignore
+        if is_human(obj) and not obj.parent.select_get():  # type: ignore
             obj.parent.select_set(True)  # type: ignore
             context_selected_objects.append(obj.parent)  # type: ignore
 
@@ -124,12 +136,9 @@ def handle_autoselect_in_control_editor_dancer_mode():
 
     # Select objects in the same relation group
     for obj in selected_base_objs:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-
-        if ld_object_type == ObjectType.DANCER.value:
-            for child_obj in obj.children:
-                if getattr(child_obj, "ld_object_type") == ObjectType.HUMAN.value:
-                    child_obj.select_set(True)
+        if is_dancer(obj):
+            for child_obj in relation_group(obj):
+                child_obj.select_set(True)
 
     # Activate last selected if current active object is deselected
     if (not active_obj or not active_obj.select_get()) and len(
@@ -178,23 +187,20 @@ def handle_autoselect_in_control_editor_part_mode():
 
     # Select parent if child is selected
     for obj in context_selected_objects:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-        if ld_object_type == ObjectType.HUMAN.value:
+        if is_human(obj):
             if not obj.parent.select_get() and obj.parent != active_obj:  # type: ignore
                 obj.parent.select_set(True)  # type: ignore
                 context_selected_objects.append(obj.parent)  # type: ignore
 
-        else:
-            ld_light_type: str = getattr(obj, "ld_light_type")
-            if ld_light_type == LightType.LED_BULB.value:
-                if (
-                    obj.parent
-                    and not obj.parent.select_get()
-                    and obj.parent != active_obj
-                    and obj.parent["ld_effect"] != 0
-                ):
-                    obj.parent.select_set(True)  # type: ignore
-                    context_selected_objects.append(obj.parent)  # type: ignore
+        elif is_led_bulb(obj):
+            if (
+                obj.parent
+                and not obj.parent.select_get()
+                and obj.parent != active_obj
+                and obj.parent["ld_effect"] != 0
+            ):
+                obj.parent.select_set(True)  # type: ignore
+                context_selected_objects.append(obj.parent)  # type: ignore
 
     # NOTE: At this stage, MIXED_LIGHT is not necessarily mixed light, it can be LED or FIBER
     # This is used to determine objects to be selected
@@ -279,13 +285,9 @@ def handle_autoselect_in_control_editor_part_mode():
 
     # Select objects in the same relation group
     for obj in selected_base_objs:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-        ld_light_type: str = getattr(obj, "ld_light_type")
-
-        if ld_object_type == ObjectType.LIGHT.value:
-            if ld_light_type == LightType.LED.value:
-                for child_obj in obj.children:
-                    child_obj.select_set(True)
+        if is_led(obj):
+            for child_obj in relation_group(obj):
+                child_obj.select_set(True)
 
     # Activate last selected if current active object is deselected
     if (not active_obj or not active_obj.select_get()) and len(
@@ -493,8 +495,7 @@ def handle_autoselect_in_pos_editor():
 
     # Select parent if child is selected
     for obj in context_selected_objects:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-        if ld_object_type == ObjectType.HUMAN.value and not obj.parent.select_get():  # type: ignore
+        if is_human(obj) and not obj.parent.select_get():  # type: ignore
             obj.parent.select_set(True)  # type: ignore
             context_selected_objects.append(obj.parent)  # type: ignore
 
@@ -542,12 +543,9 @@ def handle_autoselect_in_pos_editor():
 
     # Select objects in the same relation group
     for obj in selected_base_objs:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-
-        if ld_object_type == ObjectType.DANCER.value:
-            for child_obj in obj.children:
-                if getattr(child_obj, "ld_object_type") == ObjectType.HUMAN.value:
-                    child_obj.select_set(True)
+        if is_dancer(obj):
+            for child_obj in relation_group(obj):
+                child_obj.select_set(True)
 
     # Activate last selected if current active object is deselected
     if (not active_obj or not active_obj.select_get()) and len(
@@ -587,11 +585,8 @@ def handle_autoselect_in_led_editor_edit_mode():
 
     selected_obj_names: list[str] = []
     for obj in bpy.context.selected_objects:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-        if ld_object_type == ObjectType.LIGHT.value:
-            ld_light_type: str = getattr(obj, "ld_light_type")
-            if ld_light_type == LightType.LED_BULB.value:
-                selected_obj_names.append(obj.name)
+        if is_led_bulb(obj):
+            selected_obj_names.append(obj.name)
 
     state.selected_obj_names = selected_obj_names
 
@@ -656,18 +651,15 @@ def handle_autoselect_in_led_editor():
 
     # Select parent if child is selected
     for obj in context_selected_objects:
-        ld_object_type: str = getattr(obj, "ld_object_type")
-        if ld_object_type == ObjectType.HUMAN.value:
+        if is_human(obj):
             if not obj.parent.select_get():  # type: ignore
                 obj.parent.select_set(True)  # type: ignore
                 context_selected_objects.append(obj.parent)  # type: ignore
 
-        else:
-            ld_light_type: str = getattr(obj, "ld_light_type")
-            if ld_light_type == LightType.LED_BULB.value:
-                if not obj.parent.select_get():  # type: ignore
-                    obj.parent.select_set(True)  # type: ignore
-                    context_selected_objects.append(obj.parent)  # type: ignore
+        elif is_led_bulb(obj):
+            if not obj.parent.select_get():  # type: ignore
+                obj.parent.select_set(True)  # type: ignore
+                context_selected_objects.append(obj.parent)  # type: ignore
 
     # NOTE: At this stage, MIXED_LIGHT is not necessarily mixed light, it can be LED or FIBER
     # This is used to determine objects to be selected
@@ -683,14 +675,8 @@ def handle_autoselect_in_led_editor():
 
     # Select objects in the same relation group
     if active_obj:
-        if is_led(active_obj):
-            for child_obj in active_obj.children:
-                child_obj.select_set(True)
-
-        elif is_dancer(active_obj):
-            for child_obj in active_obj.children:
-                if getattr(child_obj, "ld_object_type") == ObjectType.HUMAN.value:
-                    child_obj.select_set(True)
+        for child_obj in relation_group(active_obj):
+            child_obj.select_set(True)
 
     # Maintain led editor's multi-select status
     if state.selected_obj_type == SelectedPartType.LED:
@@ -707,13 +693,75 @@ def handle_autoselect_in_led_editor():
         ld_ui_led_editor.edit_dancer = getattr(active_obj, "ld_dancer_name")
 
 
+# Number of recently selected dancers remembered
+RECENT_DANCERS_SIZE = 16
+
+
+def track_recent_dancer():
+    if not bpy.context:
+        return
+    active_obj = bpy.context.view_layer.objects.active
+    if not active_obj:
+        return
+
+    dancer_name: str = getattr(active_obj, "ld_dancer_name", "")
+    if not dancer_name:
+        return
+
+    recent_dancers = state.recent_dancers
+    if len(recent_dancers) > 0 and recent_dancers[-1] == dancer_name:
+        return
+    if dancer_name in recent_dancers:
+        recent_dancers.remove(dancer_name)
+    recent_dancers.append(dancer_name)
+    del recent_dancers[:-RECENT_DANCERS_SIZE]
+
+
+# Selection signature after the last run of the autoselect handler
+last_selection_signature: tuple[Any, ...] | None = None
+
+
+def parent_effect(obj: bpy.types.Object) -> Any:
+    return obj.parent.get("ld_effect") if obj.parent else None
+
+
+def selection_signature() -> tuple[Any, ...]:
+    """Everything the autoselect handlers read, except the objects' props"""
+    if not bpy.context:
+        return ()
+
+    view_layer = bpy.context.view_layer
+    active_obj = view_layer.objects.active
+    ld_ui_led_editor: LEDEditorStatusType = getattr(
+        bpy.context.window_manager, "ld_ui_led_editor"
+    )
+
+    return (
+        state.editor,
+        state.selection_mode,
+        state.edit_state,
+        state.selected_obj_type,
+        ld_ui_led_editor.edit_mode,
+        (active_obj.name, parent_effect(active_obj)) if active_obj else None,
+        tuple(
+            (obj.name, parent_effect(obj))
+            for obj in view_layer.objects.selected  # type: ignore
+        ),
+    )
+
+
 def obj_panel_autoselect_handler(scene: bpy.types.Scene):
     """
     Auto-select a group of lights if one of each is selected.
     When a human object is selected, its dancer will also be auto-selected and vice versa.
+    Skipped when the selection has not changed since the last run.
     """
-    # if bpy.context.object is None:  # type: ignore
-    #     return
+    global last_selection_signature
+
+    if not bpy.context:
+        return
+    if selection_signature() == last_selection_signature:
+        return
 
     match state.editor:
         case Editor.CONTROL_EDITOR:
@@ -723,13 +771,21 @@ def obj_panel_autoselect_handler(scene: bpy.types.Scene):
         case Editor.LED_EDITOR:
             handle_autoselect_in_led_editor()
 
+    track_recent_dancer()
+
+    # The handlers change the selection themselves
+    last_selection_signature = selection_signature()
+
 
 def mount():
     bpy.app.handlers.depsgraph_update_pre.append(obj_panel_autoselect_handler)
 
 
 def unmount():
+    global last_selection_signature
+
     try:
         bpy.app.handlers.depsgraph_update_pre.remove(obj_panel_autoselect_handler)
     except:
         pass
+    last_selection_signature = None
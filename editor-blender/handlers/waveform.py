@@ -1,18 +1,24 @@
-import json
 import os
 from typing import Any, cast
 
 import bpy
 import bpy.path
 import gpu
+import numpy as np
 from gpu_extras import batch as g_batch
 
 from ..core.config import config
 from ..core.log import logger
 from ..core.states import state
 from ..core.utils.ui import redraw_area
+from ..core.utils.waveform import Waveform, load_waveform
 from ..storage import get_storage
 
+# Pairs per GPU batch, only batches in the visible range are drawn
+CHUNK_LENGTH = 4096
+# Finest level drawn has at most this many pairs per pixel
+PAIRS_PER_PIXEL = 1
+
 
 class WaveformSettings:
     def __init__(self):
@@ -20,7 +26,10 @@ class WaveformSettings:
         self.bottom_offset: int = 0
         self.region: bpy.types.Region | None = None
         self.shader: gpu.types.GPUShader | None = None
-        self.batch: gpu.types.GPUBatch | None = None
+        self.waveform: Waveform | None = None
+        # (level, chunk) -> batch, None if the chunk is outside the loaded range
+        self.batches: dict[tuple[int, int], gpu.types.GPUBatch | None] = {}
+        self.load_frames: tuple[int, int] = (0, 0)
         self.handle_dope: Any = None
 
 
@@ -31,10 +40,10 @@ def draw():
     global waveform_settings
 
     shader = waveform_settings.shader
-    batch = waveform_settings.batch
+    waveform = waveform_settings.waveform
     region = waveform_settings.region
 
-    if shader is None or batch is None or region is None:
+    if shader is None or waveform is None or region is None:
         return
 
     if getattr(get_storage("preferences"), "show_waveform") is False:
@@ -63,7 +72,69 @@ def draw():
     shader.uniform_float("view_y_mid", y_mid)  # type: ignore
     shader.uniform_float("view_y_scale", y_scale)  # type: ignore
 
-    batch.draw(shader)
+    if waveform_settings.load_frames != state.dancer_load_frames:
+        waveform_settings.load_frames = state.dancer_load_frames
+        waveform_settings.batches.clear()
+
+    level = select_level(waveform, x1 - x0, region.width)
+    pair_duration = waveform.pair_duration(level)
+    level_length = len(waveform.levels[level])
+
+    load_l, load_r = waveform_settings.load_frames
+    view_l, view_r = max(x0, load_l, 0), min(x1, load_r)
+    if view_l > view_r or level_length == 0:
+        return
+
+    first_chunk = int(view_l / pair_duration) // CHUNK_LENGTH
+    last_chunk = min(int(view_r / pair_duration), level_length - 1) // CHUNK_LENGTH
+
+    for chunk in range(first_chunk, last_chunk + 1):
+        key = (level, chunk)
+        if key not in waveform_settings.batches:
+            waveform_settings.batches[key] = create_chunk_batch(
+                shader, waveform, level, chunk
+            )
+
+        batch = waveform_settings.batches[key]
+        if batch is not None:
+            batch.draw(shader)
+
+
+def select_level(waveform: Waveform, view_width: float, region_width: int) -> int:
+    """Finest level with at most PAIRS_PER_PIXEL pairs per pixel in view"""
+    max_pairs = max(region_width, 1) * PAIRS_PER_PIXEL
+    pairs = view_width / waveform.pair_duration(0)
+
+    level = 0
+    while level + 1 < len(waveform.levels) and pairs > max_pairs:
+        pairs /= 2
+        level += 1
+
+    return level
+
+
+def create_chunk_batch(
+    shader: gpu.types.GPUShader, waveform: Waveform, level: int, chunk: int
+) -> gpu.types.GPUBatch | None:
+    """
+    Line strip through the min and max of each pair in the chunk, clipped to
+    the loaded frames. The first pair of the next chunk is included so chunks
+    connect.
+    """
+    start = chunk * CHUNK_LENGTH
+    pairs = waveform.levels[level][start : start + CHUNK_LENGTH + 1]
+
+    pair_duration = waveform.pair_duration(level)
+    x = (start + np.arange(2 * len(pairs), dtype=np.float32) / 2) * pair_duration
+    y = pairs.reshape(-1).astype(np.float32) / waveform.data_range
+
+    load_l, load_r = waveform_settings.load_frames
+    mask = (x >= load_l) & (x <= load_r)
+    if np.count_nonzero(mask) < 2:
+        return None
+
+    point_coords = np.column_stack((x[mask], y[mask]))
+    return g_batch.batch_for_shader(shader, "LINE_STRIP", {"position": point_coords})
 
 
 def mount():
@@ -73,28 +144,14 @@ def mount():
     waveform_path = os.path.join(config.ASSET_PATH, "data/waveform.json")
 
     try:
-        waveform_file = open(waveform_path, "r")
-    except FileNotFoundError:
-        logger.error(f"Waveform file not found: {waveform_path}")
+        waveform = load_waveform(waveform_path)
+    except Exception:
+        logger.exception(f"Failed to load waveform: {waveform_path}")
         return
 
-    waveform_data = json.load(waveform_file)
-
-    data: list[int] = waveform_data["data"]
-    length: int = waveform_data["length"]
-    wave_bits: int = waveform_data["bits"]
-
-    samples_per_pixel: int = waveform_data["samples_per_pixel"]
-    sample_rate: int = waveform_data["sample_rate"]
-    milliseconds = int(length * samples_per_pixel / sample_rate * 1000)
-
-    data_range = 1 << (wave_bits - 1)
-    frame_range_l, frame_range_r = state.dancer_load_frames
-    point_coords = [
-        (milliseconds * pos / (2 * length), val / data_range)
-        for pos, val in enumerate(data)
-        if pos >= 2 * frame_range_l and pos <= 2 * frame_range_r
-    ]
+    if waveform is None:
+        logger.error(f"Waveform file not found: {waveform_path}")
+        return
 
     # Find timeline region
     screen = cast(bpy.types.Screen, bpy.data.screens["Layout"])
@@ -162,13 +219,14 @@ def mount():
     )
 
     shader = gpu.shader.create_from_info(shader_info)
-    batch = g_batch.batch_for_shader(shader, "LINE_STRIP", {"position": point_coords})
 
     del vert_out
     del shader_info
 
     waveform_settings.shader = shader
-    waveform_settings.batch = batch
+    waveform_settings.waveform = waveform
+    waveform_settings.batches.clear()
+    waveform_settings.load_frames = state.dancer_load_frames
     waveform_settings.region = region
 
     # Enable handler
@@ -190,4 +248,8 @@ def unmount():
         )
         waveform_settings.handle_dope = None
 
+    # Release the memory map and GPU batches
+    waveform_settings.waveform = None
+    waveform_settings.batches.clear()
+
     redraw_area({"DOPESHEET_EDITOR"})
@@ -0,0 +1,7 @@
+"""
+Local stand-ins for editor-server and controller-server.
+
+These modules are development tools for load and latency testing of the
+add-on. They only depend on aiohttp, websockets and graphql-core, never on
+bpy, and are excluded from the bundled add-on.
+"""
@@ -0,0 +1,342 @@
+"""
+Mock controller-server for load and latency testing.
+
+Speaks the same websocket protocol as controller-server to the control
+panel: answers `boardInfo` with the board table, answers a command once per
+connected interface of every dancer, with a `command` response echoing what
+the RPis run as real boards do, after a simulated RPi round trip, and pushes `boardInfo` storms at the scenario rate. `time` requests are answered
+from a clock shifted by `--clock-offset-ms`.
+
+Usage (from editor-blender/):
+
+    python -m mock.controller_server --dancers 30 --rate 10 \\
+        --rpi-latency-ms 40 --rpi-jitter-ms 30 --fail-rate 0.05
+
+Counters are printed every `--report` seconds.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from websockets.server import WebSocketServerProtocol, serve
+
+from .faults import DelayedSender, Scenario, run_scenario
+
+
+@dataclass
+class Board:
+    dancer: str
+    hostname: str
+    ethernet_MAC: str
+    wifi_MAC: str
+    IP: str
+    ethernet_connected: bool = True
+    wifi_connected: bool = False
+    # Fixed per board so that slow boards stay slow
+    latency_offset_ms: float = 0.0
+
+
+@dataclass
+class Stats:
+    connections: int = 0
+    commands_received: int = 0
+    responses_sent: int = 0
+    board_info_sent: int = 0
+    disconnects: int = 0
+    topics: dict[str, int] = field(default_factory=dict)
+
+
+# Colors of the test topics, as controller-server sends them to `parttest`
+TEST_COLORS = {
+    "red": "ff0000",
+    "green": "00ff00",
+    "blue": "0000ff",
+    "yellow": "ffff00",
+    "magenta": "ff00ff",
+    "cyan": "00ffff",
+}
+
+
+def rpi_command(topic: str, payload: dict[str, Any]) -> str:
+    """What controller-server runs on the RPis, which they echo in replies"""
+    match topic:
+        case "play":
+            start = round(payload.get("start", 0) / 1000)
+            timestamp = round(payload.get("timestamp", 0))
+            return f"playerctl play {start} -d {timestamp}"
+        case "pause" | "stop":
+            return f"playerctl {topic}"
+        case "reboot":
+            return "restart"
+        case "webShell":
+            return payload.get("command", "")
+        case "test":
+            color = str(payload.get("colorCode", "")).lstrip("#")
+            return f"parttest --hex {color} -a 200"
+        case "darkAll":
+            return "parttest --hex 000000 -a 0"
+        case _ if topic in TEST_COLORS:
+            return f"parttest --hex {TEST_COLORS[topic]} -a 200"
+        case _:
+            return topic
+
+
+def generate_boards(dancer_count: int, rng: random.Random) -> list[Board]:
+    boards: list[Board] = []
+    for index in range(dancer_count):
+        boards.append(
+            Board(
+                dancer=f"{index}_dancer",
+                hostname=f"lightdance-{index + 1:02d}",
+                ethernet_MAC=f"B8:27:EB:00:{index // 256:02X}:{index % 256:02X}",
+                wifi_MAC=f"B8:27:EB:01:{index // 256:02X}:{index % 256:02X}",
+                IP=f"192.168.0.{index + 10}",
+                latency_offset_ms=rng.expovariate(1 / 20),
+            )
+        )
+    return boards
+
+
+class MockControllerServer:
+    def __init__(
+        self,
+        boards: list[Board],
+        scenario: Scenario,
+        rpi_latency_ms: float,
+        rpi_jitter_ms: float,
+        fail_rate: float,
+        drop_rate: float,
+        seed: int,
+        clock_offset_ms: float = 0.0,
+    ):
+        self.boards = dict((board.dancer, board) for board in boards)
+        self.scenario = scenario
+        self.rpi_latency_ms = rpi_latency_ms
+        self.rpi_jitter_ms = rpi_jitter_ms
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.clock_offset_ms = clock_offset_ms
+
+        self.clients: dict[WebSocketServerProtocol, DelayedSender] = {}
+        self.stats = Stats()
+
+    def board_info(self) -> str:
+        payload: dict[str, Any] = {}
+        for board in self.boards.values():
+            for interface, MAC, connected in (
+                ("ethernet", board.ethernet_MAC, board.ethernet_connected),
+                ("wifi", board.wifi_MAC, board.wifi_connected),
+            ):
+                payload[MAC] = {
+                    "IP": board.IP,
+                    "MAC": MAC,
+                    "dancer": board.dancer,
+                    "hostname": board.hostname,
+                    "connected": connected,
+                    "interface": interface,
+                }
+
+        return json.dumps(
+            {
+                "from": "server",
+                "topic": "boardInfo",
+                "statusCode": 0,
+                "payload": payload,
+            }
+        )
+
+    def broadcast(self, message: str) -> None:
+        for sender in self.clients.values():
+            sender.push(message)
+
+    async def emit_board_info(self) -> None:
+        """Simulate a board reconnecting."""
+        board = self.rng.choice(list(self.boards.values()))
+        board.ethernet_connected = not board.ethernet_connected
+        self.broadcast(self.board_info())
+        self.stats.board_info_sent += len(self.clients)
+
+    async def disconnect_all(self) -> None:
+        self.stats.disconnects += 1
+        for ws in list(self.clients.keys()):
+            await ws.close()
+
+    def now_ms(self) -> float:
+        return time.time() * 1000 + self.clock_offset_ms
+
+    def time_response(self, t0: float, t1: float) -> str:
+        return json.dumps(
+            {
+                "from": "server",
+                "topic": "time",
+                "statusCode": 0,
+                "payload": {"t0": t0, "t1": t1, "t2": self.now_ms()},
+            }
+        )
+
+    async def respond(self, sender: DelayedSender, command: str, dancer: str) -> None:
+        board = self.boards.get(dancer)
+        if board is None:
+            return
+
+        delay_ms = (
+            self.rpi_latency_ms
+            + board.latency_offset_ms
+            + self.rng.uniform(-self.rpi_jitter_ms, self.rpi_jitter_ms)
+        )
+        await asyncio.sleep(max(delay_ms, 0.0) / 1000.0)
+
+        if self.rng.random() < self.drop_rate:
+            return
+
+        failed = self.rng.random() < self.fail_rate
+        response = {
+            "from": "server",
+            "topic": "command",
+            "statusCode": -1 if failed else 0,
+            "payload": {
+                "command": command,
+                "message": "mock failure" if failed else "success",
+                "dancer": dancer,
+            },
+        }
+        sender.push(json.dumps(response))
+        self.stats.responses_sent += 1
+
+    async def handle(self, ws: WebSocketServerProtocol) -> None:
+        if self.scenario.is_down:
+            await ws.close()
+            return
+
+        sender = DelayedSender(self.scenario, ws.send)
+        self.clients[ws] = sender
+        self.stats.connections += 1
+
+        try:
+            async for raw in ws:
+                received_ms = self.now_ms()
+                msg = json.loads(raw)
+                topic = msg.get("topic")
+                self.stats.commands_received += 1
+                self.stats.topics[topic] = self.stats.topics.get(topic, 0) + 1
+
+                if topic == "boardInfo":
+                    sender.push(self.board_info())
+                    self.stats.board_info_sent += 1
+                    continue
+
+                if topic == "time":
+                    sender.push(self.time_response(msg["payload"]["t0"], received_ms))
+                    continue
+
+                payload: dict[str, Any] = msg.get("payload") or {}
+                command = rpi_command(topic, payload)
+                dancers: list[str] = payload.get("dancers", list(self.boards.keys()))
+                for dancer in dancers:
+                    board = self.boards.get(dancer)
+                    if board is None:
+                        continue
+                    # Sent to, and answered by, every connected interface
+                    for connected in (board.ethernet_connected, board.wifi_connected):
+                        if connected:
+                            asyncio.ensure_future(self.respond(sender, command, dancer))
+
+        except Exception:
+            pass
+
+        finally:
+            sender.close()
+            del self.clients[ws]
+
+    async def report(self, interval: float) -> None:
+        last = time.perf_counter()
+        last_responses = 0
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            rate = (self.stats.responses_sent - last_responses) / (now - last)
+            last, last_responses = now, self.stats.responses_sent
+            print(f"{self.stats} responses/s={rate:.1f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--dancers", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="boardInfo pushes per second"
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--disconnect-every", type=float, default=0.0, help="Seconds, 0 to disable"
+    )
+    parser.add_argument("--downtime", type=float, default=1.0, help="Seconds")
+    parser.add_argument("--scenario", help="JSON scenario file, overrides the above")
+
+    parser.add_argument("--rpi-latency-ms", type=float, default=20.0)
+    parser.add_argument("--rpi-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="Commands never answered"
+    )
+    parser.add_argument(
+        "--clock-offset-ms", type=float, default=0.0, help="Server clock - local"
+    )
+    parser.add_argument("--report", type=float, default=0.0, help="Seconds")
+
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    if args.scenario:
+        scenario = Scenario.from_file(args.scenario)
+    else:
+        scenario = Scenario.constant(
+            rate=args.rate,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            disconnect_every=args.disconnect_every,
+            downtime=args.downtime,
+        )
+
+    server = MockControllerServer(
+        generate_boards(args.dancers, random.Random(args.seed)),
+        scenario,
+        rpi_latency_ms=args.rpi_latency_ms,
+        rpi_jitter_ms=args.rpi_jitter_ms,
+        fail_rate=args.fail_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+        clock_offset_ms=args.clock_offset_ms,
+    )
+
+    tasks = [
+        asyncio.ensure_future(
+            run_scenario(scenario, server.emit_board_info, server.disconnect_all)
+        )
+    ]
+    if args.report > 0:
+        tasks.append(asyncio.ensure_future(server.report(args.report)))
+
+    async with serve(server.handle, args.host, args.port):
+        print(f"Mock controller-server listening on ws://{args.host}:{args.port}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
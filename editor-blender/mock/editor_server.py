@@ -0,0 +1,530 @@
+"""
+Mock editor-server (and file-server) for load and latency testing.
+
+Serves the REST routes, GraphQL queries and mutations over HTTP and the
+GraphQL subscriptions over the `graphql-ws` websocket protocol that the
+add-on uses, backed by a synthetic show from `mock.show`.
+
+Usage (from editor-blender/):
+
+    python -m mock.editor_server --dancers 30 --control-frames 5000 \\
+        --rate 20 --latency-ms 50 --jitter-ms 20 --disconnect-every 30
+
+Counters are available at `GET /mock/stats`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import WSMsgType, web
+from graphql import FieldNode, OperationDefinitionNode, parse, value_from_ast_untyped
+
+from .faults import DelayedSender, Scenario, run_scenario
+from .show import MockShow, generate_show
+
+GRAPHQL_WS_SUBPROTOCOL = "graphql-ws"
+
+Resolver = Callable[[dict[str, Any]], Any]
+
+
+@dataclass
+class Operation:
+    type: str
+    root_field: str
+    arguments: dict[str, Any]
+
+
+@dataclass(eq=False)
+class Subscriber:
+    sender: DelayedSender
+    ws: web.WebSocketResponse
+    # Subscription id of the client for each root field
+    subscriptions: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Stats:
+    http_requests: int = 0
+    graphql_operations: dict[str, int] = field(default_factory=dict)
+    events_published: int = 0
+    messages_sent: int = 0
+    ws_connections: int = 0
+    disconnects: int = 0
+
+
+_document_cache: dict[str, OperationDefinitionNode] = {}
+
+
+def parse_operation(query: str, variables: dict[str, Any]) -> Operation:
+    definition = _document_cache.get(query)
+    if definition is None:
+        document = parse(query)
+        definition = next(
+            node
+            for node in document.definitions
+            if isinstance(node, OperationDefinitionNode)
+        )
+        _document_cache[query] = definition
+
+    root = definition.selection_set.selections[0]
+    if not isinstance(root, FieldNode):
+        raise ValueError("Fragments on root fields are not supported")
+
+    arguments = {
+        argument.name.value: value_from_ast_untyped(argument.value, variables)
+        for argument in root.arguments or ()
+    }
+
+    return Operation(
+        type=definition.operation.value,
+        root_field=root.name.value,
+        arguments=arguments,
+    )
+
+
+class MockEditorServer:
+    def __init__(self, show: MockShow, scenario: Scenario, events: list[str]):
+        self.show = show
+        self.scenario = scenario
+        self.events = events
+        self.subscribers: set[Subscriber] = set()
+        self.stats = Stats()
+
+        self.queries: dict[str, Resolver] = {
+            "models": lambda _: self.show.models,
+            "dancers": lambda _: self.show.dancers,
+            "colorMap": lambda _: {"colorMap": self.show.color_map},
+            "LEDMap": lambda _: {"LEDMap": self.show.led_map},
+            "ControlMap": self.query_control_map,
+            "PosMap": self.query_pos_map,
+            "controlFrameIDs": lambda _: self.show.control_record,
+            "positionFrameIDs": lambda _: self.show.pos_record,
+            "effectList": lambda _: [],
+        }
+        self.mutations: dict[str, Resolver] = {
+            "editControlMap": self.edit_control_map,
+            "addControlFrame": self.add_control_frame,
+            "deleteControlFrame": self.delete_control_frame,
+            "editControlFrame": self.edit_control_frame_time,
+            "editPosMap": self.edit_pos_map,
+            "addPositionFrame": self.add_pos_frame,
+            "deletePositionFrame": self.delete_pos_frame,
+            "editPositionFrame": self.edit_pos_frame_time,
+        }
+
+    """
+    Queries
+    """
+
+    def query_control_map(self, arguments: dict[str, Any]) -> Any:
+        frame_ids = (arguments.get("select") or {}).get("frameIds")
+        if frame_ids is None:
+            frame_ids = list(self.show.control_map.keys())
+        return {
+            "frameIds": {
+                id: self.show.control_map[id]
+                for id in frame_ids
+                if id in self.show.control_map
+            }
+        }
+
+    def query_pos_map(self, arguments: dict[str, Any]) -> Any:
+        frame_ids = (arguments.get("select") or {}).get("frameIds")
+        if frame_ids is None:
+            frame_ids = list(self.show.pos_map.keys())
+        return {
+            "frameIds": {
+                id: self.show.pos_map[id] for id in frame_ids if id in self.show.pos_map
+            }
+        }
+
+    """
+    Mutations
+    """
+
+    def edit_control_map(self, arguments: dict[str, Any]) -> Any:
+        input = arguments["input"]
+        frame = self.show.control_map[input["frameId"]]
+        frame["status"] = input["controlData"]
+        frame["led_status"] = input["ledBulbData"]
+        if input.get("fade") is not None:
+            frame["fade"] = input["fade"]
+        self.show.bump_rev(frame)
+        self.publish_control(update={input["frameId"]: frame})
+        return "ok"
+
+    def add_control_frame(self, arguments: dict[str, Any]) -> Any:
+        id = self.show.new_id()
+        frame = {
+            "start": arguments["start"],
+            "fade": arguments.get("fade") or False,
+            "rev": {"meta": 0, "data": 0},
+            "status": arguments["controlData"],
+            "led_status": arguments["ledControlData"],
+        }
+        self.show.control_map[id] = frame
+        self.publish_control(create={id: frame})
+        return str(id)
+
+    def delete_control_frame(self, arguments: dict[str, Any]) -> Any:
+        id = arguments["input"]["frameID"]
+        self.show.control_map.pop(id, None)
+        self.publish_control(delete=[id])
+        return "ok"
+
+    def edit_control_frame_time(self, arguments: dict[str, Any]) -> Any:
+        input = arguments["input"]
+        frame = self.show.control_map[input["frameId"]]
+        frame["start"] = input["start"]
+        self.show.bump_rev(frame, meta=True)
+        self.publish_control(update={input["frameId"]: frame})
+        return "ok"
+
+    def edit_pos_map(self, arguments: dict[str, Any]) -> Any:
+        input = arguments["input"]
+        frame = self.show.pos_map[input["frameId"]]
+        frame["location"] = [data[:3] for data in input["positionData"]]
+        frame["rotation"] = [
+            data[3:6] if len(data) >= 6 else [0.0, 0.0, 0.0]
+            for data in input["positionData"]
+        ]
+        self.show.bump_rev(frame)
+        self.publish_pos(update={input["frameId"]: frame})
+        return {"frameIds": [input["frameId"]]}
+
+    def add_pos_frame(self, arguments: dict[str, Any]) -> Any:
+        id = self.show.new_id()
+        frame = self.show.random_pos_frame(arguments["start"])
+        if arguments.get("positionData"):
+            frame["location"] = [data[:3] for data in arguments["positionData"]]
+        self.show.pos_map[id] = frame
+        self.publish_pos(create={id: frame})
+        return {"id": id}
+
+    def delete_pos_frame(self, arguments: dict[str, Any]) -> Any:
+        id = arguments["input"]["frameID"]
+        frame = self.show.pos_map.pop(id, None)
+        self.publish_pos(delete=[id])
+        return {"id": id, "start": frame["start"] if frame else 0}
+
+    def edit_pos_frame_time(self, arguments: dict[str, Any]) -> Any:
+        input = arguments["input"]
+        frame = self.show.pos_map[input["frameId"]]
+        frame["start"] = input["start"]
+        self.show.bump_rev(frame, meta=True)
+        self.publish_pos(update={input["frameId"]: frame})
+        return {"id": input["frameId"], "start": input["start"]}
+
+    """
+    Subscriptions
+    """
+
+    def publish(self, root_field: str, data: Any) -> None:
+        self.stats.events_published += 1
+        for subscriber in self.subscribers:
+            sub_id = subscriber.subscriptions.get(root_field)
+            if sub_id is None:
+                continue
+            message = {
+                "type": "data",
+                "id": sub_id,
+                "payload": {"data": {root_field: data}},
+            }
+            subscriber.sender.push(json.dumps(message))
+            self.stats.messages_sent += 1
+
+    def publish_control(
+        self,
+        create: dict[int, Any] | None = None,
+        update: dict[int, Any] | None = None,
+        delete: list[int] | None = None,
+    ) -> None:
+        self.publish(
+            "controlMapSubscription",
+            {
+                "frame": {
+                    "createFrames": create or {},
+                    "updateFrames": update or {},
+                    "deleteFrames": delete or [],
+                },
+                "editBy": 0,
+            },
+        )
+
+    def publish_pos(
+        self,
+        create: dict[int, Any] | None = None,
+        update: dict[int, Any] | None = None,
+        delete: list[int] | None = None,
+    ) -> None:
+        self.publish(
+            "positionMapSubscription",
+            {
+                "frame": {
+                    "createFrames": create or {},
+                    "updateFrames": update or {},
+                    "deleteFrames": delete or [],
+                },
+                "editBy": 0,
+            },
+        )
+
+    async def emit_random_event(self) -> None:
+        """Simulate another user editing a random frame."""
+        event = self.show.rng.choice(self.events)
+        match event:
+            case "control" if self.show.control_map:
+                id = self.show.rng.choice(list(self.show.control_map.keys()))
+                old_frame = self.show.control_map[id]
+                frame = self.show.random_control_frame(old_frame["start"])
+                frame["rev"] = old_frame["rev"]
+                self.show.bump_rev(frame)
+                self.show.control_map[id] = frame
+                self.publish_control(update={id: frame})
+            case "pos" if self.show.pos_map:
+                id = self.show.rng.choice(list(self.show.pos_map.keys()))
+                old_frame = self.show.pos_map[id]
+                frame = self.show.random_pos_frame(old_frame["start"])
+                frame["rev"] = old_frame["rev"]
+                self.show.bump_rev(frame)
+                self.show.pos_map[id] = frame
+                self.publish_pos(update={id: frame})
+            case _:
+                pass
+
+    async def disconnect_all(self) -> None:
+        self.stats.disconnects += 1
+        for subscriber in list(self.subscribers):
+            await subscriber.ws.close()
+
+    """
+    Handlers
+    """
+
+    @web.middleware
+    async def fault_middleware(
+        self, request: web.Request, handler: Callable[..., Any]
+    ) -> web.StreamResponse:
+        if request.path.startswith("/mock"):
+            return await handler(request)
+        if self.scenario.is_down:
+            raise web.HTTPServiceUnavailable()
+
+        self.stats.http_requests += 1
+        await self.scenario.delay()
+        return await handler(request)
+
+    async def handle_ping(self, request: web.Request) -> web.Response:
+        return web.json_response({"uuid": str(uuid.uuid4())})
+
+    async def handle_token(self, request: web.Request) -> web.Response:
+        return web.json_response({"token": "mock-token"})
+
+    async def handle_logout(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                **self.stats.__dict__,
+                "subscribers": len(self.subscribers),
+                "phase": self.scenario.current[0],
+            }
+        )
+
+    async def handle_graphql(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        try:
+            operation = parse_operation(body["query"], body.get("variables") or {})
+            counts = self.stats.graphql_operations
+            counts[operation.root_field] = counts.get(operation.root_field, 0) + 1
+
+            resolvers = self.queries if operation.type == "query" else self.mutations
+            resolver = resolvers.get(operation.root_field)
+            if resolver is None:
+                # Generic acknowledgement for edit locks and other mutations
+                data: Any = {"ok": True, "msg": "mock", "editing": None}
+            else:
+                data = resolver(operation.arguments)
+
+            return web.json_response({"data": {operation.root_field: data}})
+
+        except Exception as err:
+            return web.json_response({"data": None, "errors": [{"message": str(err)}]})
+
+    async def handle_graphql_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(protocols=[GRAPHQL_WS_SUBPROTOCOL], heartbeat=10)
+        await ws.prepare(request)
+
+        if self.scenario.is_down:
+            await ws.close()
+            return ws
+
+        subscriber = Subscriber(sender=DelayedSender(self.scenario, ws.send_str), ws=ws)
+        self.subscribers.add(subscriber)
+        self.stats.ws_connections += 1
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+
+                data = json.loads(msg.data)
+                match data.get("type"):
+                    case "connection_init":
+                        await ws.send_str(json.dumps({"type": "connection_ack"}))
+                    case "start":
+                        payload = data["payload"]
+                        operation = parse_operation(
+                            payload["query"], payload.get("variables") or {}
+                        )
+                        subscriber.subscriptions[operation.root_field] = data["id"]
+                    case "stop":
+                        subscriber.subscriptions = {
+                            root_field: sub_id
+                            for root_field, sub_id in subscriber.subscriptions.items()
+                            if sub_id != data["id"]
+                        }
+                    case "connection_terminate":
+                        break
+                    case _:
+                        pass
+
+        finally:
+            subscriber.sender.close()
+            self.subscribers.discard(subscriber)
+
+        return ws
+
+    def create_app(self, http_path: str, graphql_path: str, ws_path: str):
+        app = web.Application(middlewares=[self.fault_middleware])
+        app.router.add_get(f"/{http_path}/ping", self.handle_ping)
+        app.router.add_get(f"/{http_path}/checkToken", self.handle_token)
+        app.router.add_post(f"/{http_path}/login", self.handle_token)
+        app.router.add_post(f"/{http_path}/logout", self.handle_logout)
+        app.router.add_post(f"/{graphql_path}", self.handle_graphql)
+        app.router.add_get(f"/{ws_path}", self.handle_graphql_ws)
+        app.router.add_get("/mock/stats", self.handle_stats)
+
+        async def start_scenario(app: web.Application):
+            app["scenario_task"] = asyncio.ensure_future(
+                run_scenario(self.scenario, self.emit_random_event, self.disconnect_all)
+            )
+
+        async def stop_scenario(app: web.Application):
+            app["scenario_task"].cancel()
+
+        app.on_startup.append(start_scenario)
+        app.on_cleanup.append(stop_scenario)
+
+        return app
+
+
+def create_file_app(root: str, scenario: Scenario) -> web.Application:
+    """Static file server standing in for file-server."""
+
+    @web.middleware
+    async def latency_middleware(
+        request: web.Request, handler: Callable[..., Any]
+    ) -> web.StreamResponse:
+        if scenario.is_down:
+            raise web.HTTPServiceUnavailable()
+        await scenario.delay()
+        return await handler(request)
+
+    app = web.Application(middlewares=[latency_middleware])
+    app.router.add_static("/", root)
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    files_dir = os.path.normpath(os.path.join(current_dir, "..", "..", "files"))
+
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--file-port", type=int, default=8081)
+    parser.add_argument("--files", default=files_dir, help="Root of served assets")
+    parser.add_argument("--http-path", default="api")
+    parser.add_argument("--graphql-path", default="graphql")
+    parser.add_argument("--graphql-ws-path", default="graphql-websocket")
+
+    parser.add_argument("--dancers", type=int, default=10)
+    parser.add_argument("--control-frames", type=int, default=1000)
+    parser.add_argument("--pos-frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+
+    parser.add_argument("--rate", type=float, default=0.0, help="Events per second")
+    parser.add_argument(
+        "--events", default="control,pos", help="Comma separated: control,pos"
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--disconnect-every", type=float, default=0.0, help="Seconds, 0 to disable"
+    )
+    parser.add_argument("--downtime", type=float, default=1.0, help="Seconds")
+    parser.add_argument("--scenario", help="JSON scenario file, overrides the above")
+
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    if args.scenario:
+        scenario = Scenario.from_file(args.scenario)
+    else:
+        scenario = Scenario.constant(
+            rate=args.rate,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            disconnect_every=args.disconnect_every,
+            downtime=args.downtime,
+        )
+
+    start_time = time.perf_counter()
+    show = generate_show(
+        dancer_count=args.dancers,
+        control_frames=args.control_frames,
+        pos_frames=args.pos_frames,
+        seed=args.seed,
+    )
+    print(f"Generated show in {time.perf_counter() - start_time:.2f}s")
+
+    server = MockEditorServer(show, scenario, args.events.split(","))
+    app = server.create_app(args.http_path, args.graphql_path, args.graphql_ws_path)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"Mock editor-server listening on http://{args.host}:{args.port}")
+
+    file_runner: web.AppRunner | None = None
+    if os.path.isdir(args.files):
+        file_runner = web.AppRunner(create_file_app(args.files, scenario))
+        await file_runner.setup()
+        await web.TCPSite(file_runner, args.host, args.file_port).start()
+        print(f"Mock file-server listening on http://{args.host}:{args.file_port}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        if file_runner is not None:
+            await file_runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,183 @@
+"""
+Scriptable event rates, injected latency and disconnects for the mock servers.
+
+A scenario is a list of phases, each lasting `duration` seconds, played in a
+loop. It can be built from command line options or loaded from a JSON file:
+
+    {
+        "seed": 0,
+        "phases": [
+            {"duration": 10, "rate": 5},
+            {"duration": 5, "rate": 50, "latency_ms": 200, "jitter_ms": 50},
+            {"duration": 2, "down": true}
+        ]
+    }
+
+Entering a `down` phase closes every open connection, and connections made
+while it lasts are closed right away.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Phase:
+    duration: float
+    # Events per second pushed to each connected client
+    rate: float = 0.0
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    down: bool = False
+
+
+@dataclass
+class Scenario:
+    phases: list[Phase]
+    started_at: float = field(default_factory=time.monotonic)
+    rng: random.Random = field(default_factory=random.Random)
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "Scenario":
+        phases = [Phase(**phase) for phase in data.get("phases", [])]
+        if len(phases) == 0:
+            raise ValueError("Scenario needs at least one phase")
+        return Scenario(phases=phases, rng=random.Random(data.get("seed", 0)))
+
+    @staticmethod
+    def from_file(path: str) -> "Scenario":
+        with open(path, "r") as file:
+            return Scenario.from_dict(json.load(file))
+
+    @staticmethod
+    def constant(
+        rate: float,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        disconnect_every: float = 0.0,
+        downtime: float = 1.0,
+    ) -> "Scenario":
+        """Build a scenario from plain command line options."""
+        phases = [
+            Phase(
+                duration=disconnect_every if disconnect_every > 0 else 1.0,
+                rate=rate,
+                latency_ms=latency_ms,
+                jitter_ms=jitter_ms,
+            )
+        ]
+        if disconnect_every > 0:
+            phases.append(Phase(duration=downtime, down=True))
+
+        return Scenario(phases=phases)
+
+    def restart(self) -> None:
+        self.started_at = time.monotonic()
+
+    @property
+    def current(self) -> tuple[int, Phase]:
+        total = sum(phase.duration for phase in self.phases)
+        if total <= 0:
+            return len(self.phases) - 1, self.phases[-1]
+
+        offset = (time.monotonic() - self.started_at) % total
+        for index, phase in enumerate(self.phases):
+            if offset < phase.duration:
+                return index, phase
+            offset -= phase.duration
+
+        return len(self.phases) - 1, self.phases[-1]
+
+    @property
+    def is_down(self) -> bool:
+        return self.current[1].down
+
+    def latency(self) -> float:
+        """Latency in seconds to inject for the current phase."""
+        _, phase = self.current
+        delay = phase.latency_ms + self.rng.uniform(-phase.jitter_ms, phase.jitter_ms)
+        return max(delay, 0.0) / 1000.0
+
+    async def delay(self) -> None:
+        latency = self.latency()
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+
+async def run_scenario(
+    scenario: Scenario,
+    emit: Callable[[], Awaitable[None]],
+    disconnect: Callable[[], Awaitable[None]],
+    tick: float = 0.005,
+) -> None:
+    """
+    Call `emit()` at the rate of the current phase, and `disconnect()` each
+    time a down phase is entered.
+    """
+    scenario.restart()
+    last_index = -1
+    credit = 0.0
+    last_time = time.monotonic()
+
+    while True:
+        await asyncio.sleep(tick)
+
+        now = time.monotonic()
+        elapsed = now - last_time
+        last_time = now
+
+        index, phase = scenario.current
+        if index != last_index:
+            last_index = index
+            credit = 0.0
+            if phase.down:
+                await disconnect()
+
+        if phase.down:
+            continue
+
+        credit += phase.rate * elapsed
+        while credit >= 1.0:
+            credit -= 1.0
+            await emit()
+
+
+class DelayedSender:
+    """
+    Outgoing queue of one connection that delivers messages after the
+    injected latency while keeping their order.
+    """
+
+    def __init__(
+        self, scenario: Scenario, send: Callable[[str], Awaitable[None]]
+    ) -> None:
+        self.scenario = scenario
+        self.send = send
+        self.queue: asyncio.Queue[tuple[float, str]] = asyncio.Queue()
+        self.last_due = 0.0
+        self.task = asyncio.ensure_future(self.__run__())
+
+    def push(self, message: str) -> None:
+        due = time.monotonic() + self.scenario.latency()
+        # Never overtake the previous message
+        self.last_due = max(due, self.last_due)
+        self.queue.put_nowait((self.last_due, message))
+
+    async def __run__(self) -> None:
+        while True:
+            due, message = await self.queue.get()
+            wait = due - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self.send(message)
+            except Exception:
+                return
+
+    def close(self) -> None:
+        self.task.cancel()
@@ -0,0 +1,184 @@
+"""
+Synthetic show data in the same shape editor-server returns it.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+FIBER_PARTS = ["hat", "face", "chest", "arm_L", "arm_R", "leg_L", "leg_R"]
+LED_PARTS = [("mask_LED", 24), ("shoulder_LED", 60), ("shoe_LED", 16)]
+
+COLORS: list[tuple[str, tuple[int, int, int]]] = [
+    ("black", (0, 0, 0)),
+    ("white", (255, 255, 255)),
+    ("red", (255, 0, 0)),
+    ("green", (0, 255, 0)),
+    ("blue", (0, 0, 255)),
+    ("yellow", (255, 255, 0)),
+    ("magenta", (255, 0, 255)),
+    ("cyan", (0, 255, 255)),
+]
+
+
+@dataclass
+class MockShow:
+    models: list[dict[str, Any]]
+    dancers: list[dict[str, Any]]
+    color_map: dict[int, dict[str, Any]]
+    led_map: dict[str, dict[str, dict[str, dict[str, Any]]]]
+    control_map: dict[int, dict[str, Any]]
+    pos_map: dict[int, dict[str, Any]]
+    next_id: int = 0
+    rng: random.Random = field(default_factory=random.Random)
+
+    @property
+    def control_record(self) -> list[int]:
+        return sorted(self.control_map, key=lambda id: self.control_map[id]["start"])
+
+    @property
+    def pos_record(self) -> list[int]:
+        return sorted(self.pos_map, key=lambda id: self.pos_map[id]["start"])
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def random_control_frame(self, start: int) -> dict[str, Any]:
+        color_ids = list(self.color_map.keys())
+        status: list[list[list[int]]] = []
+        led_status: list[list[list[list[int]]]] = []
+
+        for dancer in self.dancers:
+            dancer_status: list[list[int]] = []
+            dancer_led_status: list[list[list[int]]] = []
+
+            for part in dancer["parts"]:
+                alpha = self.rng.randint(0, 255)
+                if part["type"] == "LED":
+                    # effect_id 0 means the bulbs are specified one by one
+                    dancer_status.append([0, alpha])
+                    dancer_led_status.append(
+                        [
+                            [self.rng.choice(color_ids), alpha]
+                            for _ in range(part["length"])
+                        ]
+                    )
+                else:
+                    dancer_status.append([self.rng.choice(color_ids), alpha])
+                    dancer_led_status.append([])
+
+            status.append(dancer_status)
+            led_status.append(dancer_led_status)
+
+        return {
+            "start": start,
+            "fade": self.rng.random() < 0.3,
+            "rev": {"meta": 0, "data": 0},
+            "status": status,
+            "led_status": led_status,
+        }
+
+    def random_pos_frame(self, start: int) -> dict[str, Any]:
+        location = [
+            [
+                round(self.rng.uniform(-5, 5), 3),
+                round(self.rng.uniform(-4, 4), 3),
+                0.0,
+            ]
+            for _ in self.dancers
+        ]
+        rotation = [
+            [0.0, 0.0, round(self.rng.uniform(-180, 180), 3)] for _ in self.dancers
+        ]
+
+        return {
+            "start": start,
+            "rev": {"meta": 0, "data": 0},
+            "location": location,
+            "rotation": rotation,
+        }
+
+    def bump_rev(self, frame: dict[str, Any], meta: bool = False) -> None:
+        if meta:
+            frame["rev"]["meta"] += 1
+        else:
+            frame["rev"]["data"] += 1
+
+
+def generate_show(
+    dancer_count: int = 10,
+    control_frames: int = 1000,
+    pos_frames: int = 300,
+    duration_ms: int = 300000,
+    seed: int = 0,
+) -> MockShow:
+    """Generate a reproducible show with the given size."""
+    rng = random.Random(seed)
+
+    model_names = ["1_yck", "4_arthur", "9_ricky"]
+    models: list[dict[str, Any]] = [
+        {"id": index + 1, "name": name, "dancers": []}
+        for index, name in enumerate(model_names)
+    ]
+
+    dancers: list[dict[str, Any]] = []
+    for index in range(dancer_count):
+        model = models[index % len(models)]
+        dancer_name = f"{index}_dancer"
+        model["dancers"].append(dancer_name)
+
+        parts: list[dict[str, Any]] = [
+            {"name": part_name, "type": "FIBER", "length": None}
+            for part_name in FIBER_PARTS
+        ]
+        parts.extend(
+            {"name": part_name, "type": "LED", "length": length}
+            for part_name, length in LED_PARTS
+        )
+        dancers.append({"name": dancer_name, "parts": parts})
+
+    color_map = {
+        index + 1: {"color": name, "colorCode": list(rgb)}
+        for index, (name, rgb) in enumerate(COLORS)
+    }
+
+    led_map: dict[str, dict[str, dict[str, dict[str, Any]]]] = {}
+    effect_id = 0
+    for model_name in model_names:
+        led_map[model_name] = {}
+        for part_name, length in LED_PARTS:
+            led_map[model_name][part_name] = {}
+            for color_id, (color_name, _) in enumerate(COLORS, start=1):
+                effect_id += 1
+                led_map[model_name][part_name][f"{color_name}_{part_name}"] = {
+                    "id": effect_id,
+                    "repeat": 0,
+                    "frames": [
+                        {
+                            "LEDs": [[color_id, 255]] * length,
+                            "start": 0,
+                            "fade": False,
+                        }
+                    ],
+                }
+
+    show = MockShow(
+        models=models,
+        dancers=dancers,
+        color_map=color_map,
+        led_map=led_map,
+        control_map={},
+        pos_map={},
+        rng=rng,
+    )
+
+    for index in range(control_frames):
+        start = duration_ms * index // max(control_frames, 1)
+        show.control_map[show.new_id()] = show.random_control_frame(start)
+
+    for index in range(pos_frames):
+        start = duration_ms * index // max(pos_frames, 1)
+        show.pos_map[show.new_id()] = show.random_pos_frame(start)
+
+    return show
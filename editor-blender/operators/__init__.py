@@ -8,7 +8,9 @@ from . import (
     color_palette,
     command_center,
     control_editor,
+    debug,
     editor,
+    export,
     led_editor,
     load,
     notification,
@@ -45,6 +47,8 @@ def register():
     ping.register()
     select.register()
     load.register()
+    debug.register()
+    export.register()
 
 
 def unregister():
@@ -69,3 +73,5 @@ def unregister():
     ping.unregister()
     select.unregister()
     load.unregister()
+    debug.unregister()
+    export.unregister()
@@ -7,6 +7,9 @@ from typing import Any
 import bpy
 
 from ...core.actions.state.initialize import close_blender
+from ...core.asyncio.pool import process_pool
+from ...core.asyncio.registry import task_registry
+from ...core.asyncio.tick import TickPolicy
 from ...core.log import log_window, logger
 from ...core.utils.operator import execute_operator
 
@@ -28,6 +31,9 @@ def setup_asyncio_executor():
     loop.set_default_executor(executor)
 
 
+tick_policy = TickPolicy()
+
+
 def tick_loop() -> bool:
     loop = asyncio.get_event_loop()
     if loop.is_closed():
@@ -35,8 +41,7 @@ def tick_loop() -> bool:
 
     stop_after_this_kick = False
 
-    loop.stop()
-    loop.run_forever()
+    tick_policy.run(loop)
 
     return stop_after_this_kick
 
@@ -84,7 +89,8 @@ class AsyncLoopModalOperator(bpy.types.Operator):
         is_async_loop_running = True
 
         wm = context.window_manager
-        self.timer = wm.event_timer_add(0.5, window=context.window)
+        self.timer = wm.event_timer_add(tick_policy.interval, window=context.window)
+        self.timer_interval = tick_policy.interval
 
         logger.info("Starting asyncio loop...")
         execute_operator("lightdance.setup_blender")
@@ -109,6 +115,14 @@ class AsyncLoopModalOperator(bpy.types.Operator):
 
             return {"FINISHED"}
 
+        # Blender timers have a fixed interval, replace the timer when the
+        # policy asks for a different rate
+        if context and tick_policy.should_reschedule(self.timer_interval):
+            wm = context.window_manager
+            wm.event_timer_remove(self.timer)
+            self.timer = wm.event_timer_add(tick_policy.interval, window=context.window)
+            self.timer_interval = tick_policy.interval
+
         return {"RUNNING_MODAL"}
 
 
@@ -177,7 +191,11 @@ class AsyncOperator(bpy.types.Operator):
 
     def _new_async_task(self, async_task: Coroutine[Any, Any, set[str] | None]):
         """Stops the currently running async task, and starts another one."""
+        record = task_registry.start(
+            f"{type(self).__name__}.async_execute", self.bl_idname
+        )
         self.async_task = asyncio.ensure_future(async_task)
+        task_registry.track(self.async_task, record)
 
     def _stop_async_task(self):
         # if self.async_task is None:
@@ -211,5 +229,6 @@ def register():
 
 
 def unregister():
+    process_pool.shutdown()
     bpy.utils.unregister_class(AsyncLoopModalOperator)
     bpy.utils.unregister_class(AsyncOperator)
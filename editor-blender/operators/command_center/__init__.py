@@ -8,15 +8,25 @@ from ...client import client
 from ...client.subscription import subscribe_command
 from ...core.actions.property.command import (
     countdown_task,
+    get_active_dancer,
     get_selected_dancer,
     set_command_status,
     set_countdown,
 )
+from ...core.actions.state.clock import (
+    controller_time_ms,
+    reset_clock,
+    schedule_start_ms,
+    sync_clock,
+)
+from ...core.actions.state.command import command_latency_report, latency_percentiles
 from ...core.actions.state.load import init_assets
 from ...core.asyncio import AsyncTask
+from ...core.log import logger
 from ...core.states import state
 from ...core.utils.convert import is_color_code
 from ...core.utils.notification import notify
+from ...core.utils.shell_log import SHELL_PAGE_SIZE
 from ...properties.ui.types import CommandCenterStatusType
 from ...schemas.command import (
     ToControllerServerBoardInfoPartial,
@@ -50,7 +60,12 @@ class CommandCenterStartOperator(AsyncOperator):
             await client.open_command()
             if state.command_task is not None:
                 state.command_task.cancel()
-            state.command_task = AsyncTask(subscribe_command).exec()
+            state.command_task = AsyncTask(subscribe_command).exec(persistent=True)
+
+            reset_clock()
+            if state.clock_task is not None:
+                state.clock_task.cancel()
+            state.clock_task = AsyncTask(sync_clock).exec(persistent=True)
 
             info_payload = ToControllerServerBoardInfoPartial.from_dict(
                 {"topic": "boardInfo"}
@@ -131,7 +146,9 @@ class CommandCenterPlayOperator(AsyncOperator):
             bpy.context.window_manager, "ld_ui_command_center"
         )
         set_countdown(command_status.delay)
-        start_timestamp_ms = int(time.time() * 1000) + command_status.delay * 1000
+        # RPis follow the controller server clock
+        start_ms = schedule_start_ms(command_status.delay * 1000)
+        start_timestamp_ms = round(controller_time_ms(start_ms))
         try:
             play_payload = ToControllerServerPlayPartial.from_dict(
                 {
@@ -145,7 +162,7 @@ class CommandCenterPlayOperator(AsyncOperator):
             )
             # set_requesting(True)
             await command_agent.send_to_controller_server(play_payload)
-            state.last_play_timestamp_ms = start_timestamp_ms
+            state.last_play_timestamp_ms = round(start_ms)
 
         except Exception as e:
             traceback.print_exc()
@@ -478,6 +495,55 @@ class CommandCenterForceStopOperator(AsyncOperator):
         return {"FINISHED"}
 
 
+class CommandCenterLatencyReportOperator(bpy.types.Operator):
+    bl_idname = "lightdance.command_center_latency_report"
+    bl_label = "Latency report"
+    bl_description = "Log round trip percentiles per RPi and per command"
+
+    def execute(self, context: bpy.types.Context | None):
+        if not state.dancer_latency:
+            notify("INFO", "No command answered yet")
+            return {"CANCELLED"}
+
+        logger.info(f"Command latency\n{command_latency_report()}")
+        slowest = max(
+            state.dancer_latency,
+            key=lambda dancer: latency_percentiles(state.dancer_latency[dancer])[1],
+        )
+        notify("INFO", f"Latency report logged, slowest RPi (p90): {slowest}")
+        return {"FINISHED"}
+
+
+class CommandCenterShellPageOperator(bpy.types.Operator):
+    bl_idname = "lightdance.command_center_shell_page"
+    bl_label = ""
+    bl_description = "Page through the shell history of the highlighted RPi"
+
+    step: bpy.props.IntProperty(default=1)  # type: ignore
+
+    def execute(self, context: bpy.types.Context | None):
+        if not bpy.context:
+            return {"CANCELLED"}
+        command_status: CommandCenterStatusType = getattr(
+            bpy.context.window_manager, "ld_ui_command_center"
+        )
+
+        dancer = get_active_dancer()
+        shell_log = state.shell_history.get(dancer) if dancer else None
+        if shell_log is None:
+            command_status.shell_page = 0
+            return {"FINISHED"}
+
+        page_count = shell_log.page_count(
+            SHELL_PAGE_SIZE, command_status.shell_filter or None
+        )
+        step: int = getattr(self, "step")
+        command_status.shell_page = min(
+            max(command_status.shell_page + step, 0), page_count - 1
+        )
+        return {"FINISHED"}
+
+
 ops_list = [
     CommandCenterRefreshOperator,
     CommandCenterCloseGPIOOperator,
@@ -494,6 +560,8 @@ ops_list = [
     CommandCenterUploadOperator,
     CommandCenterWebShellOperator,
     CommandCenterForceStopOperator,
+    CommandCenterLatencyReportOperator,
+    CommandCenterShellPageOperator,
 ]
 
 
@@ -0,0 +1,47 @@
+import os
+import time
+from dataclasses import asdict
+
+import bpy
+
+from ...core.asyncio.registry import task_registry
+from ...core.asyncio.tick import loop_stats
+from ...core.config import config
+from ...core.log import logger
+from ...core.utils.notification import notify
+
+
+class DumpAsyncTasksOperator(bpy.types.Operator):
+    """Dump async task timings to a JSON file"""
+
+    bl_idname = "lightdance.dump_async_tasks"
+    bl_label = "Dump Async Tasks"
+
+    def execute(self, context: bpy.types.Context | None):
+        dump_dir = os.path.join(config.ASSET_PATH, "debug")
+        os.makedirs(dump_dir, exist_ok=True)
+
+        filename = time.strftime("async_tasks_%Y%m%d_%H%M%S.json")
+        dump_path = os.path.join(dump_dir, filename)
+
+        stats = asdict(loop_stats)
+        stats["recent_lags"] = list(loop_stats.recent_lags)
+        try:
+            task_registry.dump(dump_path, extra={"loop": stats})
+        except Exception:
+            logger.exception("Failed to dump async tasks")
+            notify("ERROR", "Failed to dump async tasks")
+            return {"CANCELLED"}
+
+        logger.info(f"Async tasks dumped to {dump_path}")
+        notify("INFO", f"Dumped to {dump_path}")
+
+        return {"FINISHED"}
+
+
+def register():
+    bpy.utils.register_class(DumpAsyncTasksOperator)
+
+
+def unregister():
+    bpy.utils.unregister_class(DumpAsyncTasksOperator)
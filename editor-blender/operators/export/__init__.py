@@ -0,0 +1,35 @@
+import bpy
+
+from ...core.actions.state.export import export_show_tables
+from ...core.states import state
+from ...operators.async_core import AsyncOperator
+
+
+class ExportShowOperator(AsyncOperator):
+    bl_idname = "lightdance.export_show"
+    bl_label = "Export Show"
+    bl_description = "Export per-dancer binary frame tables of the whole show"
+
+    directory: bpy.props.StringProperty(subtype="DIR_PATH")  # type: ignore
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context | None):
+        return state.ready
+
+    def invoke(self, context: bpy.types.Context | None, event: bpy.types.Event):
+        if not context:
+            return {"CANCELLED"}
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    async def async_execute(self, context: bpy.types.Context):
+        directory: str = getattr(self, "directory")
+        await export_show_tables(directory)
+
+
+def register():
+    bpy.utils.register_class(ExportShowOperator)
+
+
+def unregister():
+    bpy.utils.unregister_class(ExportShowOperator)
@@ -51,6 +51,14 @@ subprocess.run(["rm", "-r", release_path])
 tests_path = path.join(pack_blender_path, "tests")
 subprocess.run(["rm", "-rf", tests_path])
 
+# Remove mock servers
+mock_path = path.join(pack_blender_path, "mock")
+subprocess.run(["rm", "-rf", mock_path])
+
+# Remove benchmarks
+benchmarks_path = path.join(pack_blender_path, "benchmarks")
+subprocess.run(["rm", "-rf", benchmarks_path])
+
 # Remove venv folder
 venv_path = path.join(pack_blender_path, ".venv")
 subprocess.run(["rm", "-rf", venv_path])
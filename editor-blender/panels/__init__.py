@@ -1,22 +1,27 @@
-from . import (
-    auth,
-    camera,
-    color_palette,
-    command_center,
-    control_editor,
-    editor,
-    led_editor,
-    lightdance,
-    pos_editor,
-    timeline,
-)
+import bpy
 
+from . import auth, lightdance
 
-def register():
-    # NOTE: Order matters
-    lightdance.register()
+# Panels other than the main and login panels are registered once Blender is
+# idle after enabling the add-on, along with the imports they pull in
+deferred_registered = False
+
+
+def register_deferred() -> None:
+    global deferred_registered
+
+    from . import (
+        camera,
+        color_palette,
+        command_center,
+        control_editor,
+        debug,
+        editor,
+        led_editor,
+        pos_editor,
+        timeline,
+    )
 
-    auth.register()
     editor.register()
     pos_editor.register()
     control_editor.register()
@@ -26,18 +31,52 @@ def register():
 
     timeline.register()
     command_center.register()
+    debug.register()
+
+    deferred_registered = True
+
+
+def register():
+    # NOTE: Order matters
+    lightdance.register()
+
+    auth.register()
+
+    bpy.app.timers.register(register_deferred, first_interval=0, persistent=True)
 
 
 def unregister():
+    global deferred_registered
+
+    if bpy.app.timers.is_registered(register_deferred):
+        bpy.app.timers.unregister(register_deferred)
+
     lightdance.unregister()
 
     auth.unregister()
-    editor.unregister()
-    pos_editor.unregister()
-    color_palette.unregister()
-    camera.unregister()
-    timeline.unregister()
-    command_center.unregister()
-    control_editor.unregister()
-
-    led_editor.unregister()
+
+    if deferred_registered:
+        from . import (
+            camera,
+            color_palette,
+            command_center,
+            control_editor,
+            debug,
+            editor,
+            led_editor,
+            pos_editor,
+            timeline,
+        )
+
+        editor.unregister()
+        pos_editor.unregister()
+        color_palette.unregister()
+        camera.unregister()
+        timeline.unregister()
+        command_center.unregister()
+        control_editor.unregister()
+        debug.unregister()
+
+        led_editor.unregister()
+
+        deferred_registered = False
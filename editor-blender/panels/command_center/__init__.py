@@ -1,9 +1,12 @@
+import time
 from typing import Any
 
 import bpy
 from bpy.types import Context, UILayout
 
+from ...core.actions.property.command import get_active_dancer
 from ...core.states import state
+from ...core.utils.shell_log import SHELL_PAGE_SIZE
 from ...properties.ui.types import CommandCenterRPiStatusType, CommandCenterStatusType
 
 
@@ -217,13 +220,91 @@ class ControlPanel(bpy.types.Panel):
                 bpy.context.window_manager,
                 "ld_ui_command_center_dancer_index",
             )
+            if state.clock_estimate is not None:
+                estimate = state.clock_estimate
+                row = layout.row()
+                row.label(
+                    text=f"Clock skew {estimate.offset:+.1f} ms, "
+                    f"jitter {estimate.jitter:.1f} ms, RTT {estimate.delay:.1f} ms",
+                    icon="TIME",
+                )
+            if state.command_summary:
+                row = layout.row()
+                row.label(text=state.command_summary, icon="SORTTIME")
+                row.operator(
+                    "lightdance.command_center_latency_report", text="", icon="TEXT"
+                )
+
+
+class ShellHistoryPanel(bpy.types.Panel):
+    bl_label = "Shell History"
+    bl_idname = "VIEW_PT_LightDance_ShellHistory"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Command center"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context: bpy.types.Context | None):
+        if not bpy.context:
+            return
+        layout = self.layout
+        command_center_status: CommandCenterStatusType = getattr(
+            bpy.context.window_manager, "ld_ui_command_center"
+        )
+
+        dancer = get_active_dancer()
+        if dancer is None:
+            layout.label(text="Highlight an RPi in the list")
+            return
+
+        row = layout.row()
+        row.label(text=dancer, icon="CONSOLE")
+        row.prop(command_center_status, "shell_filter", text="", icon="VIEWZOOM")
+
+        shell_log = state.shell_history.get(dancer)
+        if shell_log is None:
+            layout.label(text="No responses yet")
+            return
+
+        command = command_center_status.shell_filter or None
+        page_count = shell_log.page_count(SHELL_PAGE_SIZE, command)
+        page = min(command_center_status.shell_page, page_count - 1)
+
+        row = layout.row(align=True)
+        op = row.operator(
+            "lightdance.command_center_shell_page", icon="TRIA_LEFT", text=""
+        )
+        setattr(op, "step", -1)
+        row.label(text=f"{page + 1} / {page_count} (newest first)")
+        op = row.operator(
+            "lightdance.command_center_shell_page", icon="TRIA_RIGHT", text=""
+        )
+        setattr(op, "step", 1)
+
+        try:
+            transactions = shell_log.page(page, SHELL_PAGE_SIZE, command)
+        except OSError:
+            layout.label(text="Failed to read the shell history", icon="ERROR")
+            return
+
+        for transaction in transactions:
+            box = layout.box()
+            column = box.column(align=True)
+            column.label(
+                text=f"{time.strftime('%H:%M:%S', time.localtime(transaction.time))}"
+                f" [{transaction.command}]"
+            )
+            for line in transaction.output.splitlines()[:4]:
+                column.label(text=line)
 
 
 def register():
     bpy.utils.register_class(LD_UL_DancerList)
     bpy.utils.register_class(ControlPanel)
+    bpy.utils.register_class(ShellHistoryPanel)
 
 
 def unregister():
     bpy.utils.unregister_class(LD_UL_DancerList)
     bpy.utils.unregister_class(ControlPanel)
+    bpy.utils.unregister_class(ShellHistoryPanel)
@@ -0,0 +1,87 @@
+import bpy
+
+from ...core.asyncio.registry import task_registry
+from ...core.asyncio.tick import loop_stats
+from ...handlers.animation import frame_change_scheduler
+from ...handlers.name_tag import name_tag_settings
+
+# Number of task types listed, slowest p90 first
+MAX_TASK_TYPES = 10
+
+
+class AsyncDebugPanel(bpy.types.Panel):
+    bl_label = "Async Debug"
+    bl_idname = "VIEW_PT_LightDance_AsyncDebug"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "LightDance"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context: bpy.types.Context | None):
+        layout = self.layout
+
+        box = layout.box()
+        box.label(text="Event Loop", icon="TIME")
+        col = box.column(align=True)
+        col.label(text=f"Tick interval: {loop_stats.interval * 1000:.0f} ms")
+        col.label(
+            text=f"Lag avg/p99/max: {loop_stats.lag_avg * 1000:.1f}"
+            f" / {loop_stats.lag_percentile(99) * 1000:.1f}"
+            f" / {loop_stats.lag_max * 1000:.1f} ms"
+        )
+        col.label(
+            text=f"Tick avg/max: {loop_stats.tick_duration_avg * 1000:.1f}"
+            f" / {loop_stats.tick_duration_max * 1000:.1f} ms"
+        )
+        col.label(text=f"Over budget: {loop_stats.budget_exceeded}")
+        col.label(
+            text=f"Frame changes: {frame_change_scheduler.triggered} triggered,"
+            f" {frame_change_scheduler.coalesced} coalesced"
+        )
+        col.label(
+            text=f"Name tags avg/max: {name_tag_settings.draw_time_avg * 1000:.2f}"
+            f" / {name_tag_settings.draw_time_max * 1000:.2f} ms"
+        )
+
+        box = layout.box()
+        box.label(text=f"Running Tasks: {len(task_registry.running)}", icon="SORTTIME")
+
+        long_running = task_registry.long_running()
+        leaked = task_registry.leaked()
+        if long_running or leaked:
+            col = box.column(align=True)
+            for record in long_running:
+                col.label(
+                    text=f"{record.name} ({record.origin}) {record.elapsed:.0f} s",
+                    icon="ERROR",
+                )
+            for record in leaked:
+                col.label(text=f"{record.name} ({record.origin}) leaked", icon="CANCEL")
+
+        box = layout.box()
+        box.label(text="Task Timings (p50 / p90 / p99)", icon="SORTTIME")
+        col = box.column(align=True)
+        types = sorted(
+            task_registry.types.values(),
+            key=lambda stats: stats.percentile(90),
+            reverse=True,
+        )
+        for stats in types[:MAX_TASK_TYPES]:
+            failed = stats.outcomes.get("failed", 0)
+            col.label(
+                text=f"{stats.name}: {stats.percentile(50) * 1000:.0f}"
+                f" / {stats.percentile(90) * 1000:.0f}"
+                f" / {stats.percentile(99) * 1000:.0f} ms"
+                + (f", {failed} failed" if failed else ""),
+            )
+
+        row = layout.row()
+        row.operator("lightdance.dump_async_tasks", text="Dump to JSON", icon="EXPORT")
+
+
+def register():
+    bpy.utils.register_class(AsyncDebugPanel)
+
+
+def unregister():
+    bpy.utils.unregister_class(AsyncDebugPanel)
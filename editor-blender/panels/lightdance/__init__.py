@@ -94,6 +94,10 @@ class LightDancePreferencesPanel(bpy.types.Panel):
         row.prop(preferences, "show_waveform", text="Show Waveform")
         row = col.row()
         row.prop(preferences, "show_nametag", text="Show Nametag")
+        row = col.row()
+        row.prop(preferences, "use_draco", text="Compressed Models")
+        row = col.row()
+        row.prop(preferences, "shell_history_limit", text="Shell History")
 
 
 class LightDanceToolsPanel(bpy.types.Panel):
@@ -121,6 +125,8 @@ class LightDanceToolsPanel(bpy.types.Panel):
                 "lightdance.reload_blender", text="Reload", icon="RECOVER_LAST"
             )
             row = layout.row()
+            row.operator("lightdance.export_show", text="Export Show", icon="EXPORT")
+            row = layout.row()
             row.operator("lightdance.logout", text="Logout", icon="GHOST_ENABLED")
 
         row = layout.row()
@@ -202,6 +208,13 @@ class LightDancePanel(bpy.types.Panel):
                         box = layout.box()
                         draw_time_shift(box)
 
+                elif state.offline:
+                    row = layout.row()
+                    row.label(
+                        text="Offline: playing the local show bundle (read-only)",
+                        icon="UNLINKED",
+                    )
+
                 else:
                     row = layout.row()
                     row.label(text="You are currently offline")
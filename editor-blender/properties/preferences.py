@@ -21,6 +21,14 @@ def get_show_nametag(self: bpy.types.PropertyGroup) -> bool:
     return cast(bool, self.get("show_nametag", True))
 
 
+def get_use_draco(self: bpy.types.PropertyGroup) -> bool:
+    return cast(bool, self.get("use_draco", False))
+
+
+def get_shell_history_limit(self: bpy.types.PropertyGroup) -> int:
+    return cast(int, self.get("shell_history_limit", 200))
+
+
 def set_auto_sync(self: bpy.types.PropertyGroup, value: bool):
     self["auto_sync"] = value
     state.preferences.auto_sync = value
@@ -44,6 +52,18 @@ def set_show_nametag(self: bpy.types.PropertyGroup, value: bool):
     state.preferences.show_nametag = value
 
 
+def set_use_draco(self: bpy.types.PropertyGroup, value: bool):
+    self["use_draco"] = value
+    state.preferences.use_draco = value
+
+
+def set_shell_history_limit(self: bpy.types.PropertyGroup, value: int):
+    self["shell_history_limit"] = value
+    state.preferences.shell_history_limit = value
+    for shell_log in state.shell_history.values():
+        shell_log.set_limit(value)
+
+
 class Preferences(bpy.types.PropertyGroup):
     """Preferences"""
 
@@ -71,6 +91,20 @@ class Preferences(bpy.types.PropertyGroup):
         get=get_show_nametag,
         set=set_show_nametag,
     )
+    use_draco: bpy.props.BoolProperty(  # type: ignore
+        name="Compressed Models",
+        description="Download Draco-compressed models and decode them locally",
+        get=get_use_draco,
+        set=set_use_draco,
+    )
+    shell_history_limit: bpy.props.IntProperty(  # type: ignore
+        name="Shell History",
+        description="Shell responses kept in memory per RPi, older ones go to disk",
+        min=10,
+        max=10000,
+        get=get_shell_history_limit,
+        set=set_shell_history_limit,
+    )
 
 
 def register():
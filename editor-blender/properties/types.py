@@ -51,3 +51,5 @@ class Preferences:
     follow_frame: bool
     show_waveform: bool
     show_nametag: bool
+    use_draco: bool
+    shell_history_limit: int
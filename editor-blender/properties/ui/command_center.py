@@ -19,6 +19,10 @@ class CommandCenterStatus(bpy.types.PropertyGroup):
     command: bpy.props.StringProperty()  # type: ignore
     delay: bpy.props.IntProperty(min=0, max=3000, default=120)  # type: ignore
     countdown: bpy.props.StringProperty(default="00:00")  # type: ignore
+    shell_page: bpy.props.IntProperty(min=0, default=0)  # type: ignore
+    shell_filter: bpy.props.StringProperty(  # type: ignore
+        description="Only show responses to this command"
+    )
 
 
 class CommandCenterRPiStatus(bpy.types.PropertyGroup):
@@ -60,6 +60,8 @@ class CommandCenterStatusType:
     connected: bool
     countdown: str
     delay: int
+    shell_page: int
+    shell_filter: str
 
 
 class CommandCenterRPiStatusType:
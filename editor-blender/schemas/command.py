@@ -32,6 +32,11 @@ class ToControllerServerWebShellPayload(JSONWizard):
     command: str
 
 
+@dataclass
+class ToControllerServerTimePayload(JSONWizard):
+    t0: float
+
+
 @dataclass
 class ToControllerServerBase(JSONWizard):
     class _(JSONWizard.Meta):
@@ -190,6 +195,17 @@ class ToControllerServerWebShell(
     pass
 
 
+@dataclass
+class ToControllerServerTimePartial(JSONWizard):
+    topic: Literal["time"]
+    payload: ToControllerServerTimePayload
+
+
+@dataclass
+class ToControllerServerTime(ToControllerServerBase, ToControllerServerTimePartial):
+    pass
+
+
 """
 From controller server
 """
@@ -242,6 +258,24 @@ class FromControllerServerCommandResponse(FromControllerServerBase):
     payload: FromControllerServerCommandResponsePayload
 
 
+@dataclass
+class FromControllerServerTimePayload(JSONWizard):
+    t0: float
+    t1: float
+    t2: float
+    # Local clock when received, set by the client
+    t3: float = 0.0
+
+
+@dataclass
+class FromControllerServerTime(FromControllerServerBase):
+    class _(JSONWizard.Meta):
+        json_key_to_field = {"__all__": "True", "from": "from_"}
+
+    topic: Literal["time"]
+    payload: FromControllerServerTimePayload
+
+
 ToControllerServer = (
     ToControllerServerBoardInfo
     | ToControllerServerCloseGPIO
@@ -256,6 +290,7 @@ ToControllerServer = (
     | ToControllerServerTest
     | ToControllerServerUpload
     | ToControllerServerWebShell
+    | ToControllerServerTime
 )
 
 ToControllerServerPartial = (
@@ -272,8 +307,11 @@ ToControllerServerPartial = (
     | ToControllerServerTestPartial
     | ToControllerServerUploadPartial
     | ToControllerServerWebShellPartial
+    | ToControllerServerTimePartial
 )
 
 FromControllerServer = (
-    FromControllerServerBoardInfo | FromControllerServerCommandResponse
+    FromControllerServerBoardInfo
+    | FromControllerServerCommandResponse
+    | FromControllerServerTime
 )
@@ -0,0 +1,30 @@
+"""
+GraphQL documents are kept as source and parsed by gql on first use, so
+importing the schemas doesn't load gql or parse every document.
+"""
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from graphql import DocumentNode
+
+
+class Document:
+    def __init__(self, source: str):
+        self.source = source
+
+    @cached_property
+    def node(self) -> "DocumentNode":
+        from gql import gql as parse
+
+        return parse(self.source)
+
+    @cached_property
+    def definition(self) -> dict[str, Any]:
+        """`to_dict()` of the parsed document"""
+        return self.node.to_dict()  # type: ignore
+
+
+def gql(source: str) -> Document:
+    return Document(source)
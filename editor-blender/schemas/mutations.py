@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 
 from dataclass_wizard import JSONWizard
-from gql import gql
 
 from ..core.models import (
     RGB,
@@ -12,6 +11,7 @@ from ..core.models import (
     MapID,
     ModelName,
 )
+from .document import gql
 
 """
 Dancer
@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 
 from dataclass_wizard import JSONWizard
-from gql import gql
 
 from ..core.models import (
     ID,
@@ -16,6 +15,7 @@ from ..core.models import (
     PartName,
     PartType,
 )
+from .document import gql
 
 """
 Fiber
@@ -212,6 +212,41 @@ GET_POS_MAP = gql(
     """
 )
 
+GET_POS_MAP_SELECT = gql(
+    """
+    query posMapSelect($select: QueryPositionMapInput) {
+        PosMap(select: $select) {
+            frameIds
+        }
+    }
+    """
+)
+
+
+@dataclass
+class QueryPosFrameRevision(JSONWizard):
+    id: MapID
+    start: int
+    metaRev: int
+    dataRev: int
+
+
+QueryPosFrameRevisionsData = list[QueryPosFrameRevision]
+
+
+GET_POS_FRAME_REVISIONS = gql(
+    """
+    query positionFrameRevisions {
+        positionFrameRevisions {
+            id
+            start
+            metaRev
+            dataRev
+        }
+    }
+    """
+)
+
 
 """
 ControlRecord
@@ -261,6 +296,42 @@ GET_CONTROL_MAP = gql(
     """
 )
 
+GET_CONTROL_MAP_SELECT = gql(
+    """
+    query controlMapSelect($select: QueryMapInput) {
+        ControlMap(select: $select) {
+            frameIds
+        }
+    }
+    """
+)
+
+
+@dataclass
+class QueryControlFrameRevision(JSONWizard):
+    id: MapID
+    start: int
+    rev: QueryRevision
+
+
+QueryControlFrameRevisionsData = list[QueryControlFrameRevision]
+
+
+GET_CONTROL_FRAME_REVISIONS = gql(
+    """
+    query controlFrameRevisions {
+        controlFrameRevisions {
+            id
+            start
+            rev {
+                meta
+                data
+            }
+        }
+    }
+    """
+)
+
 
 """
 EffectList
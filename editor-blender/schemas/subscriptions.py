@@ -2,9 +2,9 @@ from dataclasses import dataclass
 from enum import Enum
 
 from dataclass_wizard import JSONWizard
-from gql import gql
 
 from ..core.models import ID, RGB, ColorID, MapID
+from .document import gql
 
 """
 Misc Types
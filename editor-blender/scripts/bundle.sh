@@ -86,7 +86,7 @@ else
 fi
 
 # Remove dev files
-rm -rf "$PACK_BLENDER_PATH"/{.vscode,pack,tests,.venv,.wheels-cache}
+rm -rf "$PACK_BLENDER_PATH"/{.vscode,pack,tests,mock,benchmarks,.venv,.wheels-cache}
 
 # Remove __pycache__ folders
 remove_pycache() {
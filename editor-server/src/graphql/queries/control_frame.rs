@@ -71,4 +71,45 @@ impl ControlFrameQuery {
 
         Ok(result)
     }
+
+    /// Revision of every control frame, without its data. Clients compare it
+    /// with their copy to fetch only the frames that changed.
+    #[graphql(name = "controlFrameRevisions")]
+    async fn control_frame_revisions(&self, ctx: &Context<'_>) -> GQLResult<Vec<ControlFrame>> {
+        // get the context and the clients
+        let context = ctx.data::<UserContext>()?;
+        let clients = context.clients;
+        let mysql = clients.mysql_pool();
+
+        tracing::info!("Query: controlFrameRevisions");
+
+        // query the database
+        let result = sqlx::query_as!(
+            ControlFrameData,
+            r#"
+                SELECT
+                    id,
+                    start,
+                    fade as "fade: bool",
+                    meta_rev,
+                    data_rev
+                FROM ControlFrame;
+            "#,
+        )
+        .fetch_all(mysql)
+        .await?
+        .into_iter()
+        .map(|data| ControlFrame {
+            id: data.id,
+            start: data.start,
+            fade: data.fade,
+            rev: ControlFrameRevision {
+                meta: data.meta_rev,
+                data: data.data_rev,
+            },
+        })
+        .collect();
+
+        Ok(result)
+    }
 }
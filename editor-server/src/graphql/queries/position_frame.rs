@@ -69,4 +69,31 @@ impl PositionFrameQuery {
 
         Ok(ids)
     }
+
+    /// Revision of every position frame, without its data. Clients compare it
+    /// with their copy to fetch only the frames that changed.
+    #[graphql(name = "positionFrameRevisions")]
+    async fn position_frame_revisions(
+        &self,
+        ctx: &Context<'_>,
+    ) -> GQLResult<Vec<PositionFrameData>> {
+        let context = ctx.data::<UserContext>()?;
+        let clients = &context.clients;
+
+        let mysql = clients.mysql_pool();
+
+        tracing::info!("Query: positionFrameRevisions");
+
+        let frames = sqlx::query_as!(
+            PositionFrameData,
+            r#"
+                SELECT * FROM PositionFrame
+                ORDER BY start ASC;
+            "#
+        )
+        .fetch_all(mysql)
+        .await?;
+
+        Ok(frames)
+    }
 }